@@ -1,3 +1,6 @@
 
 from .kb5 import load_kb5_camera, load_kb5_voxel_grid, load_kb5_grid_extras
 from .kb1 import load_kb1_camera, load_kb1_voxel_grid, load_kb1_grid_extras
+from .sensitivity import SensitivityTask, build_sensitivities, assemble_sensitivities, sensitivity_tasks, \
+    print_sensitivity_progress
+from .sensitivity_store import SensitivityStore, get_sensitivity_store_path
@@ -1,13 +1,15 @@
 
 import os
-import pickle
 import textwrap
 import numpy as np
-from raysect.core import Point2D, Point3D
+from raysect.core import Point3D
 
 from cherab.tools.observers.bolometry import BolometerCamera, BolometerSlit, BolometerFoil
 from cherab.tools.inversions.voxels import ToroidalVoxelGrid
 
+from cherab.jet.memory import measure, select_voxel_primitive
+from cherab.jet.inversions import load_voxel_grid_data, voxel_coordinates, index_maps
+
 
 _DATA_PATH = os.path.split(__file__)[0]
 
@@ -78,13 +80,12 @@ def load_kb5_camera(camera_id, parent=None):
     return bolometer_camera
 
 
-def _read_grid_pickle():
-    grid_file_name = "kb5_voxel_grid.pickle"
+def _read_grid():
+    grid_file_name = "kb5_voxel_grid.npz"
     voxel_grid_file = os.path.join(_DATA_PATH, grid_file_name)
 
     try:
-        with open(voxel_grid_file, 'rb') as fh:
-            grid_description = pickle.load(fh)
+        return load_voxel_grid_data(voxel_grid_file)
     except FileNotFoundError:
         message = textwrap.dedent(
             """
@@ -92,27 +93,46 @@ def _read_grid_pickle():
             not found: please run the grid_generation.py script in
             the KB5 demos directory to generate the default grid, or
             produce a new grid in the same file format with the same
-            path."""
+            path. A grid pickle written by an older version of the
+            script can be converted with
+            cherab.jet.inversions.convert_grid_pickle()."""
             .format(voxel_grid_file)
         )
         raise FileNotFoundError(message)
-    return grid_description
 
 
-def load_kb5_voxel_grid(parent=None, name=None):
+def load_kb5_voxel_grid(parent=None, name=None, report=None, structured=False, memory_budget=None,
+                        degrade=False):
+    """
+    Loads the KB5 inversion grid.
+
+    :param parent: The parent node of the grid.
+    :param str name: The name of the grid.
+    :param MemoryReport report: Optional cherab.jet.memory.MemoryReport the estimated and the measured
+      grid memory are added to.
+    :param bool structured: Build a StructuredToroidalVoxelGrid, which locates the voxels on the grid
+      lattice instead of building a CSG primitive per voxel.
+    :param float memory_budget: Memory available for the grid (bytes), a MemoryError is raised if
+      the estimated grid memory exceeds it.
+    :param bool degrade: Build the structured grid rather than fail if the CSG grid exceeds the budget,
+      see cherab.jet.memory.select_voxel_primitive().
+    """
 
-    grid_description = _read_grid_pickle()
+    grid_data = _read_grid()
 
-    voxel_coordinates = []
-    for voxel in grid_description['voxels']:
-        v1 = Point2D(voxel[0][0], voxel[0][1])
-        v2 = Point2D(voxel[1][0], voxel[1][1])
-        v3 = Point2D(voxel[2][0], voxel[2][1])
-        v4 = Point2D(voxel[3][0], voxel[3][1])
-        voxel_coordinates.append((v1, v2, v3, v4))
+    primitive_type = select_voxel_primitive(len(grid_data.cell_vertices), structured, memory_budget, degrade)
+
+    with measure(report, name or "KB5 voxel grid"):
+        if primitive_type == 'structured':
+            from cherab.jet.inversions import StructuredToroidalVoxelGrid
+            voxel_grid = StructuredToroidalVoxelGrid(grid_data.cell_vertices, grid_data.segments, parent=parent,
+                                                     name=name)
+        else:
+            voxel_grid = ToroidalVoxelGrid(voxel_coordinates(grid_data.cell_vertices), parent=parent, name=name,
+                                           primitive_type="csg")
 
-    voxel_grid = ToroidalVoxelGrid(voxel_coordinates, parent=parent, name=name,
-                                   primitive_type="csg")
+    if report is not None:
+        report.add_voxel_grid(name or "KB5 voxel grid", voxel_grid.count, primitive_type=primitive_type)
 
     return voxel_grid
 
@@ -124,6 +144,9 @@ def load_kb5_grid_extras():
     This includes the 1D<->2D mappings, but not the voxel coordinates.
     Use load_kb5_voxel_grid for that.
     """
-    grid_description = _read_grid_pickle()
-    grid_description.pop('voxels')
-    return grid_description
+    grid_data = _read_grid()
+    index_2D_to_1D_map, index_1D_to_2D_map = index_maps(grid_data.index_2d)
+    return {
+        'index_2D_to_1D_map': index_2D_to_1D_map,
+        'index_1D_to_2D_map': index_1D_to_2D_map,
+    }
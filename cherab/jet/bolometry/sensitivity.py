@@ -0,0 +1,291 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Parallel, checkpointed calculation of bolometer sensitivity matrices.
+
+The work is split into (camera, detector, voxel chunk) tasks. Every task
+result is written to its own file in a checkpoint directory as soon as it
+finishes, so an interrupted calculation resumes where it stopped.
+
+The scene is built once, with a user supplied scene builder, and the tasks
+are traced in parallel by a pool of processes forked from the process
+holding the scene. The processes share the scene instead of each building a
+copy, so the memory used by the meshes does not grow with the number of
+processes. Forking requires a platform supporting the 'fork' start method,
+e.g. Linux. Several
+independent processes, e.g. batch jobs on a cluster, can share one
+checkpoint directory by each taking a fixed share of the tasks with
+worker_index and worker_count.
+"""
+
+import os
+import json
+import time
+import hashlib
+import numpy as np
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+SensitivityTask = namedtuple('SensitivityTask', ['camera', 'detector', 'start', 'stop'])
+SensitivityTask.__doc__ = """
+A unit of work: the sensitivities of one detector to the voxels start to stop - 1.
+"""
+
+_LAYOUT_FILE = 'layout.json'
+
+# the scene traced by the task processes, set before they are forked
+_task_scene = None
+
+
+def build_sensitivities(scene_builder, checkpoint_path, ray_count=10000, chunk_size=None, processes=None,
+                        worker_index=0, worker_count=1, progress=None, drop_tolerance=None, mesh_groups=None,
+                        lod=0):
+    """
+    Calculates the sensitivity matrices of bolometer cameras.
+
+    The scene builder is called once and must return a tuple of
+    (cameras, voxel_grid): a list of BolometerCameras and the voxel grid they
+    observe, in the same world.
+
+    Splitting detectors into voxel chunks requires a voxel grid whose
+    set_active() accepts a list of voxels, such as a StructuredToroidalVoxelGrid.
+
+    The checkpoint directory records the layout of the calculation: the
+    cameras, the voxel grid, the ray count, the chunk size and the meshes
+    (the content digest of the mesh groups at the level of detail). A
+    directory holding the results of a different calculation is refused.
+    The voxel grid is identified by its vertices if it has cell_vertices
+    (e.g. a StructuredToroidalVoxelGrid), otherwise by its voxel count only.
+
+    :param scene_builder: Callable returning (cameras, voxel_grid).
+    :param str checkpoint_path: Directory holding the task results, created if missing.
+    :param int ray_count: Number of rays traced per detector.
+    :param int chunk_size: Maximum number of voxels per task, by default a task covers all voxels.
+    :param int processes: Number of processes tracing tasks in parallel, defaults to the number of CPUs.
+      The processes share the scene, each traces one task at a time.
+    :param int worker_index: Index of this worker, from 0 to worker_count - 1.
+    :param int worker_count: Number of independent workers sharing the checkpoint directory.
+    :param progress: Optional callable progress(task, count, total, run_time), called after each task.
+    :param float drop_tolerance: If given, the matrices are returned in CSR format, see
+      cherab.jet.inversions.sparsify().
+    :param list mesh_groups: The mesh registry groups imported by the scene builder, None if it
+      imports no JET meshes.
+    :param int lod: The mesh level of detail imported by the scene builder.
+    :return: Dictionary of camera name to (detectors, voxels) sensitivity matrix, or None if tasks
+      of other workers are still outstanding.
+    """
+
+    global _task_scene
+
+    if not 0 <= worker_index < worker_count:
+        raise ValueError("The worker index must lie between 0 and worker_count - 1.")
+
+    os.makedirs(checkpoint_path, exist_ok=True)
+
+    cameras, voxel_grid = scene_builder()
+    cameras = {camera.name: camera for camera in cameras}
+
+    layout = {'cameras': [[name, len(camera)] for name, camera in cameras.items()],
+              'voxel_count': voxel_grid.count, 'grid': _grid_digest(voxel_grid), 'ray_count': ray_count,
+              'chunk_size': chunk_size, 'mesh_groups': mesh_groups, 'lod': lod,
+              'meshes': _mesh_digest(mesh_groups, lod)}
+    _check_layout(checkpoint_path, layout)
+
+    tasks = [task for n, task in enumerate(sensitivity_tasks(layout)) if n % worker_count == worker_index]
+    outstanding = [task for task in tasks if not os.path.isfile(_task_file(checkpoint_path, task))]
+
+    # the task processes are forked from this one, they share the scene instead of each building a copy
+    _task_scene = cameras, voxel_grid
+    try:
+        with ProcessPoolExecutor(max_workers=processes or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context('fork')) as executor:
+            futures = [executor.submit(_run_task, task, ray_count, checkpoint_path) for task in outstanding]
+            count = len(tasks) - len(outstanding)
+            for future in as_completed(futures):
+                task, run_time = future.result()
+                count += 1
+                if progress:
+                    progress(task, count, len(tasks), run_time)
+    finally:
+        _task_scene = None
+
+    try:
+        return assemble_sensitivities(checkpoint_path, drop_tolerance=drop_tolerance)
+    except FileNotFoundError:
+        return None
+
+
+def sensitivity_tasks(layout):
+    """
+    Lists the tasks of a calculation.
+
+    :param dict layout: The calculation layout, as stored in the checkpoint directory.
+    :return: List of SensitivityTasks.
+    """
+
+    count = layout['voxel_count']
+    chunk_size = layout.get('chunk_size') or count
+    return [SensitivityTask(camera, detector, start, min(start + chunk_size, count))
+            for camera, detectors in layout['cameras']
+            for detector in range(detectors)
+            for start in range(0, count, chunk_size)]
+
+
+def assemble_sensitivities(checkpoint_path, drop_tolerance=None):
+    """
+    Assembles the sensitivity matrices from a completed checkpoint directory.
+
+    :param str checkpoint_path: The checkpoint directory.
+    :param float drop_tolerance: If given, the matrices are returned in CSR format, see
+      cherab.jet.inversions.sparsify().
+    :return: Dictionary of camera name to (detectors, voxels) sensitivity matrix.
+    """
+
+    with open(os.path.join(checkpoint_path, _LAYOUT_FILE), 'r') as fh:
+        layout = json.load(fh)
+
+    matrices = {camera: np.zeros((detectors, layout['voxel_count'])) for camera, detectors in layout['cameras']}
+    missing = []
+    for task in sensitivity_tasks(layout):
+        try:
+            matrices[task.camera][task.detector, task.start:task.stop] = np.load(_task_file(checkpoint_path, task))
+        except FileNotFoundError:
+            missing.append(task)
+
+    if missing:
+        raise FileNotFoundError("{} of the tasks in '{}' are not complete, e.g. {}."
+                                "".format(len(missing), checkpoint_path, missing[0]))
+
+    if drop_tolerance is not None:
+        from cherab.jet.inversions import sparsify
+        matrices = {camera: sparsify(matrix, drop_tolerance) for camera, matrix in matrices.items()}
+
+    return matrices
+
+
+def print_sensitivity_progress(task, count, total, run_time):
+    """ Progress callback for build_sensitivities() printing a line per task. """
+
+    print("traced {} detector {} voxels {}-{} ({}/{}) in {:.2G}mins"
+          "".format(task.camera, task.detector, task.start, task.stop - 1, count, total, run_time / 60))
+
+
+def _check_layout(checkpoint_path, layout):
+
+    layout_file = os.path.join(checkpoint_path, _LAYOUT_FILE)
+    if os.path.isfile(layout_file):
+        with open(layout_file, 'r') as fh:
+            stored = json.load(fh)
+        layout = json.loads(json.dumps(layout))
+        if stored != layout:
+            differences = sorted(name for name in set(stored) | set(layout) if stored.get(name) != layout.get(name))
+            raise ValueError("The checkpoint directory '{}' belongs to a different calculation (differing in {}), "
+                             "use an empty directory.".format(checkpoint_path, ', '.join(differences)))
+    else:
+        _write_atomic(layout_file, lambda fh: fh.write(json.dumps(layout, indent=2).encode()))
+
+
+def _grid_digest(voxel_grid):
+
+    cell_vertices = getattr(voxel_grid, 'cell_vertices', None)
+    if cell_vertices is None:
+        return None
+    return hashlib.sha256(np.ascontiguousarray(cell_vertices, dtype=np.float64).tobytes()).hexdigest()
+
+
+def _mesh_digest(mesh_groups, lod):
+
+    if mesh_groups is None:
+        return None
+
+    from cherab.jet.machine import mesh_set_digest
+    return mesh_set_digest(mesh_groups, lod)
+
+
+def _task_file(checkpoint_path, task):
+    return os.path.join(checkpoint_path, "{}_{}_{}_{}.npy".format(task.camera, task.detector, task.start, task.stop))
+
+
+def _write_atomic(path, write):
+
+    # concurrent readers and interrupted writers never leave a partial file behind
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'wb') as fh:
+        write(fh)
+    os.replace(temporary_path, path)
+
+
+def _run_task(task, ray_count, checkpoint_path):
+
+    from raysect.core.workflow import SerialEngine
+
+    cameras, voxel_grid = _task_scene
+    detector = cameras[task.camera][task.detector]
+    # the tasks are the unit of parallelism, each process traces its task serially
+    detector.render_engine = SerialEngine()
+
+    start_time = time.time()
+    if task.start == 0 and task.stop == voxel_grid.count:
+        sensitivities = detector.calculate_sensitivity(voxel_grid, ray_count=ray_count)
+    else:
+        sensitivities = _chunk_sensitivity(detector, voxel_grid, range(task.start, task.stop), ray_count)
+
+    _write_atomic(_task_file(checkpoint_path, task), lambda fh: np.save(fh, np.asarray(sensitivities)))
+    return task, time.time() - start_time
+
+
+def _chunk_sensitivity(detector, voxel_grid, voxels, ray_count):
+
+    from raysect.optical.observer import SpectralPowerPipeline0D, SpectralRadiancePipeline0D
+
+    # as in BolometerFoil.calculate_sensitivity(), each active voxel emits into its own 1nm spectral bin and
+    # the detector settings are restored afterwards
+    if getattr(detector, 'units', 'Power') == 'Radiance':
+        pipeline = SpectralRadiancePipeline0D(display_progress=False)
+    else:
+        pipeline = SpectralPowerPipeline0D(display_progress=False)
+
+    settings = {name: getattr(detector, name)
+                for name in ('pipelines', 'spectral_bins', 'min_wavelength', 'max_wavelength', 'pixel_samples')}
+    voxel_grid.set_active(list(voxels))
+    try:
+        detector.pipelines = [pipeline]
+        _set_wavelength_range(detector, 1, len(voxels) + 1)
+        detector.spectral_bins = len(voxels)
+        detector.pixel_samples = ray_count
+        detector.observe()
+    finally:
+        voxel_grid.set_active("all")
+        detector.pipelines = settings['pipelines']
+        detector.spectral_bins = settings['spectral_bins']
+        detector.pixel_samples = settings['pixel_samples']
+        _set_wavelength_range(detector, settings['min_wavelength'], settings['max_wavelength'])
+
+    return np.array(pipeline.samples.mean)
+
+
+def _set_wavelength_range(detector, min_wavelength, max_wavelength):
+
+    # the observer requires the minimum to stay below the maximum after each assignment
+    if min_wavelength < detector.max_wavelength:
+        detector.min_wavelength = min_wavelength
+        detector.max_wavelength = max_wavelength
+    else:
+        detector.max_wavelength = max_wavelength
+        detector.min_wavelength = min_wavelength
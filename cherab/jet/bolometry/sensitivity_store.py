@@ -0,0 +1,206 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+A content-addressed store of bolometer sensitivity matrices.
+
+A matrix is stored under a hash of its described inputs: the camera
+geometry files, the voxel grid, the first wall epoch, the content of the
+mesh files, the view region, the name of the material override and the ray
+count. A matrix computed once is found again by any calculation with the
+same inputs, on any node or checkout, and a change of a hashed input never
+returns a stale matrix. The scene built by the calculation is not inspected:
+the material is identified by the name the caller supplies, and changes not
+covered by the description (e.g. the properties of a material, or
+primitives added to the scene) are not detected. Each matrix is accompanied
+by a JSON description of its inputs.
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+from scipy.sparse import issparse, csr_matrix, save_npz, load_npz
+
+from cherab.jet.paths import get_cache_path
+from .sensitivity import _write_atomic
+
+
+SENSITIVITY_STORE_VERSION = 2
+
+_DATA_PATH = os.path.split(__file__)[0]
+
+# files defining the foil and slit geometry of each camera, the KB1 geometry is part of its loader
+_CAMERA_GEOMETRY = {
+    'KB1': ['kb1/load_kb1.py'],
+    'KB5V': ['kb5/kb5v_foils.csv', 'kb5/kb5v_slits.csv'],
+    'KB5H': ['kb5/kb5h_foils.csv', 'kb5/kb5h_slits.csv'],
+}
+
+
+def get_sensitivity_store_path():
+    """ Returns the default directory of the sensitivity store, see get_cache_path(). """
+
+    return get_cache_path('sensitivities')
+
+
+class SensitivityStore:
+    """
+    A directory of sensitivity matrices addressed by the hash of their inputs.
+
+    :param str path: The store directory, defaults to get_sensitivity_store_path(). Point it at
+      shared storage to share matrices between users and cluster nodes.
+    """
+
+    def __init__(self, path=None):
+
+        self.path = path or get_sensitivity_store_path()
+        os.makedirs(self.path, exist_ok=True)
+
+    def describe(self, camera_id, ray_count, cell_vertices, groups=None, region=None, pulse=92782, lod=0,
+                 material=None, drop_tolerance=None):
+        """
+        Returns the description of the inputs of a sensitivity matrix.
+
+        The mesh arguments are those passed to import_jet_mesh(). The meshes
+        are described by the content digest of every mesh file of the groups
+        and by the region, not by the meshes selected within the region, so
+        the description does not depend on the mesh extents known at the time
+        or on the location and modification times of the CAD files.
+
+        :param str camera_id: 'KB1', 'KB5V' or 'KB5H'.
+        :param int ray_count: Number of rays traced per detector.
+        :param ndarray cell_vertices: (N, 4, 2) voxel vertex array of the grid, e.g. the cell_vertices
+          of a StructuredToroidalVoxelGrid.
+        :param groups: The mesh registry groups, defaults to ['JET_MESH'].
+        :param region: The view region or diagnostics the meshes are culled with.
+        :param int pulse: JET pulse number selecting the first wall.
+        :param int lod: Mesh level of detail.
+        :param str material: Name of the material override, e.g. 'absorbing', None for the default materials.
+          It must identify the material used by the calculation, the material itself is not hashed.
+        :param float drop_tolerance: Drop tolerance of a sparse matrix, None for a dense matrix.
+        :return: A JSON serialisable dictionary.
+        """
+
+        from cherab.jet.machine import view_region, wall_epoch, mesh_set_digest
+
+        if camera_id not in _CAMERA_GEOMETRY:
+            raise ValueError("Unrecognised camera '{}', use one of {}.".format(camera_id, sorted(_CAMERA_GEOMETRY)))
+
+        if region is not None:
+            region = view_region(region, pulse=pulse)
+        groups = groups or ['JET_MESH']
+        epoch = wall_epoch(pulse)
+
+        return {
+            'version': SENSITIVITY_STORE_VERSION,
+            'camera': camera_id,
+            'geometry': {name: _file_hash(os.path.join(_DATA_PATH, name)) for name in _CAMERA_GEOMETRY[camera_id]},
+            'grid': hashlib.sha256(np.ascontiguousarray(cell_vertices, dtype=np.float64).tobytes()).hexdigest(),
+            'voxels': len(cell_vertices),
+            'wall_epoch': epoch,
+            'meshes': mesh_set_digest(groups, lod),
+            'mesh_groups': groups,
+            'region': repr(region),
+            'lod': lod,
+            'material': material,
+            'ray_count': ray_count,
+            'drop_tolerance': drop_tolerance,
+        }
+
+    @staticmethod
+    def key(description):
+        """ Returns the store key of a description, see describe(). """
+
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()[0:32]
+
+    def get(self, description, mmap=True):
+        """
+        Returns the stored matrix matching a description, or None.
+
+        :param dict description: The matrix inputs, see describe().
+        :param bool mmap: Memory map a dense matrix instead of reading it into memory.
+        :return: A dense array or scipy.sparse.csr_matrix.
+        """
+
+        key = self.key(description)
+        if os.path.isfile(self._matrix_file(key, sparse=True)):
+            return load_npz(self._matrix_file(key, sparse=True)).tocsr()
+        if os.path.isfile(self._matrix_file(key)):
+            return np.load(self._matrix_file(key), mmap_mode='r' if mmap else None, allow_pickle=False)
+        return None
+
+    def put(self, description, matrix):
+        """
+        Stores a matrix.
+
+        :param dict description: The matrix inputs, see describe().
+        :param matrix: The (detectors, voxels) sensitivity matrix, dense or scipy.sparse.
+        """
+
+        sparse = issparse(matrix)
+        matrix = csr_matrix(matrix) if sparse else np.asarray(matrix)
+        if matrix.ndim != 2 or matrix.shape[1] != description['voxels']:
+            raise ValueError("The sensitivity matrix must have shape (detectors, {}).".format(description['voxels']))
+
+        key = self.key(description)
+        # the matrix is written last, its presence marks a complete entry
+        _write_atomic(self._description_file(key), lambda fh: fh.write(json.dumps(description, indent=2).encode()))
+        if sparse:
+            _write_atomic(self._matrix_file(key, sparse=True), lambda fh: save_npz(fh, matrix, compressed=False))
+        else:
+            _write_atomic(self._matrix_file(key), lambda fh: np.save(fh, matrix))
+
+    def get_or_compute(self, camera_id, compute, ray_count, cell_vertices, groups=None, region=None,
+                       pulse=92782, lod=0, material=None, drop_tolerance=None):
+        """
+        Returns the stored sensitivity matrix of a camera, computing and storing it if missing.
+
+        The arguments other than compute are those of describe(). With a drop
+        tolerance the computed matrix is stored and returned in CSR format, see
+        cherab.jet.inversions.sparsify().
+
+        :param compute: Callable returning the (detectors, voxels) sensitivity matrix.
+        :return: The sensitivity matrix.
+        """
+
+        description = self.describe(camera_id, ray_count, cell_vertices, groups=groups,
+                                    region=region, pulse=pulse, lod=lod, material=material,
+                                    drop_tolerance=drop_tolerance)
+
+        matrix = self.get(description)
+        if matrix is None:
+            matrix = compute()
+            if drop_tolerance is not None:
+                from cherab.jet.inversions import sparsify
+                matrix = sparsify(matrix, drop_tolerance)
+            elif not issparse(matrix):
+                matrix = np.asarray(matrix)
+            self.put(description, matrix)
+        return matrix
+
+    def _matrix_file(self, key, sparse=False):
+        return os.path.join(self.path, key + ('.npz' if sparse else '.npy'))
+
+    def _description_file(self, key):
+        return os.path.join(self.path, key + '.json')
+
+
+def _file_hash(path):
+
+    with open(path, 'rb') as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
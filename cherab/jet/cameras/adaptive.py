@@ -0,0 +1,140 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Adaptive per-pixel sampling of camera renders.
+
+The camera is rendered in passes with raysect's MonoAdaptiveSampler2D. The
+first pass samples every pixel, later passes only sample the pixels whose
+normalised standard error, estimated from the accumulated statistics of a
+mono pipeline such as PowerPipeline2D, is above the target. Pixels
+converging quickly, e.g. those seeing the plasma directly, stop receiving
+samples while pixels dominated by reflections keep being sampled.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+
+AdaptiveSamplingReport = namedtuple('AdaptiveSamplingReport', ['passes', 'samples', 'max_pixel_samples',
+                                                               'unconverged'])
+AdaptiveSamplingReport.__doc__ = """
+The samples used by an adaptive render.
+
+The samples are the total over all pixels, compare them with pixel_samples
+times the number of pixels of a uniform render. Unconverged pixels are those
+the sampler would still sample when the sample limit was reached.
+"""
+
+
+def observe_adaptive(camera, pipeline=None, target_error=0.05, pass_samples=20, max_samples=1000, fraction=0.2,
+                     ratio=10.0, mask=None, progress=None):
+    """
+    Renders a camera with adaptive per-pixel sampling.
+
+    The first pass samples every pixel (of the mask). Later passes use a
+    MonoAdaptiveSampler2D, or a MaskedMonoAdaptiveSampler2D with a mask,
+    driven by the pipeline statistics: a pass samples the pixels whose
+    normalised standard error is above the target error and among the
+    noisiest fraction of the frame, and the pixels lagging the most sampled
+    pixel by more than the ratio. Pixels without emission are never
+    resampled. The render stops when no pixel is left to sample, or when the
+    next pass would take a pixel beyond the maximum samples.
+
+    The camera pixel_samples and frame_sampler are restored afterwards. The
+    pipelines of the camera accumulate over the passes, their frames hold
+    the result.
+
+    :param camera: The camera, e.g. from load_kl1_camera() or load_kl11_camera().
+    :param pipeline: The mono pipeline whose statistics drive the sampling, defaults to the
+      first pipeline of the camera.
+    :param float target_error: Target normalised standard error of each pixel.
+    :param int pass_samples: Samples per pixel in each pass, at least two.
+    :param int max_samples: Maximum samples per pixel.
+    :param float fraction: Fraction of the noisiest pixels sampled in each pass.
+    :param float ratio: Maximum ratio of the samples of the most sampled pixel to those of any pixel.
+    :param ndarray mask: Optional boolean mask of the camera pixels to render, e.g. a region of interest
+      of a full image camera. Cameras loaded with a region of interest only hold its pixels already.
+    :param progress: Optional callable progress(pass_number, rendered_pixels, unconverged_pixels),
+      called after each pass.
+    :return: An AdaptiveSamplingReport.
+    """
+
+    from raysect.optical.observer import FullFrameSampler2D, MaskedFrameSampler2D, MonoAdaptiveSampler2D, \
+        MaskedMonoAdaptiveSampler2D
+
+    if target_error <= 0:
+        raise ValueError("The target error must be positive.")
+    if not 2 <= pass_samples <= max_samples:
+        raise ValueError("The pass samples must be at least two, to estimate the pixel variance, "
+                         "and must not exceed the maximum samples.")
+
+    pipeline = pipeline or camera.pipelines[0]
+    if mask is None:
+        first_sampler = FullFrameSampler2D()
+        sampler = MonoAdaptiveSampler2D(pipeline, fraction=fraction, ratio=ratio, min_samples=pass_samples,
+                                        cutoff=target_error)
+        rendered = camera.pixels[0] * camera.pixels[1]
+    else:
+        mask = np.asarray(mask, dtype=bool)
+        first_sampler = MaskedFrameSampler2D(mask)
+        sampler = MaskedMonoAdaptiveSampler2D(pipeline, mask, fraction=fraction, ratio=ratio,
+                                              min_samples=pass_samples, cutoff=target_error)
+        rendered = int(np.count_nonzero(mask))
+
+    pixel_samples = camera.pixel_samples
+    frame_sampler = camera.frame_sampler
+    accumulate = [camera_pipeline.accumulate for camera_pipeline in camera.pipelines]
+
+    passes = 0
+    try:
+        # the first pass samples every pixel and starts the statistics afresh, later passes add to them
+        for camera_pipeline in camera.pipelines:
+            camera_pipeline.accumulate = False
+        camera.pixel_samples = pass_samples
+        camera.frame_sampler = first_sampler
+
+        while True:
+
+            camera.observe()
+            passes += 1
+            for camera_pipeline in camera.pipelines:
+                camera_pipeline.accumulate = True
+            camera.frame_sampler = sampler
+
+            samples = np.asarray(pipeline.frame.samples)
+            unconverged = len(sampler.generate_tasks(camera.pixels))
+
+            if progress:
+                progress(passes, rendered, unconverged)
+
+            if not unconverged or samples.max() + pass_samples > max_samples:
+                break
+            rendered = unconverged
+
+    finally:
+        camera.pixel_samples = pixel_samples
+        camera.frame_sampler = frame_sampler
+        for camera_pipeline, value in zip(camera.pipelines, accumulate):
+            camera_pipeline.accumulate = value
+
+    return AdaptiveSamplingReport(passes, int(samples.sum()), int(samples.max()), unconverged)
+
+
+def print_sampling_progress(pass_number, rendered_pixels, unconverged_pixels):
+    """ Progress callback for observe_adaptive() printing a line per pass. """
+
+    print("pass {}: rendered {} pixels, {} left to sample".format(pass_number, rendered_pixels, unconverged_pixels))
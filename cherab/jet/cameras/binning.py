@@ -0,0 +1,223 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Pixel binning of camera geometry, images and sensitivity matrices.
+
+A binned pixel covers a square block of factor x factor full resolution
+pixels. Its ray starts at the mean origin of the block and points along the
+mean direction of the block. Incomplete blocks at the high index edges of
+the image are dropped.
+
+Binned images and sensitivity matrices default to the mean over each block,
+which is what a binned camera observes. Sums, the power collected by a
+block, are available as well. Sensitivity rows are ordered as the pixels of
+the flattened image.
+"""
+
+from collections import namedtuple
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
+
+BINNING_FACTORS = (1, 2, 4, 8)
+
+# rows processed at a time when binning dense or memory mapped matrices
+_BLOCK_ROWS = 1024
+
+
+PixelLattice = namedtuple('PixelLattice', ['stride', 'binning', 'pixels'])
+PixelLattice.__doc__ = """
+The pixels a sensitivity matrix was calculated for.
+
+Every stride-th calibration pixel along each image axis, binned in blocks
+of binning x binning. The pixels are the (nx, ny) shape of the image the
+matrix rows flatten, load_pixel_geometry() with the same stride and binning
+gives the matching camera geometry.
+"""
+
+
+def binned_shape(shape, factor):
+    """
+    Returns the image shape after binning.
+
+    :param tuple shape: The full resolution image shape.
+    :param int factor: The binning factor.
+    """
+
+    _check_factor(factor)
+    return tuple(length // factor for length in shape[0:2])
+
+
+def bin_pixel_geometry(pixel_origins, pixel_directions, factor):
+    """
+    Bins the pixel origins and directions of a camera calibration.
+
+    :param ndarray pixel_origins: 2D array of Point3D pixel origins, e.g. from load_calcam_calibration().
+    :param ndarray pixel_directions: 2D array of Vector3D pixel directions.
+    :param int factor: The binning factor.
+    :return: Tuple of the binned Point3D origins and normalised Vector3D directions arrays.
+    """
+
+    if factor == 1:
+        return pixel_origins, pixel_directions
+
+    origins, directions = bin_pixel_arrays(pixel_components(pixel_origins), pixel_components(pixel_directions),
+                                           factor)
+    return pixel_vectors(origins, directions)
+
+
+def bin_pixel_arrays(origins, directions, factor):
+    """
+    Bins pixel origins and directions held as (nx, ny, 3) float arrays.
+
+    :param ndarray origins: (nx, ny, 3) array of pixel origins.
+    :param ndarray directions: (nx, ny, 3) array of pixel directions.
+    :param int factor: The binning factor.
+    :return: Tuple of the binned origins and normalised directions arrays.
+    """
+
+    directions = directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+    if factor == 1:
+        return np.asarray(origins, dtype=np.float64), directions
+
+    origins = bin_image(origins, factor)
+    directions = bin_image(directions, factor)
+    return origins, directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+
+
+def pixel_components(vectors):
+    """
+    Converts a 2D array of Point3D or Vector3D objects to an (nx, ny, 3) float array.
+
+    :param ndarray vectors: 2D object array.
+    """
+
+    return np.array([[(vector.x, vector.y, vector.z) for vector in row] for row in vectors], dtype=np.float64)
+
+
+def pixel_vectors(origins, directions):
+    """
+    Converts (nx, ny, 3) float arrays to the 2D Point3D and Vector3D object arrays used by VectorCamera.
+
+    :param ndarray origins: (nx, ny, 3) array of pixel origins.
+    :param ndarray directions: (nx, ny, 3) array of pixel directions.
+    :return: Tuple of the Point3D origins and Vector3D directions arrays.
+    """
+
+    from raysect.core import Point3D, Vector3D
+
+    shape = origins.shape[0:2]
+    pixel_origins = np.empty(shape, dtype=object)
+    pixel_directions = np.empty(shape, dtype=object)
+    for (i, j), origin, direction in zip(np.ndindex(*shape), origins.reshape(-1, 3).tolist(),
+                                         directions.reshape(-1, 3).tolist()):
+        pixel_origins[i, j] = Point3D(*origin)
+        pixel_directions[i, j] = Vector3D(*direction)
+
+    return pixel_origins, pixel_directions
+
+
+def pixel_pyramid(pixel_origins, pixel_directions, factors=BINNING_FACTORS):
+    """
+    Returns the binned pixel geometry at several binning factors.
+
+    :param ndarray pixel_origins: 2D array of Point3D pixel origins.
+    :param ndarray pixel_directions: 2D array of Vector3D pixel directions.
+    :param factors: The binning factors.
+    :return: Dictionary of binning factor to (origins, directions) tuples.
+    """
+
+    return {factor: bin_pixel_geometry(pixel_origins, pixel_directions, factor) for factor in factors}
+
+
+def bin_image(image, factor, statistic='mean'):
+    """
+    Bins an image over its first two axes.
+
+    :param ndarray image: Array of shape (nx, ny, ...).
+    :param int factor: The binning factor.
+    :param str statistic: 'mean' or 'sum' of the pixel values of each block.
+    :return: Array of shape (nx // factor, ny // factor, ...).
+    """
+
+    _check_statistic(statistic)
+    image = np.asarray(image)
+    nx, ny = binned_shape(image.shape, factor)
+    blocks = image[0:nx * factor, 0:ny * factor].reshape((nx, factor, ny, factor) + image.shape[2:])
+    return getattr(blocks, statistic)(axis=(1, 3))
+
+
+def binning_matrix(shape, factor, statistic='mean'):
+    """
+    Returns the sparse matrix mapping a flattened image to its flattened binned image.
+
+    :param tuple shape: The full resolution image shape.
+    :param int factor: The binning factor.
+    :param str statistic: 'mean' or 'sum' of the pixel values of each block.
+    :return: A (binned pixels, pixels) scipy.sparse.csr_matrix.
+    """
+
+    _check_statistic(statistic)
+    nx, ny = binned_shape(shape, factor)
+    i, j = np.indices(shape[0:2])
+    binned = (i // factor) * ny + j // factor
+    inside = ((i < nx * factor) & (j < ny * factor)).ravel()
+
+    weight = 1 / factor ** 2 if statistic == 'mean' else 1.0
+    columns = np.flatnonzero(inside)
+    return csr_matrix((np.full(len(columns), weight), (binned.ravel()[inside], columns)),
+                      shape=(nx * ny, shape[0] * shape[1]))
+
+
+def bin_sensitivity_matrix(matrix, shape, factor, statistic='mean'):
+    """
+    Bins the pixels of a (pixels, voxels) sensitivity matrix.
+
+    Dense and memory mapped matrices are streamed a block of pixel rows at a
+    time and give a dense result, sparse matrices give a sparse result.
+
+    :param matrix: A dense or memory mapped array, scipy.sparse matrix or MappedSensitivityMatrix.
+    :param tuple shape: The full resolution image shape, the rows are the pixels of the flattened image.
+    :param int factor: The binning factor.
+    :param str statistic: 'mean' or 'sum' of the sensitivities of each block.
+    :return: The (binned pixels, voxels) sensitivity matrix.
+    """
+
+    matrix = getattr(matrix, 'array', matrix)
+    if matrix.shape[0] != shape[0] * shape[1]:
+        raise ValueError("The sensitivity matrix must have a row per pixel of the {} image.".format(shape))
+
+    binning = binning_matrix(shape, factor, statistic)
+    if issparse(matrix):
+        return binning.dot(matrix).tocsr()
+
+    binning = binning.tocsc()
+    result = np.zeros((binning.shape[0], matrix.shape[1]))
+    for first in range(0, matrix.shape[0], _BLOCK_ROWS):
+        block = np.asarray(matrix[first:first + _BLOCK_ROWS], dtype=np.float64)
+        result += binning[:, first:first + len(block)].dot(block)
+    return result
+
+
+def _check_factor(factor):
+    if factor not in BINNING_FACTORS:
+        raise ValueError("The binning factor must be one of {}.".format(BINNING_FACTORS))
+
+
+def _check_statistic(statistic):
+    if statistic not in ('mean', 'sum'):
+        raise ValueError("The binning statistic must be 'mean' or 'sum'.")
@@ -0,0 +1,174 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Location and caching of calcam camera calibrations.
+
+Reading a calcam calibration parses the NetCDF file and derives the origin
+and direction of every pixel. The derived geometry is cached as memory
+mapped float arrays, keyed by the hash of the calibration file and the
+binning and stride applied, so subsequent camera loads skip the parsing.
+"""
+
+import os
+import hashlib
+import textwrap
+import numpy as np
+
+from cherab.jet.paths import get_cache_path, get_data_path
+from cherab.jet.cameras.binning import bin_pixel_arrays, pixel_components, pixel_vectors
+
+
+# version 2 applies the stride before the binning
+CALIBRATION_CACHE_VERSION = 2
+
+# file hashes of the calibrations read by this process, keyed by path, size and modification time
+_file_hashes = {}
+
+
+def get_calibration_paths():
+    """
+    Returns the directories searched for calibration files.
+
+    The directories listed in the 'CHERAB_JET_CALIBRATIONS' environment
+    variable (separated by os.pathsep) are searched first, followed by the
+    'calibrations' directory of the data root, see get_data_path().
+    """
+
+    paths = [path for path in os.environ.get('CHERAB_JET_CALIBRATIONS', '').split(os.pathsep) if path]
+    paths.append(get_data_path('calibrations'))
+    return paths
+
+
+def find_calibration(file_name, paths=None):
+    """
+    Returns the path of a calibration file.
+
+    :param str file_name: The calibration file name, a full path is returned unchanged if it exists.
+    :param list paths: Additional directories searched after get_calibration_paths().
+    """
+
+    if os.path.isfile(file_name):
+        return file_name
+
+    search_paths = get_calibration_paths() + list(paths or [])
+    for path in search_paths:
+        candidate = os.path.join(path, file_name)
+        if os.path.isfile(candidate):
+            return candidate
+
+    message = textwrap.dedent(
+        """
+        Calibration file '{}' not found in
+        {}.
+        Point the CHERAB_JET_CALIBRATIONS environment variable at the directory holding it."""
+        .format(file_name, ', '.join(search_paths))
+    )
+    raise FileNotFoundError(message)
+
+
+def load_pixel_geometry(calibration_file, binning=1, stride=1):
+    """
+    Returns the pixel geometry of a calcam calibration as (nx, ny, 3) float arrays.
+
+    The geometry is read from the cache if the calibration has been loaded
+    before with the same binning and stride, otherwise the calibration is
+    parsed and the result cached. The cached arrays are memory mapped and
+    read-only.
+
+    The stride is applied first, a binned pixel covers a block of
+    binning x binning pixels of the strided lattice. This is the lattice of a
+    sensitivity matrix calculated for every stride-th pixel and binned with
+    cherab.jet.cameras.binning.bin_sensitivity_matrix().
+
+    :param str calibration_file: Path of the calcam calibration file.
+    :param int binning: Pixel binning factor, see cherab.jet.cameras.binning.
+    :param int stride: Only keep every stride-th calibration pixel along each image axis.
+    :return: Tuple of the pixel origins and normalised pixel directions arrays.
+    """
+
+    key = calibration_key(calibration_file, binning, stride)
+    cache_path = get_cache_path('calibrations')
+    origins_file = os.path.join(cache_path, key + '_origins.npy')
+    directions_file = os.path.join(cache_path, key + '_directions.npy')
+
+    try:
+        return np.load(origins_file, mmap_mode='r'), np.load(directions_file, mmap_mode='r')
+    except (FileNotFoundError, ValueError):
+        pass
+
+    from cherab.tools.observers import load_calcam_calibration
+
+    _, pixel_origins, pixel_directions = load_calcam_calibration(calibration_file)
+    origins, directions = bin_pixel_arrays(pixel_components(pixel_origins)[::stride, ::stride],
+                                           pixel_components(pixel_directions)[::stride, ::stride], binning)
+    origins = np.ascontiguousarray(origins)
+    directions = np.ascontiguousarray(directions)
+
+    try:
+        # the directions are written last, their presence marks a complete entry
+        _write_atomic(origins_file, origins)
+        _write_atomic(directions_file, directions)
+    except OSError:
+        # the cache only speeds up the next load, an unwritable cache must not break this one
+        pass
+
+    return origins, directions
+
+
+def load_camera_geometry(calibration_file, binning=1, stride=1):
+    """
+    Returns the pixel geometry of a calcam calibration in the form taken by VectorCamera.
+
+    :param str calibration_file: Path of the calcam calibration file.
+    :param int binning: Pixel binning factor, see cherab.jet.cameras.binning.
+    :param int stride: Only keep every stride-th calibration pixel along each image axis, before binning.
+    :return: Tuple of the 2D Point3D origins and Vector3D directions arrays.
+    """
+
+    return pixel_vectors(*load_pixel_geometry(calibration_file, binning, stride))
+
+
+def calibration_key(calibration_file, binning=1, stride=1):
+    """
+    Returns the cache key of the pixel geometry of a calibration.
+
+    :param str calibration_file: Path of the calcam calibration file.
+    :param int binning: Pixel binning factor.
+    :param int stride: Pixel stride.
+    :return: A hexadecimal string.
+    """
+
+    status = os.stat(calibration_file)
+    signature = (os.path.abspath(calibration_file), status.st_size, status.st_mtime_ns)
+    if signature not in _file_hashes:
+        file_hash = hashlib.sha256()
+        with open(calibration_file, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b''):
+                file_hash.update(chunk)
+        _file_hashes[signature] = file_hash.hexdigest()
+
+    description = '{}:{}:{}:{}'.format(CALIBRATION_CACHE_VERSION, _file_hashes[signature], binning, stride)
+    return hashlib.sha256(description.encode()).hexdigest()[0:32]
+
+
+def _write_atomic(path, array):
+
+    # concurrent readers never see a partial file
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'wb') as fh:
+        np.save(fh, array)
+    os.replace(temporary_path, path)
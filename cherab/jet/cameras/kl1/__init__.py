@@ -1,2 +1,2 @@
 
-from .load_kl1 import load_kl1_camera
+from .load_kl1 import load_kl1_camera, load_kl1_pixel_geometry
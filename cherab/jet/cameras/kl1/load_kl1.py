@@ -1,22 +1,62 @@
 
 
+import os
+
 from raysect.optical.observer import PowerPipeline2D, VectorCamera
 
-from cherab.tools.observers import load_calcam_calibration
+from cherab.jet.cameras.calibration import find_calibration, load_pixel_geometry
+from cherab.jet.cameras.binning import pixel_vectors
+from cherab.jet.cameras.roi import roi_geometry
+
+
+CALIBRATION_FILE = 'kl1-e4wc-sightlines.nc'
+
+_DATA_PATH = os.path.split(__file__)[0]
+
 
+def load_kl1_camera(parent=None, pipelines=None, binning=1, calibration=None, roi=None):
+    """
+    Loads the KL1 camera.
 
-def load_kl1_camera(parent=None, pipelines=None):
+    :param parent: The parent node of the camera.
+    :param list pipelines: The camera pipelines, defaults to an unfiltered power pipeline.
+    :param int binning: Bin the pixels in blocks of binning x binning, one of 1, 2, 4 or 8.
+    :param str calibration: The calcam calibration file, by default CALIBRATION_FILE is searched
+      for with find_calibration().
+    :param ndarray roi: Optional boolean mask of the (binned) image pixels to render, e.g. from
+      cherab.jet.cameras.roi.lcfs_roi(). The camera image then holds the masked pixels as a
+      (pixels in roi, 1) image, scatter its frames back into full images with scatter_frame().
+    """
 
-    camera_config = load_calcam_calibration('/home/mcarr/cherab/cherab_jet/cherab/jet/cameras/kl1/kl1-e4wc-sightlines.nc')
+    calibration = find_calibration(calibration or CALIBRATION_FILE, paths=[_DATA_PATH])
 
     if not pipelines:
         power_unfiltered = PowerPipeline2D(display_unsaturated_fraction=0.96, name="Unfiltered Power (W)")
         power_unfiltered.display_update_time = 15
         pipelines = [power_unfiltered]
 
-    pixels_shape, pixel_origins, pixel_directions = camera_config
+    # the pixel geometry is cached, only the first load of a calibration parses the calibration file
+    origins, directions = load_pixel_geometry(calibration, binning=binning)
+    if roi is None:
+        pixel_origins, pixel_directions = pixel_vectors(origins, directions)
+    else:
+        pixel_origins, pixel_directions = roi_geometry(origins, directions, roi)
     camera = VectorCamera(pixel_origins, pixel_directions, pipelines=pipelines, parent=parent)
     camera.spectral_bins = 15
     camera.pixel_samples = 1
 
     return camera
+
+
+def load_kl1_pixel_geometry(binning=1, calibration=None):
+    """
+    Returns the pixel geometry of the KL1 camera as (nx, ny, 3) float arrays, e.g. to derive a region of interest.
+
+    :param int binning: Bin the pixels in blocks of binning x binning, one of 1, 2, 4 or 8.
+    :param str calibration: The calcam calibration file, by default CALIBRATION_FILE is searched
+      for with find_calibration().
+    :return: Tuple of the pixel origins and normalised pixel directions arrays.
+    """
+
+    calibration = find_calibration(calibration or CALIBRATION_FILE, paths=[_DATA_PATH])
+    return load_pixel_geometry(calibration, binning=binning)
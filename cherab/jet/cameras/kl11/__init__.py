@@ -1,2 +1,3 @@
-
-from .load_kl11 import load_kl11_camera, load_kl11_voxel_grid, load_kl11_sensitivity_matrix
+from .load_kl11 import load_kl11_camera, load_kl11_pixel_geometry, load_kl11_voxel_grid, load_kl11_laplacian, \
+    load_kl11_sensitivity_matrix, open_kl11_sensitivity_matrix, convert_kl11_sensitivity_matrix, \
+    compress_kl11_sensitivity_matrix, load_kl11_forward_operator, kl11_pixel_lattice
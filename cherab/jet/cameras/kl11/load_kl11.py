@@ -1,79 +1,328 @@
 
 import os
-import csv
+import textwrap
 import numpy as np
 
-from raysect.core import Point2D
 from raysect.optical.observer import PowerPipeline2D, VectorCamera
-from cherab.tools.observers import load_calcam_calibration
 from cherab.tools.inversions import ToroidalVoxelGrid
 
+from cherab.jet.paths import get_data_path
+from cherab.jet.memory import measure, select_voxel_primitive
+from cherab.jet.cameras.binning import PixelLattice, bin_sensitivity_matrix, binned_shape, pixel_vectors
+from cherab.jet.cameras.calibration import find_calibration, load_pixel_geometry
+from cherab.jet.cameras.roi import roi_geometry
 
-def load_kl11_camera(parent=None, pipelines=None, stride=1):
 
-    camera_config = load_calcam_calibration('/home/mcarr/cherab/cherab_jet/cherab/jet/cameras/kl11/KL11-E1DC_87516.nc')
+CALIBRATION_FILE = 'KL11-E1DC_87516.nc'
+
+_DATA_PATH = os.path.split(__file__)[0]
+
+# the original sensitivity matrices are calculated for the 8893 voxel grid and the 334 x 334 pixel lattice
+# of every third calibration pixel
+_CAMERA_DIMENSION = 334
+_MATRIX_STRIDE = 3
+_GRID_LENGTH = 8893
+
+
+def load_kl11_camera(parent=None, pipelines=None, stride=1, binning=1, calibration=None, roi=None):
+    """
+    Loads the KL11 camera.
+
+    :param parent: The parent node of the camera.
+    :param list pipelines: The camera pipelines, defaults to an unfiltered power pipeline.
+    :param int stride: Only use every stride-th calibration pixel along each image axis.
+    :param int binning: Bin the (strided) pixels in blocks of binning x binning, one of 1, 2, 4 or 8.
+      The camera matching a sensitivity matrix uses the stride and binning of its pixel lattice,
+      see kl11_pixel_lattice().
+    :param str calibration: The calcam calibration file, by default CALIBRATION_FILE is searched
+      for with find_calibration().
+    :param ndarray roi: Optional boolean mask of the (binned) image pixels to render, e.g. from
+      cherab.jet.cameras.roi.lcfs_roi(). The camera image then holds the masked pixels as a
+      (pixels in roi, 1) image, scatter its frames back into full images with scatter_frame().
+    """
+
+    calibration = find_calibration(calibration or CALIBRATION_FILE, paths=[_DATA_PATH])
 
     if not pipelines:
         power_unfiltered = PowerPipeline2D(display_unsaturated_fraction=0.96, name="Unfiltered Power (W)")
         power_unfiltered.display_update_time = 15
         pipelines = [power_unfiltered]
 
-    pixels_shape, pixel_origins, pixel_directions = camera_config
-    camera = VectorCamera(pixel_origins[::stride, ::stride], pixel_directions[::stride, ::stride],
-                          pipelines=pipelines, parent=parent)
+    # the pixel geometry is cached, only the first load of a calibration parses the calibration file
+    origins, directions = load_pixel_geometry(calibration, binning=binning, stride=stride)
+    if roi is None:
+        pixel_origins, pixel_directions = pixel_vectors(origins, directions)
+    else:
+        pixel_origins, pixel_directions = roi_geometry(origins, directions, roi)
+    camera = VectorCamera(pixel_origins, pixel_directions, pipelines=pipelines, parent=parent)
     camera.spectral_bins = 15
     camera.pixel_samples = 1
 
     return camera
 
 
-def load_kl11_voxel_grid(parent=None, name=None):
+def load_kl11_pixel_geometry(binning=1, stride=1, calibration=None):
+    """
+    Returns the pixel geometry of the KL11 camera as (nx, ny, 3) float arrays, e.g. to derive a region of interest.
+
+    :param int binning: Bin the (strided) pixels in blocks of binning x binning, one of 1, 2, 4 or 8.
+    :param int stride: Only use every stride-th calibration pixel along each image axis.
+    :param str calibration: The calcam calibration file, by default CALIBRATION_FILE is searched
+      for with find_calibration().
+    :return: Tuple of the pixel origins and normalised pixel directions arrays.
+    """
+
+    calibration = find_calibration(calibration or CALIBRATION_FILE, paths=[_DATA_PATH])
+    return load_pixel_geometry(calibration, binning=binning, stride=stride)
+
+
+def load_kl11_voxel_grid(parent=None, name=None, report=None, structured=False, memory_budget=None,
+                         degrade=False):
+    """
+    Loads the KL11 inversion grid.
+
+    :param parent: The parent node of the grid.
+    :param str name: The name of the grid.
+    :param MemoryReport report: Optional cherab.jet.memory.MemoryReport the estimated and the measured
+      grid memory are added to.
+    :param bool structured: Build a StructuredToroidalVoxelGrid, which locates the voxels on the grid
+      lattice instead of building a CSG primitive per voxel.
+    :param float memory_budget: Memory available for the grid (bytes), a MemoryError is raised if
+      the estimated grid memory exceeds it.
+    :param bool degrade: Build the structured grid rather than fail if the CSG grid exceeds the budget,
+      see cherab.jet.memory.select_voxel_primitive().
+    """
+
+    from cherab.jet.inversions import load_voxel_grid_data, voxel_coordinates
 
     directory = os.path.split(__file__)[0]
-    voxel_grid_file = os.path.join(directory, "kl11_voxel_grid.csv")
+    grid_data = load_voxel_grid_data(os.path.join(directory, "kl11_voxel_grid.npz"))
 
-    voxel_coordinates = []
-    with open(voxel_grid_file, 'r') as fh:
-        reader = csv.reader(fh)
+    primitive_type = select_voxel_primitive(len(grid_data.cell_vertices), structured, memory_budget, degrade)
 
-        for row in reader:
-            v1 = Point2D(float(row[1]), float(row[2]))
-            v2 = Point2D(float(row[3]), float(row[4]))
-            v3 = Point2D(float(row[5]), float(row[6]))
-            v4 = Point2D(float(row[7]), float(row[8]))
-            voxel_coordinates.append((v1, v2, v3, v4))
+    with measure(report, name or "KL11 voxel grid"):
+        if primitive_type == 'structured':
+            from cherab.jet.inversions import StructuredToroidalVoxelGrid
+            voxel_grid = StructuredToroidalVoxelGrid(grid_data.cell_vertices, grid_data.segments, parent=parent,
+                                                     name=name)
+        else:
+            voxel_grid = ToroidalVoxelGrid(voxel_coordinates(grid_data.cell_vertices), parent=parent, name=name,
+                                           primitive_type='csg')
 
-    voxel_grid = ToroidalVoxelGrid(voxel_coordinates, parent=parent, name=name, primitive_type='csg')
+    if report is not None:
+        report.add_voxel_grid(name or "KL11 voxel grid", voxel_grid.count, primitive_type=primitive_type)
 
     return voxel_grid
 
 
-def load_kl11_sensitivity_matrix(camera='c', reflections=True):
+def load_kl11_laplacian():
+    """
+    Loads the sparse Laplacian regularisation operator of the KL11 inversion grid.
 
-    base_path = '/work/mcarr/tasks/kl11/data'
-    camera_dimension = 334
-    grid_length = 8893
+    :return: A (voxels, voxels) scipy.sparse.csr_matrix.
+    """
 
-    if camera == 'c':
-        if reflections:
-            sensitivity = np.load(os.path.join(base_path, 'kl11_c_rf_sensitivity_matrix.npy')).reshape((grid_length, camera_dimension * camera_dimension))
-        else:
-            sensitivity = np.load(os.path.join(base_path, 'kl11_c_norf_sensitivity_matrix.npy')).reshape((grid_length, camera_dimension * camera_dimension))
+    from cherab.jet.inversions import load_laplacian
 
-    elif camera == 'd':
-        if reflections:
-            sensitivity = np.load(os.path.join(base_path, 'kl11_d_rf_sensitivity_matrix.npy')).reshape((grid_length, camera_dimension * camera_dimension))
-        else:
-            sensitivity = np.load(os.path.join(base_path, 'kl11_d_norf_sensitivity_matrix.npy')).reshape((grid_length, camera_dimension * camera_dimension))
+    directory = os.path.split(__file__)[0]
+    return load_laplacian(os.path.join(directory, "kl11_grid_laplacian.npz"))
 
-    elif camera == 'e':
-        if reflections:
-            sensitivity = np.load(os.path.join(base_path, 'kl11_e_rf_sensitivity_matrix.npy')).reshape((grid_length, camera_dimension * camera_dimension))
-        else:
-            sensitivity = np.load(os.path.join(base_path, 'kl11_e_norf_sensitivity_matrix.npy')).reshape((grid_length, camera_dimension * camera_dimension))
 
+def load_kl11_sensitivity_matrix(camera='c', reflections=True, drop_tolerance=None, binning=1):
+    """
+    Loads the sensitivity matrix of a KL11 camera.
+
+    The matrix is memory mapped, from the converted matrix directory if it
+    exists (see convert_kl11_sensitivity_matrix()) or else from the original
+    file, so nothing is read until it is used. Each pixel sees a small fraction
+    of the voxels. With a drop tolerance the matrix is returned in CSR format,
+    converted a block of pixels at a time, see cherab.jet.inversions.sparsify().
+
+    Binned matrices hold the mean sensitivity of each block of pixels. The
+    rows are the pixels of the lattice returned by kl11_pixel_lattice(), the
+    camera loaded with its stride and binning matches them. They are read from a converted
+    binned matrix directory if it exists, or else derived from the full
+    resolution matrix.
+
+    :param str camera: The camera, 'c', 'd' or 'e'.
+    :param bool reflections: Load the matrix calculated with reflecting walls.
+    :param float drop_tolerance: Drop tolerance relative to the largest sensitivity of each pixel.
+    :param int binning: Pixel binning factor, one of 1, 2, 4 or 8.
+    :return: A (pixels, voxels) array or scipy.sparse.csr_matrix.
+    """
+
+    try:
+        sensitivity = open_kl11_sensitivity_matrix(camera, reflections, binning=binning).array
+    except FileNotFoundError:
+        sensitivity = _load_binned_matrix(camera, reflections, binning)
+
+    if drop_tolerance is not None:
+        from cherab.jet.inversions import sparsify
+        sensitivity = sparsify(sensitivity, drop_tolerance)
+
+    return sensitivity
+
+
+def open_kl11_sensitivity_matrix(camera='c', reflections=True, path=None, binning=1):
+    """
+    Opens a converted KL11 sensitivity matrix for out-of-core use.
+
+    The returned MappedSensitivityMatrix reads regions of interest of pixels
+    or blocks of voxels on demand, and streams matrix products a block of
+    pixels at a time without reading the whole matrix into memory.
+
+    :param str camera: The camera, 'c', 'd' or 'e'.
+    :param bool reflections: Open the matrix calculated with reflecting walls.
+    :param str path: The matrix directory, defaults to the one written by convert_kl11_sensitivity_matrix().
+    :param int binning: Pixel binning factor, one of 1, 2, 4 or 8.
+    :return: A cherab.jet.inversions.MappedSensitivityMatrix.
+    """
+
+    from cherab.jet.inversions import MappedSensitivityMatrix
+
+    path = path or _matrix_path(camera, reflections, binning)
+    try:
+        return MappedSensitivityMatrix(path)
+    except FileNotFoundError:
+        message = textwrap.dedent(
+            """
+            {}
+            not found: please convert the KL11 sensitivity matrix with
+            convert_kl11_sensitivity_matrix('{}', reflections={}, binning={}), or point
+            the CHERAB_JET_DATA environment variable at a directory holding it."""
+            .format(path, camera, reflections, binning)
+        )
+        raise FileNotFoundError(message)
+
+
+def convert_kl11_sensitivity_matrix(camera='c', reflections=True, dtype=np.float32, path=None, binning=1):
+    """
+    Converts an original KL11 sensitivity matrix file into a memory mappable matrix directory.
+
+    The original (voxels, pixels) float64 file is transposed to pixel-major
+    order a block at a time, so the conversion needs little memory. Storing
+    float32 halves the size of the matrix. Binned matrices are derived from
+    the converted full resolution matrix if it exists.
+
+    :param str camera: The camera, 'c', 'd' or 'e'.
+    :param bool reflections: Convert the matrix calculated with reflecting walls.
+    :param dtype: The stored data type.
+    :param str path: The matrix directory, defaults to one next to the original file.
+    :param int binning: Pixel binning factor, one of 1, 2, 4 or 8.
+    :return: A cherab.jet.inversions.MappedSensitivityMatrix.
+    """
+
+    from cherab.jet.inversions import write_mapped_matrix
+
+    return write_mapped_matrix(path or _matrix_path(camera, reflections, binning),
+                               _load_binned_matrix(camera, reflections, binning), dtype=dtype, camera=camera,
+                               reflections=reflections, stride=_MATRIX_STRIDE, binning=binning,
+                               pixels=list(binned_shape((_CAMERA_DIMENSION, _CAMERA_DIMENSION), binning)))
+
+
+def compress_kl11_sensitivity_matrix(camera='c', reflections=True, relative_error=1e-3, path=None):
+    """
+    Compresses a KL11 sensitivity matrix into a low-rank forward operator and saves it.
+
+    The converted matrix directory is used if it exists, otherwise the original
+    file. See cherab.jet.inversions.compress_sensitivity_matrix().
+
+    :param str camera: The camera, 'c', 'd' or 'e'.
+    :param bool reflections: Compress the matrix calculated with reflecting walls.
+    :param float relative_error: Maximum relative Frobenius error of the compressed matrix.
+    :param str path: The output file, defaults to one next to the original matrix.
+    :return: A cherab.jet.inversions.LowRankOperator.
+    """
+
+    from cherab.jet.inversions import compress_sensitivity_matrix, save_low_rank_operator
+
+    sensitivity = _load_binned_matrix(camera, reflections, 1)
+    operator = compress_sensitivity_matrix(sensitivity, relative_error=relative_error)
+    operator.metadata.update(camera=camera, reflections=reflections, stride=_MATRIX_STRIDE, binning=1,
+                             pixels=[_CAMERA_DIMENSION, _CAMERA_DIMENSION])
+    save_low_rank_operator(path or _matrix_path(camera, reflections) + '_low_rank.npz', operator)
+    return operator
+
+
+def load_kl11_forward_operator(camera='c', reflections=True, path=None):
+    """
+    Loads the low-rank forward operator of a KL11 camera, see compress_kl11_sensitivity_matrix().
+
+    :param str camera: The camera, 'c', 'd' or 'e'.
+    :param bool reflections: Load the operator of the matrix calculated with reflecting walls.
+    :param str path: The operator file, defaults to the one written by compress_kl11_sensitivity_matrix().
+    :return: A cherab.jet.inversions.LowRankOperator.
+    """
+
+    from cherab.jet.inversions import load_low_rank_operator
+
+    path = path or _matrix_path(camera, reflections) + '_low_rank.npz'
+    try:
+        return load_low_rank_operator(path)
+    except FileNotFoundError:
+        message = textwrap.dedent(
+            """
+            {}
+            not found: please compress the KL11 sensitivity matrix with
+            compress_kl11_sensitivity_matrix('{}', reflections={}), or point the
+            CHERAB_JET_DATA environment variable at a directory holding it."""
+            .format(path, camera, reflections)
+        )
+        raise FileNotFoundError(message)
+
+
+def kl11_pixel_lattice(camera='c', reflections=True, binning=1, matrix=None):
+    """
+    Returns the pixel lattice of a KL11 sensitivity matrix.
+
+    The lattice is read from the metadata of the matrix, or of the converted
+    matrix directory if it exists. Matrices converted before the lattice was
+    recorded, and the original files, are on the lattice of every third pixel.
+
+    :param str camera: The camera, 'c', 'd' or 'e'.
+    :param bool reflections: The matrix calculated with reflecting walls.
+    :param int binning: Pixel binning factor of the matrix, one of 1, 2, 4 or 8.
+    :param matrix: A loaded MappedSensitivityMatrix or LowRankOperator, whose lattice is returned.
+    :return: A cherab.jet.cameras.binning.PixelLattice.
+    """
+
+    if matrix is not None:
+        metadata = getattr(matrix, 'metadata', {})
     else:
+        try:
+            metadata = open_kl11_sensitivity_matrix(camera, reflections, binning=binning).metadata
+        except FileNotFoundError:
+            metadata = {}
+
+    binning = metadata.get('binning', binning)
+    pixels = metadata.get('pixels', binned_shape((_CAMERA_DIMENSION, _CAMERA_DIMENSION), binning))
+    return PixelLattice(metadata.get('stride', _MATRIX_STRIDE), binning, tuple(pixels))
+
+
+def _matrix_path(camera, reflections, binning=1):
+
+    if camera not in ('c', 'd', 'e'):
         raise ValueError("Unidentified KL11 camera - '{}'".format(camera))
+    name = 'kl11_{}_{}_sensitivity'.format(camera, 'rf' if reflections else 'norf')
+    if binning != 1:
+        name += '_bin{}'.format(binning)
+    return get_data_path('kl11', 'data', name)
+
+
+def _load_binned_matrix(camera, reflections, binning):
+
+    if binning == 1:
+        try:
+            return open_kl11_sensitivity_matrix(camera, reflections).array
+        except FileNotFoundError:
+            return _load_original_matrix(camera, reflections)
+
+    return bin_sensitivity_matrix(_load_binned_matrix(camera, reflections, 1),
+                                  (_CAMERA_DIMENSION, _CAMERA_DIMENSION), binning)
+
 
-    return np.swapaxes(sensitivity, 0, 1)
+def _load_original_matrix(camera, reflections):
 
+    path = _matrix_path(camera, reflections) + '_matrix.npy'
+    sensitivity = np.load(path, mmap_mode='r')
+    return np.swapaxes(sensitivity.reshape((_GRID_LENGTH, _CAMERA_DIMENSION * _CAMERA_DIMENSION)), 0, 1)
@@ -0,0 +1,183 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Region of interest rendering of cameras.
+
+A region of interest (ROI) is a boolean mask over the camera image. A camera
+loaded with an ROI only holds the masked pixels, as a (pixels in ROI, 1)
+image in the row-major order of the mask, so pixels seeing only tiles are
+never traced. Frames of the ROI camera are scattered back into full images
+with scatter_frame().
+
+Masks can be derived from the pixel rays: a pixel belongs to the ROI if its
+ray crosses a poloidal region, such as the LCFS or the extent of a voxel
+grid, before it reaches the first wall. Reflections are not followed, so
+reflection-dominated pixels outside the region are excluded.
+"""
+
+import numpy as np
+
+from cherab.jet.cameras.binning import pixel_vectors
+
+
+# rays are processed in blocks to bound the memory used for the sample points
+_RAY_BLOCK_SIZE = 256
+
+
+def polygon_roi(origins, directions, polygon, pulse=92782, max_distance=15.0, step=0.02):
+    """
+    Returns the pixels whose rays cross a poloidal region before reaching the first wall.
+
+    :param ndarray origins: (nx, ny, 3) array of pixel origins, e.g. from load_pixel_geometry().
+    :param ndarray directions: (nx, ny, 3) array of pixel directions.
+    :param ndarray polygon: Nx2 array of the (R, Z) vertices of the region (m).
+    :param int pulse: JET pulse number selecting the first wall outline.
+    :param float max_distance: Maximum distance travelled along each ray (m).
+    :param float step: Distance between the points sampled along each ray (m).
+    :return: (nx, ny) boolean mask.
+    """
+
+    from cherab.jet.machine import firstwall, inside_polygon
+
+    polygon = np.asarray(polygon, dtype=np.float64)
+    if polygon.ndim != 2 or polygon.shape[1] != 2:
+        raise ValueError("The region must be an Nx2 array of (R, Z) vertices.")
+
+    shape = origins.shape[0:2]
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+    directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+    directions = directions / np.linalg.norm(directions, axis=1)[:, None]
+
+    wall = firstwall(pulse)
+    distances = np.arange(0, max_distance + step, step)
+
+    mask = np.zeros(len(origins), dtype=bool)
+    for start in range(0, len(origins), _RAY_BLOCK_SIZE):
+
+        points = (origins[start:start + _RAY_BLOCK_SIZE, None, :] +
+                  distances[None, :, None] * directions[start:start + _RAY_BLOCK_SIZE, None, :])
+        r = np.hypot(points[..., 0], points[..., 1])
+        z = points[..., 2]
+
+        # the region test is cheap for points outside its bounding box, the wall is only tested for rays
+        # crossing the region somewhere along their length
+        in_region = inside_polygon(polygon, r, z)
+        candidates = np.nonzero(in_region.any(axis=1))[0]
+        if not len(candidates):
+            continue
+
+        inside = inside_polygon(wall, r[candidates], z[candidates])
+        entered = np.cumsum(inside, axis=1) > 0
+        exited = np.cumsum(entered & ~inside, axis=1) > 0
+        visible = entered & ~exited
+
+        mask[start + candidates] = (in_region[candidates] & visible).any(axis=1)
+
+    return mask.reshape(shape)
+
+
+def lcfs_roi(origins, directions, equilibrium, pulse=92782, max_distance=15.0, step=0.02):
+    """
+    Returns the pixels whose rays cross the last closed flux surface before reaching the first wall.
+
+    :param ndarray origins: (nx, ny, 3) array of pixel origins, e.g. from load_pixel_geometry().
+    :param ndarray directions: (nx, ny, 3) array of pixel directions.
+    :param equilibrium: An EFITEquilibrium, or an Nx2 array of (R, Z) LCFS vertices (m).
+    :param int pulse: JET pulse number selecting the first wall outline.
+    :param float max_distance: Maximum distance travelled along each ray (m).
+    :param float step: Distance between the points sampled along each ray (m).
+    :return: (nx, ny) boolean mask.
+    """
+
+    polygon = np.asarray(getattr(equilibrium, 'lcfs_polygon', equilibrium), dtype=np.float64)
+
+    # EFITEquilibrium holds the polygon as a 2xN array
+    if polygon.ndim == 2 and polygon.shape[0] == 2 and polygon.shape[1] != 2:
+        polygon = polygon.T
+
+    return polygon_roi(origins, directions, polygon, pulse, max_distance, step)
+
+
+def voxel_grid_roi(origins, directions, cell_vertices, pulse=92782, max_distance=15.0, step=0.02):
+    """
+    Returns the pixels whose rays cross the extent of a voxel grid before reaching the first wall.
+
+    The region is the (R, Z) bounding box of the voxels, a superset of the
+    pixels seeing the grid.
+
+    :param ndarray origins: (nx, ny, 3) array of pixel origins, e.g. from load_pixel_geometry().
+    :param ndarray directions: (nx, ny, 3) array of pixel directions.
+    :param ndarray cell_vertices: (N, 4, 2) array of voxel vertex coordinates (m).
+    :param int pulse: JET pulse number selecting the first wall outline.
+    :param float max_distance: Maximum distance travelled along each ray (m).
+    :param float step: Distance between the points sampled along each ray (m).
+    :return: (nx, ny) boolean mask.
+    """
+
+    vertices = np.asarray(cell_vertices, dtype=np.float64).reshape(-1, 2)
+    r_min, z_min = vertices.min(axis=0)
+    r_max, z_max = vertices.max(axis=0)
+    polygon = np.array([[r_min, z_min], [r_max, z_min], [r_max, z_max], [r_min, z_max]])
+
+    return polygon_roi(origins, directions, polygon, pulse, max_distance, step)
+
+
+def roi_geometry(origins, directions, roi):
+    """
+    Returns the geometry of a region of interest camera in the form taken by VectorCamera.
+
+    :param ndarray origins: (nx, ny, 3) array of pixel origins.
+    :param ndarray directions: (nx, ny, 3) array of pixel directions.
+    :param ndarray roi: (nx, ny) boolean mask of the pixels to keep.
+    :return: Tuple of the (pixels in roi, 1) Point3D origins and Vector3D directions arrays.
+    """
+
+    roi = _check_roi(roi, origins.shape[0:2])
+    return pixel_vectors(np.asarray(origins)[roi][:, None, :], np.asarray(directions)[roi][:, None, :])
+
+
+def scatter_frame(values, roi, fill=0.0):
+    """
+    Scatters the frame of a region of interest camera back into the full image.
+
+    :param ndarray values: (pixels in roi, 1, ...) or (pixels in roi, ...) array, e.g. a pipeline frame mean.
+    :param ndarray roi: (nx, ny) boolean mask the camera was loaded with.
+    :param float fill: The value of the pixels outside the region of interest.
+    :return: (nx, ny, ...) array.
+    """
+
+    roi = np.asarray(roi, dtype=bool)
+    values = np.asarray(values)
+    count = np.count_nonzero(roi)
+    if values.shape[0] != count:
+        raise ValueError("The frame holds {} pixels, the region of interest {}.".format(values.shape[0], count))
+    if values.ndim > 1 and values.shape[1] == 1:
+        values = values[:, 0]
+
+    image = np.full(roi.shape + values.shape[1:], fill, dtype=np.result_type(values, fill))
+    image[roi] = values
+    return image
+
+
+def _check_roi(roi, shape):
+
+    roi = np.asarray(roi, dtype=bool)
+    if roi.shape != tuple(shape):
+        raise ValueError("The region of interest must be a mask of the {} image.".format(tuple(shape)))
+    if not roi.any():
+        raise ValueError("The region of interest contains no pixels.")
+    return roi
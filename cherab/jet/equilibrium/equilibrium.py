@@ -24,9 +24,6 @@ import numpy as np
 from raysect.core import Point2D
 from cherab.tools.equilibrium import EFITEquilibrium
 
-from jet.data import sal
-from sal.core.exception import NodeNotFound
-
 
 # special JET constant that signifies if an x-point is not present
 X_POINT_UNAVAILABLE = -10
@@ -44,6 +41,9 @@ class JETEquilibrium:
 
     def __init__(self, pulse, user=None, dda=None, sequence=None):
 
+        from jet.data import sal
+        from sal.core.exception import NodeNotFound
+
         DDA_PATH = '/pulse/{}/ppf/signal/{}/{}:{}'
         DATA_PATH = '/pulse/{}/ppf/signal/{}/{}/{}:{}'
 
@@ -0,0 +1,25 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+from .voxel_grids import RectangularGrid, rectangular_grid, grid_axis, voxel_coordinates
+from .laplacian import grid_laplacian, combine_laplacians, save_laplacian, load_laplacian
+from .grid_files import GRID_FORMAT_VERSION, VoxelGridData, save_voxel_grid, load_voxel_grid_data, index_maps, \
+    convert_grid_pickle, convert_grid_csv
+from .structured_grid import RegularLattice, StructuredToroidalVoxelGrid, StructuredVoxelEmitter
+from .sensitivity_matrices import sparsify, density, save_sensitivity_matrix, load_sensitivity_matrix, \
+    MappedSensitivityMatrix, write_mapped_matrix
+from .sart import invert_sart_sparse
+from .low_rank import LowRankOperator, compress_sensitivity_matrix, save_low_rank_operator, load_low_rank_operator
@@ -0,0 +1,207 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Binary voxel grid files.
+
+A grid file is an uncompressed .npz archive holding:
+
+* cell_vertices - (N, 4, 2) float64 array of voxel vertex coordinates (m),
+* index_2d - (N, 2) int64 array of the lattice indices of each voxel,
+* segments - (N,) int64 array of the grid segment each voxel belongs to,
+  the lattice indices are local to a segment,
+* metadata - a JSON string with the format name, schema version and
+  free-form grid properties.
+
+The archive members are stored uncompressed so they can be memory mapped,
+and no member requires unpickling.
+"""
+
+import os
+import json
+import zipfile
+import numpy as np
+from collections import namedtuple
+
+
+GRID_FORMAT = 'cherab-jet-voxel-grid'
+GRID_FORMAT_VERSION = 1
+
+_ARRAYS = ['cell_vertices', 'index_2d', 'segments']
+
+
+VoxelGridData = namedtuple('VoxelGridData', ['cell_vertices', 'index_2d', 'segments', 'metadata'])
+VoxelGridData.__doc__ = """
+The contents of a voxel grid file, see save_voxel_grid().
+"""
+
+
+def save_voxel_grid(path, cell_vertices, index_2d=None, segments=None, **metadata):
+    """
+    Saves a voxel grid file.
+
+    :param str path: File path, conventionally with the .npz extension.
+    :param ndarray cell_vertices: (N, 4, 2) array of voxel vertex coordinates (m).
+    :param ndarray index_2d: (N, 2) array of lattice indices, defaults to (-1, -1) for every voxel.
+    :param ndarray segments: (N,) array of segment numbers, defaults to a single segment.
+    :param metadata: Grid properties stored in the metadata, must be JSON serialisable.
+    """
+
+    cell_vertices = np.ascontiguousarray(cell_vertices, dtype=np.float64)
+    if cell_vertices.ndim != 3 or cell_vertices.shape[1:] != (4, 2):
+        raise ValueError("The cell vertices must be an (N, 4, 2) array.")
+    count = len(cell_vertices)
+
+    if index_2d is None:
+        index_2d = np.full((count, 2), -1)
+    index_2d = np.ascontiguousarray(index_2d, dtype=np.int64)
+    if index_2d.shape != (count, 2):
+        raise ValueError("The 2D indices must be an (N, 2) array.")
+
+    if segments is None:
+        segments = np.zeros(count)
+    segments = np.ascontiguousarray(segments, dtype=np.int64)
+    if segments.shape != (count,):
+        raise ValueError("The segment numbers must be an (N,) array.")
+
+    header = {'format': GRID_FORMAT, 'version': GRID_FORMAT_VERSION, 'count': count}
+    header.update(metadata)
+
+    # write to a temporary file first so concurrent readers never see a partial file
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'wb') as fh:
+        np.savez(fh, cell_vertices=cell_vertices, index_2d=index_2d, segments=segments,
+                 metadata=np.array(json.dumps(header)))
+    os.replace(temporary_path, path)
+
+
+def load_voxel_grid_data(path, mmap=True):
+    """
+    Loads a voxel grid file.
+
+    :param str path: File path.
+    :param bool mmap: Memory map the arrays instead of reading them into memory.
+    :return: A VoxelGridData tuple, the metadata is a dictionary.
+    """
+
+    if mmap:
+        arrays = _memory_map_npz(path)
+    else:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+
+    try:
+        metadata = json.loads(str(arrays['metadata']))
+    except (KeyError, ValueError):
+        raise ValueError("'{}' is not a voxel grid file.".format(path))
+
+    if metadata.get('format') != GRID_FORMAT:
+        raise ValueError("'{}' is not a voxel grid file.".format(path))
+    if metadata.get('version', 0) > GRID_FORMAT_VERSION:
+        raise ValueError("The voxel grid file '{}' has version {}, this version of cherab-jet reads up to "
+                         "version {}.".format(path, metadata['version'], GRID_FORMAT_VERSION))
+
+    return VoxelGridData(arrays['cell_vertices'], arrays['index_2d'], arrays['segments'], metadata)
+
+
+def index_maps(index_2d):
+    """
+    Returns the legacy dictionary index maps of a single segment grid.
+
+    :param ndarray index_2d: (N, 2) array of lattice indices.
+    :return: Tuple of the (i, j) -> voxel and voxel -> (i, j) dictionaries.
+    """
+
+    index_2d = [tuple(index) for index in np.asarray(index_2d).tolist()]
+    return ({index: voxel for voxel, index in enumerate(index_2d)},
+            {voxel: index for voxel, index in enumerate(index_2d)})
+
+
+def convert_grid_pickle(pickle_path, path, **metadata):
+    """
+    Converts a legacy pickled grid, as written by the old KB1/KB5 grid generation demos.
+
+    The pickle is executed, only convert files from a trusted source.
+
+    :param str pickle_path: Path of the legacy pickle.
+    :param str path: Path of the new grid file.
+    :param metadata: Grid properties stored in the metadata.
+    """
+
+    import pickle
+
+    with open(pickle_path, 'rb') as fh:
+        description = pickle.load(fh)
+
+    cell_vertices = np.array([[[point[0], point[1]] for point in voxel] for voxel in description['voxels']])
+    voxel_to_index = description.get('index_1D_to_2D_map')
+    index_2d = None
+    if voxel_to_index:
+        index_2d = np.array([voxel_to_index[voxel] for voxel in range(len(cell_vertices))])
+
+    save_voxel_grid(path, cell_vertices, index_2d, **metadata)
+
+
+def convert_grid_csv(csv_path, path, **metadata):
+    """
+    Converts a legacy CSV grid of rows (voxel, r1, z1, r2, z2, r3, z3, r4, z4), as used by KL11.
+
+    :param str csv_path: Path of the CSV file.
+    :param str path: Path of the new grid file.
+    :param metadata: Grid properties stored in the metadata.
+    """
+
+    rows = np.loadtxt(csv_path, delimiter=',', ndmin=2)
+    order = np.argsort(rows[:, 0], kind='stable')
+    save_voxel_grid(path, rows[order, 1:9].reshape(-1, 4, 2), **metadata)
+
+
+def _memory_map_npz(path):
+
+    # members of an uncompressed zip archive are contiguous .npy files at a fixed offset
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as fh:
+        for info in archive.infolist():
+
+            name = os.path.splitext(info.filename)[0]
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError("The voxel grid file '{}' is compressed and cannot be memory mapped."
+                                 "".format(path))
+
+            # skip the local file header, its name and extra fields may differ from the central directory
+            fh.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(fh.read(4), dtype='<u2')
+            fh.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+
+            if dtype.hasobject:
+                raise ValueError("The voxel grid file '{}' holds object arrays.".format(path))
+
+            order = 'F' if fortran_order else 'C'
+            if dtype.kind == 'U' or not shape or 0 in shape:
+                # small members, e.g. the metadata string, are simply read
+                count = int(np.prod(shape)) if shape else 1
+                array = np.frombuffer(fh.read(count * dtype.itemsize), dtype=dtype).reshape(shape, order=order)
+            else:
+                array = np.memmap(path, dtype=dtype, mode='r', offset=fh.tell(), shape=shape, order=order)
+            arrays[name] = array
+
+    return arrays
@@ -0,0 +1,118 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Sparse Laplacian regularisation operators for rectangular voxel grids.
+"""
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, block_diag, save_npz, load_npz
+
+
+_AXIS_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+_DIAGONAL_OFFSETS = [(-1, 1), (1, 1), (1, -1), (-1, -1)]
+
+
+def grid_laplacian(index_map, neighbours=8, r_weight=1.0, z_weight=1.0, diagonal_weight=1.0):
+    """
+    Builds the discrete Laplacian of a rectangular voxel grid as a CSR matrix.
+
+    Each neighbour of a voxel that is part of the grid contributes its negative
+    weight to the voxel's row, the diagonal holds the sum of the weights so
+    each row sums to zero. With the default weights and 8 neighbours the
+    operator matches the one built by the KL11 grid generation demo.
+
+    :param ndarray index_map: (nr, nz) array of voxel numbers, -1 for lattice cells outside the grid,
+      e.g. RectangularGrid.index_map.
+    :param int neighbours: 4 for the axis neighbours only, 8 to include the diagonal neighbours.
+    :param float r_weight: Weight of the neighbours along R.
+    :param float z_weight: Weight of the neighbours along Z. Unequal R and Z weights give an
+      anisotropic operator.
+    :param float diagonal_weight: Weight of the diagonal neighbours.
+    :return: A (N, N) scipy.sparse.csr_matrix.
+    """
+
+    if neighbours not in (4, 8):
+        raise ValueError("The number of neighbours must be 4 or 8.")
+
+    index_map = np.asarray(index_map)
+    count = int(index_map.max()) + 1 if index_map.size else 0
+
+    offsets = [(di, dj, r_weight if dj == 0 else z_weight) for di, dj in _AXIS_OFFSETS]
+    if neighbours == 8:
+        offsets += [(di, dj, diagonal_weight) for di, dj in _DIAGONAL_OFFSETS]
+
+    nr, nz = index_map.shape
+    i, j = np.nonzero(index_map >= 0)
+    cells = index_map[i, j]
+
+    rows = []
+    columns = []
+    values = []
+    diagonal = np.zeros(count)
+    for di, dj, weight in offsets:
+
+        ni = i + di
+        nj = j + dj
+        valid = (ni >= 0) & (ni < nr) & (nj >= 0) & (nj < nz)
+        neighbour = np.full(cells.shape, -1, dtype=index_map.dtype)
+        neighbour[valid] = index_map[ni[valid], nj[valid]]
+        valid &= neighbour >= 0
+
+        rows.append(cells[valid])
+        columns.append(neighbour[valid])
+        values.append(np.full(np.count_nonzero(valid), -weight))
+        np.add.at(diagonal, cells[valid], weight)
+
+    rows.append(np.arange(count))
+    columns.append(np.arange(count))
+    values.append(diagonal)
+
+    return coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+                      shape=(count, count)).tocsr()
+
+
+def combine_laplacians(laplacians):
+    """
+    Combines the Laplacians of independent grid segments into a block diagonal operator.
+
+    :param list laplacians: Sparse Laplacians, in the order of the voxel numbering.
+    :return: A scipy.sparse.csr_matrix.
+    """
+
+    return block_diag(laplacians, format='csr')
+
+
+def save_laplacian(path, laplacian):
+    """
+    Saves a sparse Laplacian to an .npz file.
+
+    :param str path: File path.
+    :param laplacian: A scipy.sparse matrix.
+    """
+
+    save_npz(path, csr_matrix(laplacian), compressed=True)
+
+
+def load_laplacian(path):
+    """
+    Loads a sparse Laplacian saved with save_laplacian(), without unpickling.
+
+    :param str path: File path.
+    :return: A scipy.sparse.csr_matrix.
+    """
+
+    return load_npz(path).tocsr()
@@ -0,0 +1,179 @@
+# Copyright 2014-2017 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+# cython: language_level=3
+
+"""
+Compiled traversal of regular R-Z voxel lattices.
+"""
+
+cimport cython
+from libc.math cimport sqrt, floor, ceil
+from libc.stdlib cimport malloc, free, qsort
+
+
+cdef int _compare(const void *a, const void *b) noexcept nogil:
+
+    cdef double x = (<const double *> a)[0], y = (<const double *> b)[0]
+    return (x > y) - (x < y)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef bint add_lattice_emission(double r_origin, double z_origin, double dr, double dz,
+                                const long long[:, ::1] index_map,
+                                double x0, double y0, double z0, double vx, double vy, double vz,
+                                const long long[::1] bins, const double[::1] weights,
+                                double[::1] samples) except -1:
+    """
+    Adds the emission of the lattice voxels crossed by a line segment to a spectrum.
+
+    Exactly one of bins and weights must be given. With bins, voxel i adds its
+    path length to samples[bins[i]], voxels with a negative bin do not emit.
+    With weights, voxel i adds weights[i] times its path length to every bin.
+
+    :param float r_origin: R of the lower lattice boundary (m).
+    :param float z_origin: Z of the lower lattice boundary (m).
+    :param float dr: Cell size along R (m).
+    :param float dz: Cell size along Z (m).
+    :param ndarray index_map: C-contiguous int64 (nr, nz) array of voxel numbers, -1 for cells without a voxel.
+    :param float x0: X of the start point of the segment (m).
+    :param float y0: Y of the start point of the segment (m).
+    :param float z0: Z of the start point of the segment (m).
+    :param float vx: X component of the vector from the start to the end point (m).
+    :param float vy: Y component of the vector from the start to the end point (m).
+    :param float vz: Z component of the vector from the start to the end point (m).
+    :param ndarray bins: Int64 array of the spectral bin of each voxel, or None.
+    :param ndarray weights: Float64 array of the emission of each voxel, or None.
+    :param ndarray samples: Float64 array of the spectral bins the emission is added to.
+    :return: False if the segment does not cross a voxel, the spectrum is then unchanged.
+    """
+
+    cdef:
+        Py_ssize_t nr = index_map.shape[0], nz = index_map.shape[1], nbins = samples.shape[0]
+        Py_ssize_t i, j, k, i_low, i_high, j_low, j_high, count, capacity, b
+        long long voxel, bin
+        double a, hb, c, t, t_min, r2, r2_min, r2_max, r, discriminant, root
+        double z_min, z_max, middle, length, scale, total = 0
+        double *crossings
+        bint crossed = False
+
+    if (bins is None) == (weights is None):
+        raise ValueError("Exactly one of bins and weights must be given.")
+
+    # squared radius along the segment: a t^2 + 2 hb t + c, for 0 <= t <= 1
+    a = vx * vx + vy * vy
+    hb = x0 * vx + y0 * vy
+    c = x0 * x0 + y0 * y0
+
+    r2_min = min(c, a + 2 * hb + c)
+    r2_max = max(c, a + 2 * hb + c)
+    if a > 0:
+        t_min = -hb / a
+        if 0 < t_min < 1:
+            r2_min = min(r2_min, c - hb * hb / a)
+    r2_min = max(r2_min, 0)
+
+    z_min = min(z0, z0 + vz)
+    z_max = max(z0, z0 + vz)
+
+    if sqrt(r2_max) < r_origin or sqrt(r2_min) > r_origin + nr * dr or \
+            z_max < z_origin or z_min > z_origin + nz * dz:
+        return False
+
+    # only the boundaries within the R and Z range of the segment can be crossed
+    i_low = max(0, <Py_ssize_t> floor((sqrt(r2_min) - r_origin) / dr))
+    i_high = min(nr, <Py_ssize_t> ceil((sqrt(r2_max) - r_origin) / dr))
+    j_low = max(0, <Py_ssize_t> floor((z_min - z_origin) / dz))
+    j_high = min(nz, <Py_ssize_t> ceil((z_max - z_origin) / dz))
+
+    capacity = 2 * (i_high - i_low + 1) + (j_high - j_low + 1) + 2
+    crossings = <double *> malloc(capacity * sizeof(double))
+    if crossings == NULL:
+        raise MemoryError()
+
+    try:
+
+        crossings[0] = 0
+        crossings[1] = 1
+        count = 2
+
+        if a > 0:
+            for i in range(i_low, i_high + 1):
+                r = r_origin + i * dr
+                discriminant = hb * hb - a * (c - r * r)
+                if discriminant < 0:
+                    continue
+                root = sqrt(discriminant)
+                t = (-hb - root) / a
+                if 0 < t < 1:
+                    crossings[count] = t
+                    count += 1
+                t = (-hb + root) / a
+                if 0 < t < 1:
+                    crossings[count] = t
+                    count += 1
+
+        if vz != 0:
+            for j in range(j_low, j_high + 1):
+                t = (z_origin + j * dz - z0) / vz
+                if 0 < t < 1:
+                    crossings[count] = t
+                    count += 1
+
+        qsort(crossings, count, sizeof(double), _compare)
+
+        # the cell of each sub-segment is the cell of its midpoint
+        scale = sqrt(a + vz * vz)
+        for k in range(count - 1):
+
+            if crossings[k + 1] <= crossings[k]:
+                continue
+
+            middle = 0.5 * (crossings[k] + crossings[k + 1])
+            r = sqrt((x0 + middle * vx) ** 2 + (y0 + middle * vy) ** 2)
+            i = <Py_ssize_t> floor((r - r_origin) / dr)
+            j = <Py_ssize_t> floor((z0 + middle * vz - z_origin) / dz)
+            if i < 0 or i >= nr or j < 0 or j >= nz:
+                continue
+
+            voxel = index_map[i, j]
+            if voxel < 0:
+                continue
+
+            crossed = True
+            length = (crossings[k + 1] - crossings[k]) * scale
+
+            if bins is not None:
+                bin = bins[voxel]
+                if bin < 0:
+                    continue
+                if bin >= nbins:
+                    raise ValueError("The observer has {} spectral bins, one bin per active voxel is required "
+                                     "({}).".format(nbins, max(bins) + 1))
+                samples[bin] += length
+            else:
+                total += weights[voxel] * length
+
+    finally:
+        free(crossings)
+
+    if weights is not None and total != 0:
+        for b in range(nbins):
+            samples[b] += total
+
+    return crossed
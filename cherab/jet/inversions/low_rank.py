@@ -0,0 +1,247 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Low-rank compression of sensitivity matrices.
+
+A camera sensitivity matrix is factorised as U diag(s) Vt with a truncated
+randomised SVD. The rank is increased until the relative Frobenius error of
+the factorisation, measured exactly against the full matrix, is within the
+requested tolerance. Applying the factors costs (pixels + voxels) x rank
+operations instead of pixels x voxels.
+"""
+
+import json
+import numpy as np
+from scipy.sparse import issparse
+
+
+# rows processed at a time when streaming dense or memory mapped matrices
+_BLOCK_ROWS = 1024
+
+
+class LowRankOperator:
+    """
+    A low-rank factorisation U diag(s) Vt of a (pixels, voxels) sensitivity matrix.
+
+    :param ndarray u: (pixels, rank) array with orthonormal columns.
+    :param ndarray s: (rank,) array of singular values.
+    :param ndarray vt: (rank, voxels) array with orthonormal rows.
+    :param float relative_error: The relative Frobenius error of the factorisation, if known.
+    :param dict metadata: Properties of the matrix, e.g. its pixel lattice, must be JSON serialisable.
+    """
+
+    def __init__(self, u, s, vt, relative_error=None, metadata=None):
+
+        self.u = np.asarray(u)
+        self.s = np.asarray(s)
+        self.vt = np.asarray(vt)
+        self.relative_error = relative_error
+        self.metadata = dict(metadata or {})
+
+        if self.u.shape[1] != len(self.s) or self.vt.shape[0] != len(self.s):
+            raise ValueError("The factors of a low-rank operator must have matching ranks.")
+
+    @property
+    def shape(self):
+        return self.u.shape[0], self.vt.shape[1]
+
+    @property
+    def rank(self):
+        return len(self.s)
+
+    @property
+    def nbytes(self):
+        return self.u.nbytes + self.s.nbytes + self.vt.nbytes
+
+    def dot(self, emissivities):
+        """
+        Returns the forward model of voxel emissivities.
+
+        :param ndarray emissivities: (voxels,) or (voxels, k) array.
+        :return: (pixels,) or (pixels, k) array.
+        """
+
+        coefficients = self.vt.dot(emissivities)
+        return self.u.dot(coefficients * self.s.reshape((-1,) + (1,) * (coefficients.ndim - 1)))
+
+    def rdot(self, values):
+        """
+        Returns the product of the transposed operator with pixel values, e.g. a back projection.
+
+        :param ndarray values: (pixels,) or (pixels, k) array.
+        :return: (voxels,) or (voxels, k) array.
+        """
+
+        coefficients = self.u.T.dot(values)
+        return self.vt.T.dot(coefficients * self.s.reshape((-1,) + (1,) * (coefficients.ndim - 1)))
+
+    def __matmul__(self, emissivities):
+        return self.dot(emissivities)
+
+    def toarray(self):
+        """ Returns the full (pixels, voxels) matrix. """
+
+        return (self.u * self.s).dot(self.vt)
+
+
+def compress_sensitivity_matrix(matrix, relative_error=1e-3, initial_rank=64, max_rank=None, oversampling=10,
+                                power_iterations=2, seed=None):
+    """
+    Compresses a sensitivity matrix with a truncated randomised SVD at a guaranteed relative error.
+
+    The rank of the sketch is doubled until the factorisation meets the
+    tolerance, then truncated to the smallest rank still meeting it. The
+    relative Frobenius error of the returned factorisation is measured
+    exactly, streaming the matrix a block of rows at a time, so matrices
+    larger than memory can be compressed.
+
+    :param matrix: The (pixels, voxels) matrix, a dense or memory mapped array, scipy.sparse matrix
+      or MappedSensitivityMatrix.
+    :param float relative_error: Maximum relative Frobenius error ||A - U diag(s) Vt|| / ||A||.
+    :param int initial_rank: Rank of the first sketch.
+    :param int max_rank: Maximum rank, defaults to the smaller matrix dimension.
+    :param int oversampling: Additional sketch columns improving the accuracy of the leading singular vectors.
+    :param int power_iterations: Number of power iterations, improving the accuracy for slowly
+      decaying singular values.
+    :param seed: Seed of the random sketch.
+    :return: A LowRankOperator.
+    """
+
+    if relative_error <= 0:
+        raise ValueError("The relative error must be positive.")
+
+    matrix = getattr(matrix, 'array', matrix)
+    pixels, voxels = matrix.shape
+    max_rank = min(max_rank or min(pixels, voxels), pixels, voxels)
+    random = np.random.default_rng(seed)
+
+    norm = np.sqrt(_squared_norm(matrix))
+    if norm == 0:
+        return LowRankOperator(np.zeros((pixels, 0)), np.zeros(0), np.zeros((0, voxels)), 0.0)
+
+    rank = min(initial_rank, max_rank)
+    while True:
+
+        u, s, vt = _randomised_svd(matrix, rank, oversampling, power_iterations, random)
+
+        # the tail of the sketch spectrum and the part of A outside the sketch are orthogonal errors
+        outside = max(norm ** 2 - np.sum(s ** 2), 0)
+        tail = np.concatenate([np.cumsum((s ** 2)[::-1])[::-1], [0]])
+        admissible = np.nonzero(outside + tail <= (relative_error * norm) ** 2)[0]
+
+        if len(admissible):
+            truncated = admissible[0]
+            operator = LowRankOperator(u[:, :truncated], s[:truncated], vt[:truncated])
+            operator.relative_error = np.sqrt(_squared_residual(matrix, operator)) / norm
+            if operator.relative_error <= relative_error:
+                return operator
+
+        if rank >= max_rank:
+            raise ValueError("The matrix cannot be compressed to a relative error of {} within rank {}."
+                             "".format(relative_error, max_rank))
+        rank = min(2 * rank, max_rank)
+
+
+def save_low_rank_operator(path, operator):
+    """
+    Saves a low-rank operator to an uncompressed .npz file.
+
+    :param str path: File path.
+    :param LowRankOperator operator: The operator.
+    """
+
+    relative_error = np.nan if operator.relative_error is None else operator.relative_error
+    np.savez(path, u=operator.u, s=operator.s, vt=operator.vt, relative_error=relative_error,
+             metadata=np.array(json.dumps(operator.metadata)))
+
+
+def load_low_rank_operator(path, mmap=True):
+    """
+    Loads a low-rank operator saved with save_low_rank_operator(), without unpickling.
+
+    :param str path: File path.
+    :param bool mmap: Memory map the factors instead of reading them into memory.
+    :return: A LowRankOperator.
+    """
+
+    if mmap:
+        from .grid_files import _memory_map_npz
+        arrays = _memory_map_npz(path)
+    else:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+
+    relative_error = float(arrays['relative_error'])
+    # operators saved before the metadata was stored have none
+    metadata = json.loads(str(arrays['metadata'])) if 'metadata' in arrays else None
+    return LowRankOperator(arrays['u'], arrays['s'], arrays['vt'],
+                           None if np.isnan(relative_error) else relative_error, metadata)
+
+
+def _randomised_svd(matrix, rank, oversampling, power_iterations, random):
+
+    pixels, voxels = matrix.shape
+    columns = min(rank + oversampling, pixels, voxels)
+
+    q, _ = np.linalg.qr(_dot(matrix, random.standard_normal((voxels, columns))))
+    for _ in range(power_iterations):
+        w, _ = np.linalg.qr(_rdot(matrix, q))
+        q, _ = np.linalg.qr(_dot(matrix, w))
+
+    # B = Q^T A, computed as (A^T Q)^T
+    u, s, vt = np.linalg.svd(_rdot(matrix, q).T, full_matrices=False)
+    return q.dot(u[:, :rank]), s[:rank], vt[:rank]
+
+
+def _row_blocks(matrix):
+    for first in range(0, matrix.shape[0], _BLOCK_ROWS):
+        block = matrix[first:first + _BLOCK_ROWS]
+        yield first, block.toarray() if issparse(block) else np.asarray(block, dtype=np.float64)
+
+
+def _dot(matrix, x):
+
+    if issparse(matrix):
+        return np.asarray(matrix.dot(x))
+    result = np.empty((matrix.shape[0], x.shape[1]))
+    for first, block in _row_blocks(matrix):
+        result[first:first + len(block)] = block.dot(x)
+    return result
+
+
+def _rdot(matrix, y):
+
+    if issparse(matrix):
+        return np.asarray(matrix.T.dot(y))
+    result = np.zeros((matrix.shape[1], y.shape[1]))
+    for first, block in _row_blocks(matrix):
+        result += block.T.dot(y[first:first + len(block)])
+    return result
+
+
+def _squared_norm(matrix):
+
+    if issparse(matrix):
+        return float(np.sum(matrix.data.astype(np.float64) ** 2))
+    return float(sum(np.sum(block ** 2) for _, block in _row_blocks(matrix)))
+
+
+def _squared_residual(matrix, operator):
+
+    scaled_vt = operator.s[:, None] * operator.vt
+    return float(sum(np.sum((block - operator.u[first:first + len(block)].dot(scaled_vt)) ** 2)
+                     for first, block in _row_blocks(matrix)))
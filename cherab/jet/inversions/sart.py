@@ -0,0 +1,86 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+SART inversion of sparse sensitivity matrices.
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def invert_sart_sparse(geometry_matrix, measurement_vector, initial_guess=None, max_iterations=250,
+                       relaxation=1.0, beta_laplace=0.01, conv_tol=1.0E-4, laplacian_matrix=None):
+    """
+    Simultaneous Algebraic Reconstruction Technique (SART) using sparse matrix products.
+
+    Takes the arguments of cherab.tools.inversions.invert_sart(), but every
+    iteration costs two sparse matrix-vector products instead of dense ones.
+
+    :param geometry_matrix: The (detectors, voxels) sensitivity matrix, dense or scipy.sparse.
+    :param ndarray measurement_vector: The measured power or radiance of each detector.
+    :param ndarray initial_guess: Initial emissivity of each voxel, defaults to exp(-1) everywhere.
+    :param int max_iterations: Maximum number of iterations.
+    :param float relaxation: Relaxation parameter.
+    :param float beta_laplace: Weight of the Laplacian smoothing term.
+    :param float conv_tol: Relative change of the forward model norm at which the iteration stops.
+    :param laplacian_matrix: Optional (voxels, voxels) Laplacian operator, e.g. from grid_laplacian().
+    :return: Tuple of the voxel emissivities and the list of convergence values.
+    """
+
+    geometry_matrix = csr_matrix(geometry_matrix)
+    measurement_vector = np.asarray(measurement_vector, dtype=np.float64)
+    detectors, voxels = geometry_matrix.shape
+    if measurement_vector.shape != (detectors,):
+        raise ValueError("The measurement vector must have one value per detector.")
+
+    if initial_guess is None:
+        solution = np.full(voxels, np.exp(-1))
+    else:
+        solution = np.array(initial_guess, dtype=np.float64)
+
+    transpose = geometry_matrix.T.tocsr()
+    ray_lengths = np.asarray(geometry_matrix.sum(axis=1)).ravel()
+    ray_density = np.asarray(geometry_matrix.sum(axis=0)).ravel()
+
+    # detectors and voxels the geometry matrix does not couple are left out of the update
+    inverse_lengths = np.divide(1, ray_lengths, out=np.zeros(detectors), where=ray_lengths > 0)
+    inverse_density = np.divide(relaxation, ray_density, out=np.zeros(voxels), where=ray_density > 0)
+
+    if laplacian_matrix is not None:
+        laplacian_matrix = csr_matrix(laplacian_matrix)
+
+    convergence = []
+    forward = geometry_matrix.dot(solution)
+    previous_norm = forward.dot(forward)
+    for _ in range(max_iterations):
+
+        residual = (measurement_vector - forward) * inverse_lengths
+        update = transpose.dot(residual) * inverse_density
+        if laplacian_matrix is not None:
+            update -= beta_laplace * laplacian_matrix.dot(solution)
+
+        solution = np.maximum(solution + update, 0)
+
+        forward = geometry_matrix.dot(solution)
+        norm = forward.dot(forward)
+        convergence.append((norm - previous_norm) / previous_norm if previous_norm else 0.0)
+        previous_norm = norm
+
+        if abs(convergence[-1]) < conv_tol:
+            break
+
+    return solution, convergence
@@ -0,0 +1,342 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Storage of sensitivity matrices.
+
+A detector or pixel only sees the voxels inside its line-of-sight cone, so
+most of each sensitivity matrix row is zero. The rows are stored as
+scipy.sparse CSR matrices, dropping the entries below a tolerance relative
+to the largest entry of their row.
+
+Camera matrices too large for memory are stored in a mapped matrix
+directory: a (pixels, voxels) .npy file, read through a memory map, and a
+metadata.json file naming it. Pixel rows are contiguous on disk, so subsets
+of pixels are read efficiently and products are streamed a block of rows at
+a time. Reading a block of voxels (columns) has to scan the whole file.
+
+Rewriting a matrix writes a new, uniquely named .npy file and then replaces
+metadata.json, so readers see either the old or the new matrix, never a
+partial one.
+"""
+
+import os
+import json
+import uuid
+import shutil
+import numpy as np
+from scipy.sparse import csr_matrix, issparse, save_npz, load_npz, vstack
+
+
+# rows processed at a time, bounds the memory used to convert or multiply large memory mapped
+# matrices, about 32 MB of float32 KL11 rows
+_BLOCK_ROWS = 1024
+
+MAPPED_MATRIX_FORMAT = 'cherab-jet-sensitivity-matrix'
+MAPPED_MATRIX_VERSION = 2
+
+# version 1 directories hold a fixed matrix file name, later versions name the file in the metadata
+_MATRIX_FILE = 'sensitivity.npy'
+_METADATA_FILE = 'metadata.json'
+
+
+def sparsify(matrix, drop_tolerance=0.0, block_rows=_BLOCK_ROWS):
+    """
+    Converts a sensitivity matrix to CSR format.
+
+    Entries whose magnitude does not exceed drop_tolerance times the largest
+    magnitude in their row are dropped. A tolerance of zero only drops zeros.
+    Dense matrices are converted in blocks of rows, so memory mapped matrices
+    larger than memory can be converted.
+
+    :param matrix: A dense array or scipy.sparse matrix of shape (detectors, voxels).
+    :param float drop_tolerance: Drop tolerance relative to the row maximum.
+    :param int block_rows: Number of dense rows converted at a time.
+    :return: A scipy.sparse.csr_matrix.
+    """
+
+    if drop_tolerance < 0:
+        raise ValueError("The drop tolerance must not be negative.")
+
+    if issparse(matrix):
+        matrix = csr_matrix(matrix, dtype=matrix.dtype, copy=True)
+        if drop_tolerance:
+            row_maxima = abs(matrix).max(axis=1).toarray().ravel()
+            rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+            matrix.data[np.abs(matrix.data) <= drop_tolerance * row_maxima[rows]] = 0
+        matrix.eliminate_zeros()
+        return matrix
+
+    if matrix.ndim != 2:
+        raise ValueError("The sensitivity matrix must be two dimensional.")
+
+    blocks = []
+    for start in range(0, max(matrix.shape[0], 1), block_rows):
+        block = np.asarray(matrix[start:start + block_rows])
+        magnitude = np.abs(block)
+        block = np.where(magnitude > drop_tolerance * magnitude.max(axis=1, initial=0)[:, None], block, 0)
+        blocks.append(csr_matrix(block))
+
+    return vstack(blocks, format='csr')
+
+
+def density(matrix):
+    """
+    Returns the fraction of non-zero entries of a sensitivity matrix.
+
+    :param matrix: A dense array or scipy.sparse matrix.
+    """
+
+    size = matrix.shape[0] * matrix.shape[1]
+    if not size:
+        return 0.0
+    nonzero = matrix.nnz if issparse(matrix) else np.count_nonzero(matrix)
+    return nonzero / size
+
+
+def save_sensitivity_matrix(path, matrix):
+    """
+    Saves a sensitivity matrix, sparse matrices in the scipy .npz format and dense arrays as .npy.
+
+    :param str path: File path, the extension is replaced with .npz or .npy.
+    :param matrix: A dense array or scipy.sparse matrix.
+    :return: The path written.
+    """
+
+    base = os.path.splitext(path)[0]
+    if issparse(matrix):
+        path = base + '.npz'
+        save_npz(path, csr_matrix(matrix), compressed=False)
+    else:
+        path = base + '.npy'
+        np.save(path, matrix)
+    return path
+
+
+def load_sensitivity_matrix(path, drop_tolerance=None, mmap=True):
+    """
+    Loads a sensitivity matrix saved as a dense .npy or sparse .npz file.
+
+    :param str path: File path.
+    :param float drop_tolerance: If given, the matrix is returned in CSR format, see sparsify().
+    :param bool mmap: Memory map dense matrices instead of reading them into memory.
+    :return: A dense array or scipy.sparse.csr_matrix.
+    """
+
+    if os.path.splitext(path)[1] == '.npz':
+        matrix = load_npz(path).tocsr()
+    else:
+        matrix = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+
+    if drop_tolerance is not None:
+        matrix = sparsify(matrix, drop_tolerance)
+    return matrix
+
+
+class MappedSensitivityMatrix:
+    """
+    A read-only, memory mapped (pixels, voxels) sensitivity matrix, see write_mapped_matrix().
+
+    :param str path: The matrix directory.
+    """
+
+    def __init__(self, path):
+
+        # a concurrent rewrite may remove the matrix file named by the metadata just read, the
+        # metadata is then read again to find the new file
+        for attempt in range(3):
+            metadata = _read_metadata(path)
+            try:
+                array = np.load(os.path.join(path, metadata.get('file', _MATRIX_FILE)), mmap_mode='r')
+                break
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+
+        self.path = path
+        self.metadata = metadata
+        self.array = array
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    @property
+    def dtype(self):
+        return self.array.dtype
+
+    @property
+    def nbytes(self):
+        return self.array.nbytes
+
+    def rows(self, pixels):
+        """
+        Reads the rows of a subset of pixels, e.g. a region of interest.
+
+        :param pixels: Array of pixel numbers, or a boolean mask over the pixels, which may
+          have the shape of the camera image.
+        :return: A (len(pixels), voxels) array.
+        """
+
+        pixels = np.asarray(pixels)
+        if pixels.dtype == bool:
+            pixels = np.flatnonzero(pixels)
+        return self.array[pixels.ravel()]
+
+    def columns(self, start, stop):
+        """
+        Reads the sensitivities of all pixels to a block of voxels.
+
+        The rows are stored contiguously, so this reads the whole matrix from
+        disk whatever the size of the block. Use rows(), dot() or rdot() where
+        possible.
+
+        :param int start: First voxel of the block.
+        :param int stop: Voxel after the last voxel of the block.
+        :return: A (pixels, stop - start) array.
+        """
+
+        block = np.empty((self.shape[0], stop - start), dtype=self.dtype)
+        for first in range(0, self.shape[0], _BLOCK_ROWS):
+            block[first:first + _BLOCK_ROWS] = self.array[first:first + _BLOCK_ROWS, start:stop]
+        return block
+
+    def dot(self, emissivities, block_rows=_BLOCK_ROWS):
+        """
+        Returns the forward model of a vector of voxel emissivities, streaming the matrix a block at a time.
+
+        :param ndarray emissivities: (voxels,) or (voxels, k) array.
+        :param int block_rows: Number of pixel rows read at a time.
+        :return: (pixels,) or (pixels, k) float64 array.
+        """
+
+        emissivities = np.asarray(emissivities, dtype=np.float64)
+        result = np.empty((self.shape[0],) + emissivities.shape[1:])
+        for first in range(0, self.shape[0], block_rows):
+            result[first:first + block_rows] = self.array[first:first + block_rows].dot(emissivities)
+        return result
+
+    def rdot(self, values, block_rows=_BLOCK_ROWS):
+        """
+        Returns the product of the transposed matrix with a vector of pixel values, e.g. a back projection.
+
+        :param ndarray values: (pixels,) or (pixels, k) array.
+        :param int block_rows: Number of pixel rows read at a time.
+        :return: (voxels,) or (voxels, k) float64 array.
+        """
+
+        values = np.asarray(values, dtype=np.float64)
+        result = np.zeros((self.shape[1],) + values.shape[1:])
+        for first in range(0, self.shape[0], block_rows):
+            result += self.array[first:first + block_rows].T.dot(values[first:first + block_rows])
+        return result
+
+    def __matmul__(self, emissivities):
+        return self.dot(emissivities)
+
+    def tocsr(self, drop_tolerance=0.0):
+        """ Returns the matrix in CSR format, see sparsify(). """
+
+        return sparsify(self.array, drop_tolerance)
+
+
+def write_mapped_matrix(path, matrix, dtype=np.float32, block_rows=_BLOCK_ROWS, **metadata):
+    """
+    Writes a (pixels, voxels) sensitivity matrix directory, a block of rows at a time.
+
+    An existing matrix in the directory is replaced atomically: readers
+    opening the directory during the write see the old matrix, and readers
+    that opened it before keep reading the old matrix.
+
+    :param str path: The matrix directory.
+    :param matrix: A (pixels, voxels) array-like supporting row slicing, e.g. a memory mapped or transposed array.
+    :param dtype: The stored data type, float32 halves the size of the float64 matrices.
+    :param int block_rows: Number of rows copied at a time.
+    :param metadata: Matrix properties stored in the metadata, must be JSON serialisable.
+    :return: A MappedSensitivityMatrix of the written matrix.
+    """
+
+    if len(matrix.shape) != 2:
+        raise ValueError("The sensitivity matrix must be two dimensional.")
+
+    # a new directory is written under a temporary name and renamed when complete, an existing one
+    # receives a new, uniquely named matrix file that the replaced metadata file then points to
+    exists = os.path.isdir(path)
+    directory = path if exists else '{}.{}.tmp'.format(path.rstrip(os.sep), os.getpid())
+    os.makedirs(directory, exist_ok=exists)
+
+    replaced_file = None
+    if exists:
+        try:
+            replaced_file = _read_metadata(path).get('file', _MATRIX_FILE)
+        except (OSError, ValueError):
+            pass
+
+    matrix_file = 'sensitivity-{}.npy'.format(uuid.uuid4().hex)
+    try:
+        array = np.lib.format.open_memmap(os.path.join(directory, matrix_file), mode='w+',
+                                          dtype=dtype, shape=matrix.shape)
+        for first in range(0, matrix.shape[0], block_rows):
+            array[first:first + block_rows] = matrix[first:first + block_rows]
+        array.flush()
+        del array
+
+        header = {'format': MAPPED_MATRIX_FORMAT, 'version': MAPPED_MATRIX_VERSION, 'file': matrix_file,
+                  'shape': list(matrix.shape), 'dtype': np.dtype(dtype).name}
+        header.update(metadata)
+        metadata_file = os.path.join(directory, _METADATA_FILE)
+        temporary_file = '{}.{}.tmp'.format(metadata_file, os.getpid())
+        with open(temporary_file, 'w') as fh:
+            json.dump(header, fh, indent=2)
+        os.replace(temporary_file, metadata_file)
+
+    except BaseException:
+        if exists:
+            for name in (matrix_file, '{}.{}.tmp'.format(_METADATA_FILE, os.getpid())):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+        else:
+            shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    if not exists:
+        os.replace(directory, path)
+    elif replaced_file and replaced_file != matrix_file:
+        # open memory maps of the replaced file stay valid after it is removed
+        try:
+            os.remove(os.path.join(path, replaced_file))
+        except FileNotFoundError:
+            pass
+
+    return MappedSensitivityMatrix(path)
+
+
+def _read_metadata(path):
+
+    try:
+        with open(os.path.join(path, _METADATA_FILE), 'r') as fh:
+            metadata = json.load(fh)
+    except FileNotFoundError:
+        raise FileNotFoundError("'{}' is not a sensitivity matrix directory.".format(path))
+
+    if metadata.get('format') != MAPPED_MATRIX_FORMAT:
+        raise ValueError("'{}' is not a sensitivity matrix directory.".format(path))
+    if metadata.get('version', 0) > MAPPED_MATRIX_VERSION:
+        raise ValueError("The sensitivity matrix '{}' has version {}, this version of cherab-jet reads up to "
+                         "version {}.".format(path, metadata['version'], MAPPED_MATRIX_VERSION))
+    return metadata
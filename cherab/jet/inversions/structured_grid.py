@@ -0,0 +1,367 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Toroidal voxel grids on regular R-Z lattices.
+
+Instead of a primitive per voxel, the grid is a single cylinder whose
+material locates the lattice cells crossed by each ray segment. The cell
+boundaries crossed by a straight line are found exactly: Z boundaries are
+planes and R boundaries are cylinders, so every crossing is the root of a
+linear or quadratic equation. The cell of each sub-segment is found in O(1)
+from the lattice spacing. Ray segments are traversed by the compiled
+add_lattice_emission() of cherab.jet.inversions.lattice_trace, built with
+the package; RegularLattice.trace() is its numpy counterpart.
+"""
+
+import numpy as np
+
+from raysect.core import translate
+from raysect.primitive import Cylinder
+from raysect.optical.material import NullSurface
+
+from cherab.tools.inversions.voxels import VoxelCollection
+
+from .lattice_trace import add_lattice_emission
+
+
+class RegularLattice:
+    """
+    A regular R-Z lattice of toroidal voxels.
+
+    :param float r_origin: R of the lower lattice boundary (m).
+    :param float z_origin: Z of the lower lattice boundary (m).
+    :param float dr: Cell size along R (m).
+    :param float dz: Cell size along Z (m).
+    :param ndarray index_map: (nr, nz) array of voxel numbers, -1 for cells without a voxel.
+    """
+
+    def __init__(self, r_origin, z_origin, dr, dz, index_map):
+
+        self.r_origin = float(r_origin)
+        self.z_origin = float(z_origin)
+        self.dr = float(dr)
+        self.dz = float(dz)
+        self.index_map = np.ascontiguousarray(index_map, dtype=np.int64)
+
+        nr, nz = self.index_map.shape
+        self.r_boundaries = self.r_origin + self.dr * np.arange(nr + 1)
+        self.z_boundaries = self.z_origin + self.dz * np.arange(nz + 1)
+
+    @property
+    def shape(self):
+        return self.index_map.shape
+
+    def locate(self, r, z):
+        """
+        Returns the voxel numbers of points, -1 for points outside the grid.
+
+        :param ndarray r: Array of major radii (m).
+        :param ndarray z: Array of heights (m), broadcastable against r.
+        """
+
+        r, z = np.broadcast_arrays(np.asarray(r, dtype=np.float64), np.asarray(z, dtype=np.float64))
+        i = np.floor((r - self.r_origin) / self.dr).astype(np.int64)
+        j = np.floor((z - self.z_origin) / self.dz).astype(np.int64)
+
+        nr, nz = self.index_map.shape
+        inside = (i >= 0) & (i < nr) & (j >= 0) & (j < nz)
+        voxels = np.full(r.shape, -1, dtype=np.int64)
+        voxels[inside] = self.index_map[i[inside], j[inside]]
+        return voxels
+
+    def trace(self, origin, direction):
+        """
+        Returns the voxels crossed by a line segment and the path length in each.
+
+        :param ndarray origin: Start point (x, y, z) of the segment (m).
+        :param ndarray direction: Vector from the start to the end point of the segment (m).
+        :return: Tuple of (voxels, lengths) arrays. A voxel appears once for every time it is entered.
+        """
+
+        x0, y0, z0 = origin
+        dx, dy, dz = direction
+
+        # squared radius along the segment: a t^2 + b t + c, for 0 <= t <= 1
+        a = dx * dx + dy * dy
+        b = 2 * (x0 * dx + y0 * dy)
+        c = x0 * x0 + y0 * y0
+
+        crossings = [np.array([0.0, 1.0])]
+
+        if a > 0:
+            discriminant = b * b - 4 * a * (c - self.r_boundaries ** 2)
+            roots = np.sqrt(discriminant[discriminant >= 0])
+            crossings.append((-b - roots) / (2 * a))
+            crossings.append((-b + roots) / (2 * a))
+
+        if dz != 0:
+            crossings.append((self.z_boundaries - z0) / dz)
+
+        t = np.concatenate(crossings)
+        t = np.unique(t[(t >= 0) & (t <= 1)])
+
+        # the cell of each sub-segment is the cell of its midpoint
+        middle = 0.5 * (t[:-1] + t[1:])
+        voxels = self.locate(np.hypot(x0 + middle * dx, y0 + middle * dy), z0 + middle * dz)
+        lengths = np.diff(t) * np.sqrt(a + dz * dz)
+
+        crossed = voxels >= 0
+        return voxels[crossed], lengths[crossed]
+
+
+class StructuredToroidalVoxelGrid(VoxelCollection):
+    """
+    A toroidal voxel grid of rectangular cells on one or more regular R-Z lattices.
+
+    It can replace a ToroidalVoxelGrid of rectangular cells in sensitivity and
+    emissivity calculations. The voxels are numbered in the order of the
+    supplied cells. Cells of different segments (e.g. the KL11 divertor and
+    main chamber grids) may have different sizes, cells within a segment must
+    be axis-aligned rectangles of equal size.
+
+    :param ndarray cell_vertices: (N, 4, 2) array of cell vertex coordinates (m).
+    :param ndarray segments: (N,) array of the segment of each cell, defaults to a single segment.
+    :param parent: The parent node.
+    :param transform: The transform relative to the parent.
+    :param str name: The name of the grid.
+    :param active: The initially active voxels, see set_active().
+    :param float tolerance: Tolerance of the lattice consistency checks (m).
+    """
+
+    def __init__(self, cell_vertices, segments=None, parent=None, transform=None, name=None, active="all",
+                 tolerance=1e-6):
+
+        cell_vertices = np.asarray(cell_vertices, dtype=np.float64)
+        if cell_vertices.ndim != 3 or cell_vertices.shape[1:] != (4, 2):
+            raise ValueError("The cell vertices must be an (N, 4, 2) array.")
+
+        count = len(cell_vertices)
+        segments = np.zeros(count, dtype=np.int64) if segments is None else np.asarray(segments, dtype=np.int64)
+        if segments.shape != (count,):
+            raise ValueError("The segment numbers must be an (N,) array.")
+
+        self._count = count
+        self._cell_vertices = cell_vertices
+        self._lattices = [_build_lattice(cell_vertices, np.nonzero(segments == segment)[0], tolerance)
+                          for segment in np.unique(segments)]
+
+        cell_r = cell_vertices[:, :, 0]
+        cell_z = cell_vertices[:, :, 1]
+        r_max = cell_r.max()
+        z_min = cell_z.min()
+        z_max = cell_z.max()
+        self._volumes = np.pi * (cell_r.max(axis=1) ** 2 - cell_r.min(axis=1) ** 2) * \
+            (cell_z.max(axis=1) - cell_z.min(axis=1))
+
+        super().__init__(parent=parent, transform=transform, name=name)
+
+        self._material = StructuredVoxelEmitter(self._lattices, count, z_min)
+        self._primitive = Cylinder(r_max, z_max - z_min, parent=self, transform=translate(0, 0, z_min),
+                                   material=self._material, name="{} volume".format(name or "voxel grid"))
+
+        self.set_active(active)
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def cell_vertices(self):
+        return self._cell_vertices
+
+    @property
+    def lattices(self):
+        return self._lattices
+
+    @property
+    def voxel_volumes(self):
+        """ Volume of each voxel (m^3). """
+        return self._volumes
+
+    @property
+    def total_volume(self):
+        return float(self._volumes.sum())
+
+    def locate(self, r, z):
+        """
+        Returns the voxel numbers of points, -1 for points outside the grid.
+
+        :param ndarray r: Array of major radii (m).
+        :param ndarray z: Array of heights (m), broadcastable against r.
+        """
+
+        voxels = None
+        for lattice in self._lattices:
+            located = lattice.locate(r, z)
+            voxels = located if voxels is None else np.where(voxels >= 0, voxels, located)
+        return voxels
+
+    def set_active(self, item):
+        """
+        Selects the emitting voxels.
+
+        * "all" - every voxel emits into the spectral bin matching its voxel number, as
+          required for sensitivity calculations.
+        * "none" - no voxel emits.
+        * an integer - only this voxel emits, into all spectral bins.
+        * a list of voxel numbers - the k-th listed voxel emits into spectral bin k.
+
+        :param item: "all", "none", a voxel number or a list of voxel numbers.
+        """
+
+        if isinstance(item, str):
+            if item == "all":
+                self._material.set_bins(np.arange(self._count))
+            elif item == "none":
+                self._material.set_weights(np.zeros(self._count))
+            else:
+                raise ValueError("Unrecognised voxel selection '{}'.".format(item))
+
+        elif isinstance(item, (int, np.integer)):
+            if not 0 <= item < self._count:
+                raise IndexError("Voxel number {} is out of range.".format(item))
+            weights = np.zeros(self._count)
+            weights[item] = 1
+            self._material.set_weights(weights)
+
+        else:
+            voxels = np.asarray(item, dtype=np.int64)
+            bins = np.full(self._count, -1, dtype=np.int64)
+            bins[voxels] = np.arange(len(voxels))
+            self._material.set_bins(bins)
+
+    def set_emissivities(self, emissivities):
+        """
+        Sets the emission of each voxel, emitted uniformly into all spectral bins.
+
+        :param ndarray emissivities: (N,) array of voxel emissivities (W/m^3/str/nm).
+        """
+
+        emissivities = np.asarray(emissivities, dtype=np.float64)
+        if emissivities.shape != (self._count,):
+            raise ValueError("The emissivity array must have one value per voxel.")
+        self._material.set_weights(emissivities)
+
+    def plot(self, voxel_values=None, ax=None, title="", vmin=None, vmax=None, cmap=None):
+        """
+        Plots the grid, optionally coloured by voxel values.
+
+        :param ndarray voxel_values: (N,) array of values to colour the voxels with.
+        :param ax: The matplotlib axes to draw on, a new figure is created if None.
+        """
+
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PolyCollection
+
+        if ax is None:
+            _, ax = plt.subplots()
+
+        collection = PolyCollection(self._cell_vertices, cmap=cmap, edgecolor='k' if voxel_values is None else 'face',
+                                    facecolor='none' if voxel_values is None else None, linewidth=0.2)
+        if voxel_values is not None:
+            collection.set_array(np.asarray(voxel_values))
+            collection.set_clim(vmin, vmax)
+            plt.colorbar(collection, ax=ax)
+
+        ax.add_collection(collection)
+        ax.autoscale_view()
+        ax.set_aspect('equal')
+        ax.set_title(title)
+        ax.set_xlabel('R (m)')
+        ax.set_ylabel('Z (m)')
+        return ax
+
+
+class StructuredVoxelEmitter(NullSurface):
+    """
+    Volume material of a StructuredToroidalVoxelGrid.
+
+    :param list lattices: The RegularLattice segments of the grid.
+    :param int count: Number of voxels.
+    :param float z_offset: Height of the local origin of the primitive in the grid frame (m).
+    """
+
+    def __init__(self, lattices, count, z_offset):
+
+        super().__init__()
+        self._lattices = lattices
+        self._count = count
+        self._z_offset = z_offset
+        self._bins = None
+        self._weights = None
+
+    def set_bins(self, bins):
+        """ Voxel i emits unit emission into spectral bin bins[i], voxels with a negative bin do not emit. """
+
+        self._bins = np.ascontiguousarray(bins, dtype=np.int64)
+        self._weights = None
+
+    def set_weights(self, weights):
+        """ Voxel i emits weights[i] into every spectral bin. """
+
+        self._weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self._bins = None
+
+    def evaluate_volume(self, spectrum, world, ray, primitive, start_point, end_point, to_local, to_world):
+
+        start = start_point.transform(to_local)
+        end = end_point.transform(to_local)
+        z = start.z + self._z_offset
+
+        for lattice in self._lattices:
+            add_lattice_emission(lattice.r_origin, lattice.z_origin, lattice.dr, lattice.dz, lattice.index_map,
+                                 start.x, start.y, z, end.x - start.x, end.y - start.y, end.z - start.z,
+                                 self._bins, self._weights, spectrum.samples)
+
+        return spectrum
+
+
+def _build_lattice(cell_vertices, cells, tolerance):
+
+    vertices = cell_vertices[cells]
+    r_low = vertices[:, :, 0].min(axis=1)
+    r_high = vertices[:, :, 0].max(axis=1)
+    z_low = vertices[:, :, 1].min(axis=1)
+    z_high = vertices[:, :, 1].max(axis=1)
+
+    dr = float(np.median(r_high - r_low))
+    dz = float(np.median(z_high - z_low))
+
+    # every vertex must be a corner of an axis-aligned cell of the common size
+    corners_r = np.isclose(vertices[:, :, 0], r_low[:, None], rtol=0, atol=tolerance) | \
+        np.isclose(vertices[:, :, 0], r_high[:, None], rtol=0, atol=tolerance)
+    corners_z = np.isclose(vertices[:, :, 1], z_low[:, None], rtol=0, atol=tolerance) | \
+        np.isclose(vertices[:, :, 1], z_high[:, None], rtol=0, atol=tolerance)
+    if not (np.all(corners_r) and np.all(corners_z) and
+            np.allclose(r_high - r_low, dr, rtol=0, atol=tolerance) and
+            np.allclose(z_high - z_low, dz, rtol=0, atol=tolerance)):
+        raise ValueError("The grid cells must be axis-aligned rectangles of equal size within each segment.")
+
+    r_origin = r_low.min()
+    z_origin = z_low.min()
+    i = np.rint((r_low - r_origin) / dr).astype(np.int64)
+    j = np.rint((z_low - z_origin) / dz).astype(np.int64)
+    if not (np.allclose(r_origin + i * dr, r_low, rtol=0, atol=tolerance) and
+            np.allclose(z_origin + j * dz, z_low, rtol=0, atol=tolerance)):
+        raise ValueError("The grid cells of a segment must lie on a regular lattice.")
+
+    index_map = np.full((i.max() + 1, j.max() + 1), -1, dtype=np.int64)
+    if len(np.unique(i * index_map.shape[1] + j)) != len(cells):
+        raise ValueError("The grid cells of a segment must not overlap.")
+    index_map[i, j] = cells
+
+    return RegularLattice(r_origin, z_origin, dr, dz, index_map)
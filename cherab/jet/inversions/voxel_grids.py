@@ -0,0 +1,123 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Rectangular R-Z inversion grids clipped to the JET first wall.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+from cherab.jet.machine.wall_outline import contains
+
+
+class RectangularGrid(namedtuple('RectangularGrid', ['cell_vertices', 'index_2d', 'index_map', 'mask'])):
+    """
+    The cells of a rectangular R-Z lattice kept inside the first wall.
+
+    Cells are numbered in R-major order. The vertices of each cell are
+    ordered (r_i, z_j), (r_i, z_j+1), (r_i+1, z_j+1), (r_i+1, z_j), matching
+    the voxel grid files produced by the grid generation demos.
+
+    :ivar ndarray cell_vertices: (N, 4, 2) array of cell vertex coordinates (m).
+    :ivar ndarray index_2d: (N, 2) array of the lattice indices (i, j) of each cell.
+    :ivar ndarray index_map: (nr, nz) array of cell numbers, -1 for cells outside the grid.
+    :ivar ndarray mask: (nr, nz) boolean array, True for the cells in the grid.
+    """
+
+    __slots__ = ()
+
+    @property
+    def count(self):
+        return len(self.cell_vertices)
+
+    @property
+    def shape(self):
+        return self.mask.shape
+
+
+def grid_axis(start, end, resolution):
+    """
+    Returns evenly spaced cell boundaries spanning a range.
+
+    :param float start: Lower limit (m).
+    :param float end: Upper limit (m).
+    :param float resolution: Requested cell size (m), the actual size fits the range exactly.
+    :return: Array of cell boundaries including both limits.
+    """
+
+    cells = max(int(round((end - start) / resolution)), 1)
+    return np.linspace(start, end, num=cells + 1)
+
+
+def rectangular_grid(r_points, z_points, pulse=92782, mask=None):
+    """
+    Builds the cells of a rectangular lattice that touch the inside of the first wall.
+
+    A cell is kept if any of its four corners lies inside the wall, the test
+    is applied to all lattice nodes at once.
+
+    :param ndarray r_points: Cell boundaries in R (m), nr + 1 values for nr cells.
+    :param ndarray z_points: Cell boundaries in Z (m), nz + 1 values for nz cells.
+    :param int pulse: JET pulse number selecting the first wall.
+    :param ndarray mask: Optional (nr, nz) boolean array of cells to keep, replacing the wall test.
+    :return: A RectangularGrid.
+    """
+
+    r_points = np.asarray(r_points, dtype=np.float64)
+    z_points = np.asarray(z_points, dtype=np.float64)
+    if r_points.ndim != 1 or z_points.ndim != 1 or len(r_points) < 2 or len(z_points) < 2:
+        raise ValueError("The R and Z cell boundaries must be 1D arrays with at least two values.")
+
+    if mask is None:
+        nodes_inside = contains(r_points[:, None], z_points[None, :], pulse=pulse)
+        mask = nodes_inside[:-1, :-1] | nodes_inside[:-1, 1:] | nodes_inside[1:, 1:] | nodes_inside[1:, :-1]
+    else:
+        mask = np.array(mask, dtype=bool)
+        if mask.shape != (len(r_points) - 1, len(z_points) - 1):
+            raise ValueError("The cell mask must have shape (nr, nz) = ({}, {})."
+                             "".format(len(r_points) - 1, len(z_points) - 1))
+
+    index_2d = np.argwhere(mask)
+    index_map = np.full(mask.shape, -1, dtype=np.int64)
+    index_map[mask] = np.arange(len(index_2d))
+
+    i = index_2d[:, 0]
+    j = index_2d[:, 1]
+    cell_vertices = np.empty((len(index_2d), 4, 2))
+    cell_vertices[:, 0, 0] = r_points[i]
+    cell_vertices[:, 0, 1] = z_points[j]
+    cell_vertices[:, 1, 0] = r_points[i]
+    cell_vertices[:, 1, 1] = z_points[j + 1]
+    cell_vertices[:, 2, 0] = r_points[i + 1]
+    cell_vertices[:, 2, 1] = z_points[j + 1]
+    cell_vertices[:, 3, 0] = r_points[i + 1]
+    cell_vertices[:, 3, 1] = z_points[j]
+
+    return RectangularGrid(cell_vertices, index_2d, index_map, mask)
+
+
+def voxel_coordinates(cell_vertices):
+    """
+    Converts an (N, 4, 2) array of cell vertices to the Point2D tuples taken by ToroidalVoxelGrid.
+
+    :param ndarray cell_vertices: Array of cell vertex coordinates (m).
+    :return: List of (Point2D, Point2D, Point2D, Point2D) tuples.
+    """
+
+    from raysect.core import Point2D
+
+    return [tuple(Point2D(r, z) for r, z in cell) for cell in np.asarray(cell_vertices).tolist()]
@@ -16,4 +16,18 @@
 # under the Licence.
 
 from .cad_files import *
+from .mesh_registry import MeshComponent, MeshRegistry, get_mesh_registry, get_material, write_registry_extents
+from .view_region import ViewRegion, RegionUnion, view_region, diagnostic_rays, mesh_vertices, mesh_extents
+from .snapshot import MeshSnapshot, snapshot_key, mesh_set_digest, file_digest, write_snapshot
+from .mesh_compaction import merge_meshes, compact_meshes, MeshInstancer
+from .mesh_lod import LOD_CELL_SIZES, get_lod_path, cluster_vertices, generate_lod_meshes
+from .axisymmetric_wall import revolve_outline, import_axisymmetric_wall, opening_faces
 from .wall_outline import *
+from .wall_distance import WallDistanceField, signed_distance, get_wall_distance_field
+
+from . import cad_files as _cad_files
+
+
+def __getattr__(name):
+    # CAD mesh lists are resolved lazily by the cad_files module
+    return getattr(_cad_files, name)
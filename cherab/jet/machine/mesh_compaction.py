@@ -0,0 +1,214 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Reduces the number of mesh primitives in a scene.
+
+Many JET components, e.g. the outer poloidal limiter tiles, are identical
+copies rotated around the torus. These are stored once and instanced with a
+toroidal rotation. The remaining meshes are merged into a single mesh per
+material, so the world-level acceleration structure has far fewer
+primitives to search.
+
+The JET CAD files hold each copy with its own world-space vertices, there
+is no shared file or transform from which the repeats could be known before
+reading. MeshInstancer therefore identifies a copy once it has been read and
+releases its storage straight away, so an import holds one copy of each
+repeated mesh plus the copies still in flight. Merging meshes by material
+needs every mesh and only reduces the footprint once the import is complete.
+"""
+
+import numpy as np
+
+from raysect.core import rotate_z
+from raysect.primitive import Mesh
+
+from .view_region import mesh_vertices
+
+
+def merge_meshes(meshes, parent=None, material=None, name=None):
+    """
+    Merges meshes into a single mesh in world space.
+
+    Vertex normals are kept only if every mesh has them.
+
+    :param list meshes: List of raysect meshes.
+    :param parent: Parent node of the merged mesh.
+    :param material: Material of the merged mesh.
+    :param str name: Name of the merged mesh.
+    :return: The merged Mesh.
+    """
+
+    has_normals = all(mesh.data.vertex_normals is not None for mesh in meshes)
+
+    vertices = []
+    triangles = []
+    normals = []
+    vertex_offset = 0
+    normal_offset = 0
+    for mesh in meshes:
+
+        mesh_triangles = np.array(mesh.data.triangles, dtype=np.int32)
+        mesh_triangles[:, 0:3] += vertex_offset
+        vertices.append(mesh_vertices(mesh))
+        vertex_offset += len(vertices[-1])
+
+        if has_normals:
+            mesh_normals = np.asarray(mesh.data.vertex_normals, dtype=np.float64)
+            matrix = np.array([[mesh.to_root()[i, j] for j in range(3)] for i in range(3)])
+            normals.append(mesh_normals.dot(matrix.T))
+            if mesh_triangles.shape[1] == 6:
+                mesh_triangles[:, 3:6] += normal_offset
+            normal_offset += len(mesh_normals)
+        triangles.append(mesh_triangles if has_normals else mesh_triangles[:, 0:3])
+
+    return Mesh(np.concatenate(vertices), np.concatenate(triangles),
+                normals=np.concatenate(normals) if has_normals else None,
+                parent=parent, material=material, name=name)
+
+
+def compact_meshes(meshes, parent=None, tolerance=1e-5):
+    """
+    Replaces meshes by instanced repeated meshes and merged per-material meshes.
+
+    Repeated meshes keep their first copy, the other copies become instances
+    of it sharing its triangle storage and kd-tree. All other meshes sharing
+    a material are merged into one mesh. The replaced meshes are detached
+    from the scenegraph, the names of merged meshes are not retained.
+
+    The meshes are all held until this returns, the peak memory is that of
+    the uncompacted meshes. Use a MeshInstancer while loading to release
+    repeated meshes as they arrive.
+
+    :param list meshes: List of raysect meshes with their materials assigned.
+    :param parent: Parent node of the new primitives, defaults to the parent of the first mesh.
+      Merged vertices are in world space, the parent is therefore expected to be the world.
+    :param float tolerance: Maximum vertex deviation when identifying repeated meshes (m).
+    :return: List of the primitives added to the scenegraph.
+    """
+
+    meshes = list(meshes)
+    if not meshes:
+        return []
+
+    instancer = MeshInstancer(parent if parent is not None else meshes[0].parent, tolerance)
+    for mesh in meshes:
+        instancer.add(mesh)
+    return instancer.compact()
+
+
+class MeshInstancer:
+    """
+    Replaces repeated meshes by instances as they are added.
+
+    Each added mesh is compared with the earlier meshes of the same triangle
+    layout. A mesh that is a toroidal rotation of an earlier mesh is detached
+    and replaced by an instance of that mesh, once the caller drops its
+    references the storage of the copy is freed. compact() finally merges
+    the meshes without copies by material. The world space vertices of each
+    base mesh are held until then, so every mesh is compared without
+    recomputing them.
+
+    :param parent: Parent node of the instances and merged meshes, expected to be the world.
+    :param float tolerance: Maximum vertex deviation when identifying repeated meshes (m).
+    """
+
+    def __init__(self, parent, tolerance=1e-5):
+
+        self.parent = parent
+        self.tolerance = tolerance
+        self._bases = {}
+        self._instanced = set()
+        self._primitives = []
+
+    def add(self, mesh):
+        """
+        Adds a mesh attached to the scenegraph, with its material assigned.
+
+        :param Mesh mesh: A raysect mesh.
+        :return: The mesh, or the instance replacing it.
+        """
+
+        triangles = np.ascontiguousarray(mesh.data.triangles)
+        vertices = mesh_vertices(mesh)
+        signature = (len(vertices), triangles.shape, hash(triangles.tobytes()))
+        bases = self._bases.setdefault(signature, [])
+
+        # the world space vertices and triangles of each base are kept, rather than read again per candidate
+        for base, base_vertices, base_triangles in bases:
+            angle = _match_rotation(base_vertices, vertices, self.tolerance)
+            if angle is not None and np.array_equal(base_triangles, triangles):
+                instance = Mesh(instance=base, parent=self.parent, transform=rotate_z(angle) * base.transform,
+                                material=mesh.material, name=mesh.name)
+                mesh.parent = None
+                self._instanced.update((id(base), id(instance)))
+                self._primitives.append(instance)
+                return instance
+
+        mesh.parent = self.parent
+        bases.append((mesh, vertices, triangles))
+        self._primitives.append(mesh)
+        return mesh
+
+    def compact(self):
+        """
+        Merges the meshes without copies by material.
+
+        :return: List of the primitives in the scenegraph, the instanced meshes and their
+          instances followed by the merged meshes.
+        """
+
+        primitives = []
+        by_material = {}
+        for primitive in self._primitives:
+            if id(primitive) in self._instanced:
+                primitives.append(primitive)
+            else:
+                by_material.setdefault(id(primitive.material), []).append(primitive)
+
+        for group in by_material.values():
+            if len(group) == 1:
+                primitives.append(group[0])
+                continue
+            for mesh in group:
+                mesh.parent = None
+            material = group[0].material
+            name = "merged {} meshes ({})".format(len(group), type(material).__name__)
+            primitives.append(merge_meshes(group, parent=self.parent, material=material, name=name))
+
+        self._bases = {}
+        self._instanced = set()
+        self._primitives = []
+        return primitives
+
+
+def _match_rotation(base_vertices, vertices, tolerance):
+
+    # least squares rotation about the z axis mapping the base vertices onto the vertices
+    if not np.allclose(base_vertices[:, 2], vertices[:, 2], rtol=0, atol=tolerance):
+        return None
+
+    cross = np.sum(base_vertices[:, 0] * vertices[:, 1] - base_vertices[:, 1] * vertices[:, 0])
+    dot = np.sum(base_vertices[:, 0] * vertices[:, 0] + base_vertices[:, 1] * vertices[:, 1])
+    angle = np.arctan2(cross, dot)
+
+    cos, sin = np.cos(angle), np.sin(angle)
+    x = cos * base_vertices[:, 0] - sin * base_vertices[:, 1]
+    y = sin * base_vertices[:, 0] + cos * base_vertices[:, 1]
+    if np.max(np.hypot(x - vertices[:, 0], y - vertices[:, 1])) > tolerance:
+        return None
+
+    return float(np.rad2deg(angle))
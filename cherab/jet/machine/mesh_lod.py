@@ -0,0 +1,218 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Decimated level-of-detail (LOD) variants of the JET CAD meshes.
+
+The variants are produced by vertex clustering: vertices are snapped to a
+cubic lattice of fixed origin and cell size, the vertices in a cell are
+replaced by their mean and collapsed triangles are removed. The algorithm is
+deterministic, and no vertex moves by more than the cell diagonal, which
+bounds the geometric error of the decimated surface.
+
+Decimated meshes are intended as occluders (e.g. AbsorbingSurface wall
+overrides for sensitivity and etendue calculations), not for reflections.
+
+The variants are generated with:
+
+    python -m cherab.jet.machine.mesh_lod <level>
+
+and stored below the LOD root, see get_lod_path().
+"""
+
+import os
+import json
+import textwrap
+import numpy as np
+
+from .mesh_registry import get_cadmesh_path, get_mesh_registry
+
+
+# lattice cell size for each level of detail (m), level 0 is the full resolution CAD
+LOD_CELL_SIZES = {
+    1: 0.002,
+    2: 0.005,
+    3: 0.01,
+    4: 0.02,
+}
+
+_MANIFEST_FILE = 'manifest.json'
+
+
+def get_lod_path(level=None):
+    """
+    Returns the root directory of the decimated meshes.
+
+    The path is read from the 'CHERAB_CADMESH_LOD' environment variable,
+    defaulting to the 'lod' directory below the CAD mesh root.
+
+    :param int level: If given, the directory of this level of detail.
+    """
+
+    root = os.environ.get('CHERAB_CADMESH_LOD', os.path.join(get_cadmesh_path(), 'lod'))
+    if level is None:
+        return root
+    return os.path.join(root, 'lod{}'.format(level))
+
+
+def lod_file(component, level):
+    """
+    Returns the path of the decimated variant of a mesh component.
+
+    :param MeshComponent component: The mesh component.
+    :param int level: Level of detail, see LOD_CELL_SIZES.
+    """
+
+    return os.path.join(get_lod_path(level), os.path.splitext(component.file)[0] + '.rsm')
+
+
+def load_lod_mesh(component, level):
+    """
+    Loads the decimated variant of a mesh component.
+
+    :param MeshComponent component: The mesh component.
+    :param int level: Level of detail, see LOD_CELL_SIZES.
+    :return: A raysect Mesh.
+    """
+
+    from raysect.primitive import Mesh
+
+    path = lod_file(component, level)
+    try:
+        return Mesh.from_file(path)
+    except FileNotFoundError:
+        message = textwrap.dedent(
+            """
+            {}
+            not found: please run 'python -m cherab.jet.machine.mesh_lod {}'
+            to generate the level {} decimated meshes, or point the
+            CHERAB_CADMESH_LOD environment variable at an existing set."""
+            .format(path, level, level)
+        )
+        raise FileNotFoundError(message)
+
+
+def cluster_vertices(vertices, triangles, cell_size):
+    """
+    Decimates a triangle mesh by vertex clustering.
+
+    :param ndarray vertices: Nx3 array of vertex coordinates (m).
+    :param ndarray triangles: Mx3 array of vertex indices.
+    :param float cell_size: Lattice cell size (m).
+    :return: Tuple of (vertices, triangles, max_error), where max_error is the largest
+      distance any original vertex was moved (m). It never exceeds sqrt(3) * cell_size.
+    """
+
+    vertices = np.asarray(vertices, dtype=np.float64)
+    triangles = np.asarray(triangles)[:, 0:3]
+
+    cells = np.floor(vertices / cell_size).astype(np.int64)
+    _, cluster, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+    cluster = cluster.ravel()
+
+    clustered_vertices = np.zeros((len(counts), 3))
+    np.add.at(clustered_vertices, cluster, vertices)
+    clustered_vertices /= counts[:, None]
+
+    max_error = float(np.max(np.linalg.norm(clustered_vertices[cluster] - vertices, axis=1))) if len(vertices) else 0.0
+
+    # remove collapsed and duplicated triangles, orientation is preserved
+    clustered_triangles = cluster[triangles]
+    valid = ((clustered_triangles[:, 0] != clustered_triangles[:, 1]) &
+             (clustered_triangles[:, 1] != clustered_triangles[:, 2]) &
+             (clustered_triangles[:, 2] != clustered_triangles[:, 0]))
+    clustered_triangles = clustered_triangles[valid]
+    _, first = np.unique(np.sort(clustered_triangles, axis=1), axis=0, return_index=True)
+    clustered_triangles = clustered_triangles[np.sort(first)]
+
+    # drop vertices no longer referenced by a triangle
+    used, remap = np.unique(clustered_triangles, return_inverse=True)
+    return clustered_vertices[used], remap.reshape(-1, 3).astype(np.int32), max_error
+
+
+def generate_lod_meshes(level, groups=None, overwrite=False, progress=print):
+    """
+    Generates the decimated variants of the registry meshes for a level of detail.
+
+    A manifest listing the triangle counts and the measured geometric error of
+    each component is written alongside the meshes.
+
+    :param int level: Level of detail, see LOD_CELL_SIZES.
+    :param list groups: Mesh registry groups to decimate, defaults to all components.
+    :param bool overwrite: Regenerate meshes that already exist.
+    :param progress: Callable receiving a progress message, or None.
+    :return: The manifest dictionary.
+    """
+
+    from raysect.primitive import Mesh
+    from .cad_files import _load_mesh
+
+    try:
+        cell_size = LOD_CELL_SIZES[level]
+    except KeyError:
+        raise ValueError("Unrecognised level of detail {}, valid levels are {}."
+                         "".format(level, sorted(LOD_CELL_SIZES)))
+
+    manifest_path = os.path.join(get_lod_path(level), _MANIFEST_FILE)
+    try:
+        with open(manifest_path, 'r') as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        manifest = {}
+
+    if manifest.get('cell_size') != cell_size:
+        manifest = {'level': level, 'cell_size': cell_size, 'error_bound': float(np.sqrt(3) * cell_size),
+                    'components': {}}
+
+    components = get_mesh_registry().components(*(groups or []))
+    for component in components:
+
+        path = lod_file(component, level)
+        if not overwrite and os.path.isfile(path) and component.file in manifest['components']:
+            continue
+
+        mesh, _ = _load_mesh(component)
+        vertices, triangles, max_error = cluster_vertices(mesh.data.vertices, mesh.data.triangles, cell_size)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Mesh(vertices, triangles, smoothing=False, closed=False).save(path)
+
+        manifest['components'][component.file] = {
+            'triangles': int(len(mesh.data.triangles)),
+            'decimated_triangles': int(len(triangles)),
+            'max_error': max_error,
+        }
+        if progress:
+            progress("decimated {} from {} to {} triangles, max error {:.2G}m".format(
+                component.name, len(mesh.data.triangles), len(triangles), max_error))
+
+    with open(manifest_path, 'w') as fh:
+        json.dump(manifest, fh, indent=1, sort_keys=True)
+
+    return manifest
+
+
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate decimated JET CAD meshes.")
+    parser.add_argument('level', type=int, choices=sorted(LOD_CELL_SIZES), help="level of detail")
+    parser.add_argument('--groups', nargs='*', help="mesh registry groups, defaults to all components")
+    parser.add_argument('--overwrite', action='store_true', help="regenerate existing meshes")
+    arguments = parser.parse_args()
+
+    generate_lod_meshes(arguments.level, groups=arguments.groups, overwrite=arguments.overwrite)
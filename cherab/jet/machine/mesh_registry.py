@@ -0,0 +1,415 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Registry of the JET CAD mesh components.
+
+The components are described by the packaged table mesh_registry.csv, holding
+the component name, its group, the file relative to the CAD mesh root, the
+default material and, where known, the toroidal, radial and vertical extent.
+Nothing is instantiated until it is requested, materials are shared between
+components.
+
+The packaged table does not hold any extents yet, and components without an
+extent are never culled. Extents missing from the table are taken from the
+extents cache in the cache directory, which is filled in as meshes are
+imported (see record_mesh_extents()), or all at once by measuring the CAD
+meshes with 'python -m cherab.jet.machine.mesh_registry', see
+write_registry_extents(). Until then culling by region has no effect.
+"""
+
+import os
+import csv
+import json
+from collections import namedtuple
+
+from cherab.jet.paths import get_cache_path
+
+
+tungsten_roughness = 0.29
+beryllium_roughness = 0.26
+lambertian_roughness = 0.1
+
+
+# groups made of other groups, leaf groups are defined in the registry table
+COMPOSITE_GROUPS = {
+    'DIV_TILE5': ['DIV_TILE5_GAP', 'DIV_TILE5_STACKA', 'DIV_TILE5_STACKB', 'DIV_TILE5_STACKC', 'DIV_TILE5_STACKD'],
+    'DIVERTOR_TILES': ['DIV_TILE0', 'DIV_TILE1', 'DIV_TILE3', 'DIV_TILE4', 'DIV_TILE5', 'DIV_TILE6',
+                       'DIV_TILE7', 'DIV_TILE8', 'DIV_TILE9', 'DIV_TILE10'],
+    'DIVERTOR_STRUCTURE': ['DIV_CARRIERS', 'DIV_TILE0_STRUCTURE', 'DIV_TILE5_STRUCTURE', 'DIV_TILE9_10_STRUCTURE'],
+    'A2': ['A2_ANTENNAS', 'A2_ANTENNA_TILES'],
+    'ILA': ['ILA_ANTENNA', 'ILA_ANTENNA_TILES', 'ILA_LIMMITER'],
+    'ANTENNAS': ['A2', 'ILA', 'LOWER_HYBRID_ANTENNA', 'TAE_ANTENNAS'],
+    'INNER_WALL_GUARD_LIMITERS': ['INNER_WALL_BERYLLIUM_GUARD_LIMITERS', 'INNER_WALL_TUNGSTEN_GUARD_LIMITERS',
+                                  'IWGL_CARRIERS', 'IWGL_STRUCTURE'],
+    # complete JET mesh for first wall reflection calculations
+    'JET_MESH': ['ANTENNAS', 'INNER_WALL_GUARD_LIMITERS', 'INNER_WALL_CLADDING_TILES', 'OPL_TILES',
+                 'OPL_TILE_STRUCTURE', 'UDP_TILES', 'UO_SC', 'OL_SC', 'MUSHROOM_TILES', 'SAUSAGES', 'IL_SAUSAGES',
+                 'SC_XOVER', 'REION_PLATES', 'VACUUM_VESSEL', 'DIAGNOSTICS', 'IL_SC', 'IL_SC_STRUCTURE',
+                 'DIVERTOR_TILES', 'DIVERTOR_STRUCTURE'],
+}
+
+
+_REGISTRY_FILE = os.path.join(os.path.dirname(__file__), 'mesh_registry.csv')
+_EXTENTS_CACHE_FILE = 'mesh_extents.json'
+
+_EXTENT_FIELDS = ['phi_min', 'phi_max', 'r_min', 'r_max', 'z_min', 'z_max']
+
+_cadmesh_path = None
+_registry = None
+_materials = {}
+
+
+def get_cadmesh_path():
+    """
+    Returns the root directory of the CAD mesh files.
+
+    The path is read from the 'CHERAB_CADMESH' environment variable, falling back
+    to the JET default location. It is resolved on first use so importing the
+    machine package does not require the CAD files to be available.
+    """
+
+    global _cadmesh_path
+
+    if _cadmesh_path is None:
+        try:
+            _cadmesh_path = os.environ['CHERAB_CADMESH']
+        except KeyError:
+            if os.path.isdir('/projects/cadmesh/'):
+                _cadmesh_path = '/projects/cadmesh/'
+            else:
+                raise ValueError("CHERAB's CAD file path environment variable 'CHERAB_CADMESH' is "
+                                 "not set.")
+    return _cadmesh_path
+
+
+def _tungsten():
+    from raysect.optical.library.metal import RoughTungsten
+    return RoughTungsten(tungsten_roughness)
+
+
+def _beryllium():
+    from raysect.optical.library.metal import RoughBeryllium
+    return RoughBeryllium(beryllium_roughness)
+
+
+def _iron():
+    from raysect.optical.library.metal import RoughIron
+    return RoughIron(0.05)
+
+
+def _lambert():
+    from raysect.optical.spectralfunction import ConstantSF
+    from raysect.optical.material import Lambert
+    return Lambert(ConstantSF(lambertian_roughness))
+
+
+def _dark_lambert():
+    from raysect.optical.spectralfunction import ConstantSF
+    from raysect.optical.material import Lambert
+    return Lambert(ConstantSF(0.05))
+
+
+MATERIAL_FACTORIES = {
+    'tungsten': _tungsten,
+    'beryllium': _beryllium,
+    'iron': _iron,
+    'lambert': _lambert,
+    'dark_lambert': _dark_lambert,
+}
+
+
+def get_material(key):
+    """
+    Returns the shared default material instance for a registry material key.
+
+    :param str key: One of 'tungsten', 'beryllium', 'iron', 'lambert' or 'dark_lambert'.
+    """
+
+    try:
+        return _materials[key]
+    except KeyError:
+        pass
+
+    try:
+        factory = MATERIAL_FACTORIES[key]
+    except KeyError:
+        raise ValueError("Unrecognised mesh material '{}'.".format(key))
+
+    material = factory()
+    _materials[key] = material
+    return material
+
+
+class MeshComponent(namedtuple('MeshComponent', ['name', 'group', 'file', 'material'] + _EXTENT_FIELDS)):
+    """
+    A single CAD mesh file and its default material.
+
+    The extent fields are None if not known. The toroidal extent runs
+    counter-clockwise from phi_min to phi_max.
+
+    :ivar str name: Unique component name.
+    :ivar str group: The leaf group the component belongs to.
+    :ivar str file: File path relative to the CAD mesh root.
+    :ivar str material: Default material key, see get_material().
+    :ivar phi_min: Lower toroidal angle of the component in degrees.
+    :ivar phi_max: Upper toroidal angle of the component in degrees.
+    :ivar r_min: Minimum major radius of the component (m).
+    :ivar r_max: Maximum major radius of the component (m).
+    :ivar z_min: Minimum height of the component (m).
+    :ivar z_max: Maximum height of the component (m).
+    """
+
+    __slots__ = ()
+
+    @property
+    def path(self):
+        return os.path.join(get_cadmesh_path(), self.file)
+
+    @property
+    def default_material(self):
+        return get_material(self.material)
+
+
+class MeshRegistry:
+    """
+    Queryable collection of CAD mesh components.
+
+    :param list components: List of MeshComponent.
+    :param dict composite_groups: Mapping of group names to lists of member groups.
+    """
+
+    def __init__(self, components, composite_groups=None):
+
+        self._components = list(components)
+        self._composite_groups = dict(composite_groups or {})
+        self._by_name = {component.name: component for component in self._components}
+
+        if len(self._by_name) != len(self._components):
+            raise ValueError("Mesh component names must be unique.")
+
+    @classmethod
+    def from_file(cls, path, composite_groups=None, extents=None):
+        """
+        Loads a registry table.
+
+        :param str path: Path to the CSV table.
+        :param dict composite_groups: Mapping of group names to lists of member groups.
+        :param dict extents: Optional extents, keyed by component file, used where the table has none.
+        """
+
+        extents = extents or {}
+
+        components = []
+        with open(path, 'r') as fh:
+            for row in csv.DictReader(fh):
+                extent = [float(row[field]) if row.get(field) else None for field in _EXTENT_FIELDS]
+                if None in extent and row['file'] in extents:
+                    extent = extents[row['file']]
+                components.append(MeshComponent(row['name'], row['group'], row['file'], row['material'], *extent))
+
+        return cls(components, composite_groups)
+
+    def __len__(self):
+        return len(self._components)
+
+    def __iter__(self):
+        return iter(self._components)
+
+    def __getitem__(self, name):
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise KeyError("Unrecognised mesh component '{}'.".format(name))
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    @property
+    def groups(self):
+        """ All group names, leaf and composite. """
+
+        leaf_groups = []
+        for component in self._components:
+            if component.group not in leaf_groups:
+                leaf_groups.append(component.group)
+        return leaf_groups + [group for group in self._composite_groups if group not in leaf_groups]
+
+    def expand_group(self, group):
+        """ Returns the leaf groups making up a group. """
+
+        if group in self._composite_groups:
+            leaf_groups = []
+            for member in self._composite_groups[group]:
+                leaf_groups.extend(self.expand_group(member))
+            return leaf_groups
+
+        if not any(component.group == group for component in self._components):
+            raise ValueError("Unrecognised mesh group '{}'.".format(group))
+        return [group]
+
+    def components(self, *groups, material=None, phi_range=None, region=None):
+        """
+        Returns the components selected by group, material and toroidal range.
+
+        Components are returned in registry order without duplicates.
+
+        :param str groups: Group names, all components are returned if none are given.
+        :param str material: Only return components with this default material key.
+        :param tuple phi_range: Only return components whose toroidal extent can overlap the
+          (phi_min, phi_max) range in degrees. Components of unknown extent are always returned.
+        :param region: Only return components whose extent can overlap this ViewRegion.
+          Components of unknown extent are always returned.
+        """
+
+        if groups:
+            leaf_groups = set()
+            for group in groups:
+                leaf_groups.update(self.expand_group(group))
+            selected = [component for component in self._components if component.group in leaf_groups]
+        else:
+            selected = list(self._components)
+
+        if material is not None:
+            selected = [component for component in selected if component.material == material]
+
+        if phi_range is not None:
+            selected = [component for component in selected
+                        if component.phi_min is None or component.phi_max is None or
+                        toroidal_overlap(component.phi_min, component.phi_max, *phi_range)]
+
+        if region is not None:
+            selected = [component for component in selected if region.overlaps(component)]
+
+        return selected
+
+
+def toroidal_overlap(a_min, a_max, b_min, b_max):
+    """
+    Tests whether two toroidal ranges overlap.
+
+    Ranges are in degrees and run counter-clockwise from the minimum to the
+    maximum angle, the maximum may exceed 360 degrees.
+    """
+
+    if a_max - a_min >= 360 or b_max - b_min >= 360:
+        return True
+
+    def contains(start, end, angle):
+        start, end, angle = start % 360, end % 360, angle % 360
+        if start <= end:
+            return start <= angle <= end
+        return angle >= start or angle <= end
+
+    return contains(a_min, a_max, b_min) or contains(a_min, a_max, b_max) or contains(b_min, b_max, a_min)
+
+
+def get_mesh_registry():
+    """ Returns the JET mesh registry, loading the packaged table on first use. """
+
+    global _registry
+
+    if _registry is None:
+        _registry = MeshRegistry.from_file(_REGISTRY_FILE, COMPOSITE_GROUPS, extents=_read_extents_cache())
+    return _registry
+
+
+def _read_extents_cache():
+
+    # the cache directory is only created when extents are recorded
+    path = os.path.join(get_cache_path(create=False), _EXTENTS_CACHE_FILE)
+    if not os.path.isfile(path):
+        return {}
+
+    try:
+        with open(path, 'r') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_mesh_extents(extents):
+    """
+    Adds measured component extents to the extents cache.
+
+    The registry is reloaded so the new extents take effect immediately.
+
+    :param dict extents: Mapping of component file to a (phi_min, phi_max, r_min, r_max, z_min, z_max) tuple.
+    """
+
+    global _registry
+
+    if not extents:
+        return
+
+    cached = _read_extents_cache()
+    cached.update({file: list(extent) for file, extent in extents.items()})
+
+    # write to a temporary file first so concurrent readers never see a partial file
+    path = os.path.join(get_cache_path(), _EXTENTS_CACHE_FILE)
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'w') as fh:
+        json.dump(cached, fh, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+    _registry = None
+
+
+def write_registry_extents(groups=None, overwrite=False, progress=None):
+    """
+    Measures the extents of the registry components and writes them into the extents cache.
+
+    The packaged registry table is never modified. The CAD meshes must be
+    available, see get_cadmesh_path().
+
+    :param list groups: Mesh registry groups to measure, defaults to all components.
+    :param bool overwrite: Measure components whose extent is already known.
+    :param progress: Callable receiving a progress message, or None.
+    :return: The number of components measured.
+    """
+
+    from .cad_files import _load_mesh
+    from .view_region import mesh_extents
+
+    extents = {}
+    for component in get_mesh_registry().components(*(groups or [])):
+        if not overwrite and None not in [getattr(component, field) for field in _EXTENT_FIELDS]:
+            continue
+
+        mesh, _ = _load_mesh(component)
+        extent = mesh_extents(mesh)
+        extents[component.file] = extent
+
+        if progress:
+            progress("measured {}: phi {:.1f} to {:.1f} deg, R {:.3f} to {:.3f}m, z {:.3f} to {:.3f}m"
+                     "".format(component.name, *extent))
+
+    record_mesh_extents(extents)
+    return len(extents)
+
+
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure the extents of the JET CAD meshes and write them "
+                                                 "into the mesh extents cache.")
+    parser.add_argument('--groups', nargs='*', help="mesh registry groups, defaults to all components")
+    parser.add_argument('--overwrite', action='store_true', help="remeasure known extents")
+    arguments = parser.parse_args()
+
+    count = write_registry_extents(groups=arguments.groups, overwrite=arguments.overwrite, progress=print)
+    print("measured {} components".format(count))
@@ -0,0 +1,355 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Pre-built snapshots of the imported JET meshes.
+
+A snapshot stores the meshes of an import_jet_mesh() call, including their
+kd-trees, in a single file of concatenated RSM records. An index file lists
+the offset and size of each record, and the size, modification time and
+content digest of the mesh file it was read from. Snapshots are read through
+a memory map, so the records of meshes that are not requested are never
+read. Each loaded mesh is deserialised into its own arrays, the mesh data is
+therefore not shared with other processes through the map.
+
+Snapshots hold geometry only. Materials are cheap to assign and are applied
+when the snapshot is loaded, so a single snapshot serves every material
+configuration.
+"""
+
+import io
+import os
+import json
+import mmap
+import time
+import hashlib
+
+from raysect.primitive import Mesh
+
+from cherab.jet.paths import get_cache_path
+
+
+# increment when the snapshot layout changes to invalidate existing snapshots
+SNAPSHOT_VERSION = 2
+
+_INDEX_EXTENSION = '.json'
+_DATA_EXTENSION = '.rsm'
+
+_DIGESTS_FILE = 'file_digests.json'
+
+# file digests remembered across imports, loaded on first use
+_digests = None
+_changed_digests = set()
+
+
+def snapshot_key(groups, region=None, wall_epoch=None, lod=0):
+    """
+    Returns the key identifying a snapshot of the meshes of a set of registry groups.
+
+    The key depends on the requested groups and region, not on the components
+    selected within the region, which change as mesh extents become known. It
+    changes if the region, the first wall epoch, the level of detail, the
+    raysect version or the snapshot layout changes. No mesh file is read: the
+    mesh files are checked against the snapshot when it is used, see
+    MeshSnapshot.is_current().
+
+    :param list groups: The mesh registry groups, as passed to import_jet_mesh().
+    :param region: The ViewRegion the components are selected with, or None.
+    :param str wall_epoch: Name of the first wall configuration, see wall_epoch().
+    :param int lod: Level of detail of the meshes, see import_jet_mesh().
+    :return: A hexadecimal string.
+    """
+
+    import raysect
+
+    description = {
+        'version': SNAPSHOT_VERSION,
+        'raysect': raysect.__version__,
+        'groups': list(groups),
+        'region': repr(region),
+        'wall_epoch': wall_epoch,
+        'lod': lod,
+    }
+    return hashlib.sha256(json.dumps(description).encode()).hexdigest()[0:32]
+
+
+def mesh_set_digest(groups, lod=0):
+    """
+    Returns a digest of the content of the mesh files of a set of registry groups.
+
+    All components of the groups are included, regardless of any region culling.
+
+    :param list groups: The mesh registry groups.
+    :param int lod: Level of detail of the meshes, see import_jet_mesh().
+    :return: A hexadecimal string.
+    """
+
+    from .mesh_registry import get_mesh_registry
+
+    components = get_mesh_registry().components(*groups)
+    digests = [[component.name, component.file, file_digest(_component_file(component, lod))]
+               for component in components]
+    _save_digests()
+    return hashlib.sha256(json.dumps(digests).encode()).hexdigest()
+
+
+def file_digest(path):
+    """
+    Returns the SHA-256 digest of the content of a file, or None if the file does not exist.
+
+    Digests are remembered in the cache directory, keyed by path, size and
+    modification time, so each file is only read again once it changes.
+
+    :param str path: The file path.
+    """
+
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+
+    digests = _load_digests()
+    path = os.path.abspath(path)
+    signature = [status.st_size, status.st_mtime_ns]
+    entry = digests.get(path)
+    if entry and entry[0:2] == signature:
+        return entry[2]
+
+    file_hash = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b''):
+            file_hash.update(chunk)
+
+    digests[path] = signature + [file_hash.hexdigest()]
+    _changed_digests.add(path)
+    return digests[path][2]
+
+
+def get_snapshot_path():
+    """ Returns the directory holding the mesh snapshots, see get_cache_path(). """
+
+    return get_cache_path('snapshots')
+
+
+class MeshSnapshot:
+    """
+    A read-only, memory mapped mesh snapshot.
+
+    :param str path: Path of the snapshot, without extension.
+    """
+
+    def __init__(self, path):
+
+        with open(path + _INDEX_EXTENSION, 'r') as fh:
+            index = json.load(fh)
+
+        if index['version'] != SNAPSHOT_VERSION:
+            raise ValueError("The mesh snapshot '{}' has version {}, version {} is required."
+                             "".format(path, index['version'], SNAPSHOT_VERSION))
+
+        self.path = path
+        self._records = {record['name']: record for record in index['meshes']}
+
+        with open(path + _DATA_EXTENSION, 'rb') as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+    @classmethod
+    def open(cls, key):
+        """
+        Opens the snapshot with the given key.
+
+        :param str key: Snapshot key, see snapshot_key().
+        :return: A MeshSnapshot or None if no complete snapshot exists.
+        """
+
+        path = os.path.join(get_snapshot_path(), key)
+        if not os.path.isfile(path + _INDEX_EXTENSION):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, name):
+        return name in self._records
+
+    def is_current(self, components, lod=0):
+        """
+        Tests whether the snapshot holds the current meshes of a set of components.
+
+        A mesh file is only read if its size or modification time differ from
+        those recorded, its content digest is then compared instead, so
+        touched or copied mesh files do not invalidate the snapshot.
+
+        :param list components: The MeshComponent objects to be loaded.
+        :param int lod: Level of detail of the meshes, see import_jet_mesh().
+        """
+
+        for component in components:
+            try:
+                record = self._records[component.name]
+            except KeyError:
+                # written when the region selected other meshes, e.g. before their extents were known
+                return False
+            path = _component_file(component, lod)
+            try:
+                status = os.stat(path)
+            except OSError:
+                return False
+            if [status.st_size, status.st_mtime_ns] == record['signature']:
+                continue
+            if file_digest(path) != record['digest']:
+                return False
+
+        _save_digests()
+        return True
+
+    def load_mesh(self, component):
+        """
+        Loads the mesh of a component from the snapshot.
+
+        :param MeshComponent component: The component to load.
+        :return: A (mesh, load_time) tuple.
+        """
+
+        start_time = time.time()
+        record = self._records[component.name]
+        start = record['offset']
+        mesh = Mesh.from_file(_MappedFile(self._view[start:start + record['size']]))
+        return mesh, time.time() - start_time
+
+    def close(self):
+
+        self._view.release()
+        self._map.close()
+
+
+def write_snapshot(key, components, meshes, lod=0):
+    """
+    Writes a snapshot of imported meshes, including their kd-trees.
+
+    The index is written last, a snapshot is therefore only visible once it
+    is complete. The signature and content digest of each mesh file are
+    recorded, see MeshSnapshot.is_current().
+
+    :param str key: Snapshot key, see snapshot_key().
+    :param list components: The MeshComponent objects of the meshes.
+    :param list meshes: The imported meshes, in the same order as the components.
+    :param int lod: Level of detail of the meshes, see import_jet_mesh().
+    :return: Path of the snapshot, without extension.
+    """
+
+    path = os.path.join(get_snapshot_path(), key)
+    suffix = '.{}.tmp'.format(os.getpid())
+
+    records = []
+    with open(path + _DATA_EXTENSION + suffix, 'wb') as fh:
+        for component, mesh in zip(components, meshes):
+            buffer = io.BytesIO()
+            mesh.save(buffer, kdtree=True)
+            path_status = os.stat(_component_file(component, lod))
+            records.append({'name': component.name, 'offset': fh.tell(), 'size': buffer.tell(),
+                            'signature': [path_status.st_size, path_status.st_mtime_ns],
+                            'digest': file_digest(_component_file(component, lod))})
+            fh.write(buffer.getbuffer())
+    _save_digests()
+
+    with open(path + _INDEX_EXTENSION + suffix, 'w') as fh:
+        json.dump({'version': SNAPSHOT_VERSION, 'meshes': records}, fh, indent=1)
+
+    os.replace(path + _DATA_EXTENSION + suffix, path + _DATA_EXTENSION)
+    os.replace(path + _INDEX_EXTENSION + suffix, path + _INDEX_EXTENSION)
+
+    return path
+
+
+def _component_file(component, lod):
+
+    from .mesh_lod import lod_file
+    return lod_file(component, lod) if lod else component.path
+
+
+def _load_digests():
+
+    global _digests
+
+    if _digests is None:
+        try:
+            with open(os.path.join(get_cache_path(), _DIGESTS_FILE), 'r') as fh:
+                _digests = json.load(fh)
+        except (OSError, ValueError):
+            _digests = {}
+    return _digests
+
+
+def _save_digests():
+
+    if not _changed_digests:
+        return
+
+    path = os.path.join(get_cache_path(), _DIGESTS_FILE)
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        # merge with digests recorded by other processes since the file was read
+        try:
+            with open(path, 'r') as fh:
+                stored = json.load(fh)
+        except (OSError, ValueError):
+            stored = {}
+        stored.update({name: _digests[name] for name in _changed_digests})
+        with open(temporary_path, 'w') as fh:
+            json.dump(stored, fh, indent=1, sort_keys=True)
+        os.replace(temporary_path, path)
+        _changed_digests.clear()
+    except OSError:
+        # the digests only speed up the next key, an unwritable cache must not break this one
+        pass
+
+
+class _MappedFile(io.RawIOBase):
+    """ Read-only file object over a region of a memory map. """
+
+    def __init__(self, view):
+        self._view = view
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = max(min(len(buffer), len(self._view) - self._position), 0)
+        buffer[0:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        else:
+            self._position = len(self._view) + offset
+        return self._position
+
+    def tell(self):
+        return self._position
@@ -0,0 +1,309 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Regions of the vessel seen by a diagnostic, used to cull mesh imports.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+from .mesh_registry import toroidal_overlap
+from .wall_outline import firstwall, inside_polygon
+
+
+# rays are processed in blocks to bound the memory used for the sample points
+_RAY_BLOCK_SIZE = 256
+
+
+class ViewRegion(namedtuple('ViewRegion', ['phi_min', 'phi_max', 'r_min', 'r_max', 'z_min', 'z_max'])):
+    """
+    A toroidal sector of the vessel bounded in major radius and height.
+
+    The toroidal range runs counter-clockwise from phi_min to phi_max in
+    degrees, phi_max may exceed 360.
+
+    :ivar float phi_min: Lower toroidal angle (degrees).
+    :ivar float phi_max: Upper toroidal angle (degrees).
+    :ivar float r_min: Minimum major radius (m).
+    :ivar float r_max: Maximum major radius (m).
+    :ivar float z_min: Minimum height (m).
+    :ivar float z_max: Maximum height (m).
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, phi_min=0, phi_max=360, r_min=0, r_max=np.inf, z_min=-np.inf, z_max=np.inf):
+        return super().__new__(cls, phi_min, phi_max, r_min, r_max, z_min, z_max)
+
+    def overlaps(self, extent):
+        """
+        Tests whether an extent can overlap the region.
+
+        :param extent: Any object with phi_min, phi_max, r_min, r_max, z_min and z_max
+          attributes, e.g. a MeshComponent. Unknown (None) limits never exclude the extent.
+        """
+
+        if extent.phi_min is not None and extent.phi_max is not None:
+            if not toroidal_overlap(self.phi_min, self.phi_max, extent.phi_min, extent.phi_max):
+                return False
+
+        if extent.r_min is not None and extent.r_min > self.r_max:
+            return False
+        if extent.r_max is not None and extent.r_max < self.r_min:
+            return False
+        if extent.z_min is not None and extent.z_min > self.z_max:
+            return False
+        if extent.z_max is not None and extent.z_max < self.z_min:
+            return False
+
+        return True
+
+
+class RegionUnion(tuple):
+    """
+    A union of regions, e.g. the views of a camera at several toroidal locations.
+
+    :param regions: Iterable of ViewRegion or other RegionUnion objects.
+    """
+
+    def __new__(cls, regions):
+        return super().__new__(cls, regions)
+
+    def overlaps(self, extent):
+        return any(region.overlaps(extent) for region in self)
+
+
+def toroidal_extent(phi, full_torus_gap=1.0):
+    """
+    Returns the smallest toroidal range containing all the supplied angles.
+
+    :param ndarray phi: Toroidal angles in degrees.
+    :param float full_torus_gap: If no gap between the angles is larger than this (degrees),
+      the full torus is returned.
+    :return: A (phi_min, phi_max) tuple with 0 <= phi_min < 360 and phi_min <= phi_max.
+    """
+
+    phi = np.sort(np.mod(np.ravel(phi), 360))
+    if phi.size == 0:
+        raise ValueError("At least one angle is required to compute a toroidal extent.")
+
+    gaps = np.diff(np.append(phi, phi[0] + 360))
+    largest = np.argmax(gaps)
+    if gaps[largest] <= full_torus_gap:
+        return 0.0, 360.0
+
+    phi_min = phi[(largest + 1) % phi.size]
+    phi_max = phi[largest]
+    if phi_max < phi_min:
+        phi_max += 360
+    return float(phi_min), float(phi_max)
+
+
+def points_extent(points):
+    """
+    Returns the toroidal, radial and vertical extent of a set of points.
+
+    :param ndarray points: Nx3 array of cartesian coordinates (m).
+    :return: Tuple of (phi_min, phi_max, r_min, r_max, z_min, z_max).
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    r = np.hypot(points[:, 0], points[:, 1])
+    phi = np.rad2deg(np.arctan2(points[:, 1], points[:, 0]))
+    phi_min, phi_max = toroidal_extent(phi)
+    return phi_min, phi_max, float(r.min()), float(r.max()), float(points[:, 2].min()), float(points[:, 2].max())
+
+
+def mesh_vertices(mesh):
+    """
+    Returns the vertices of a mesh in world space.
+
+    The mesh transform is applied, so instanced and rotated meshes are handled correctly.
+
+    :param Mesh mesh: A raysect mesh.
+    :return: Nx3 array of vertex coordinates (m).
+    """
+
+    vertices = np.asarray(mesh.data.vertices, dtype=np.float64)
+    matrix = np.array([[mesh.to_root()[i, j] for j in range(4)] for i in range(4)])
+    return vertices.dot(matrix[0:3, 0:3].T) + matrix[0:3, 3]
+
+
+def mesh_extents(mesh):
+    """
+    Returns the toroidal, radial and vertical extent of a mesh in world space.
+
+    :param Mesh mesh: A raysect mesh.
+    :return: Tuple of (phi_min, phi_max, r_min, r_max, z_min, z_max).
+    """
+
+    return points_extent(mesh_vertices(mesh))
+
+
+def view_region(diagnostic, pulse=92782, margin=0.1, angular_margin=2.0, max_distance=15.0, step=0.02,
+                max_rays=2500):
+    """
+    Estimates the region of the vessel a diagnostic can see.
+
+    Rays are traced through the first wall polygon of the given pulse, each ray
+    entering the wall polygon contributes the points from its origin until it
+    leaves the polygon again, so the structures between the detector and the
+    vessel (e.g. collimators and port tubes) are included. The region bounds
+    these points, enlarged by the margins. Reflected
+    light is not taken into account, the region is therefore intended for
+    occlusion-only (e.g. absorbing wall) calculations.
+
+    Bolometer cameras return the union of the regions seen by each foil, so
+    cameras viewing from several toroidal locations (e.g. KB1) are handled.
+    A list of diagnostics or regions returns the union of their regions.
+
+    :param diagnostic: A BolometerCamera, a VectorCamera, a LineOfSightGroup, a single sight
+      line, an (origins, directions) tuple of Nx3 arrays in world coordinates or a list of these.
+    :param int pulse: JET pulse number selecting the first wall outline.
+    :param float margin: Radial and vertical margin added to the region (m).
+    :param float angular_margin: Toroidal margin added to the region (degrees).
+    :param float max_distance: Maximum distance travelled along each ray (m).
+    :param float step: Sampling step along each ray (m).
+    :param int max_rays: Cameras are sub-sampled to at most approximately this many rays.
+    :return: A ViewRegion or RegionUnion.
+    """
+
+    settings = dict(pulse=pulse, margin=margin, angular_margin=angular_margin, max_distance=max_distance,
+                    step=step, max_rays=max_rays)
+
+    if isinstance(diagnostic, (ViewRegion, RegionUnion)):
+        return diagnostic
+
+    if isinstance(diagnostic, list):
+        return RegionUnion(view_region(item, **settings) for item in diagnostic)
+
+    ray_sets = diagnostic_rays(diagnostic, max_rays)
+    if len(ray_sets) == 1:
+        return _region_from_rays(*ray_sets[0], pulse, margin, angular_margin, max_distance, step)
+    return RegionUnion(_region_from_rays(origins, directions, pulse, margin, angular_margin, max_distance, step)
+                       for origins, directions in ray_sets)
+
+
+def _region_from_rays(origins, directions, pulse, margin, angular_margin, max_distance, step):
+
+    directions = directions / np.linalg.norm(directions, axis=1)[:, None]
+
+    wall = firstwall(pulse)
+    distances = np.arange(0, max_distance + step, step)
+
+    seen = []
+    for start in range(0, len(origins), _RAY_BLOCK_SIZE):
+
+        block_origins = origins[start:start + _RAY_BLOCK_SIZE]
+        block_directions = directions[start:start + _RAY_BLOCK_SIZE]
+        points = block_origins[:, None, :] + distances[None, :, None] * block_directions[:, None, :]
+
+        inside = inside_polygon(wall, np.hypot(points[..., 0], points[..., 1]), points[..., 2])
+
+        # keep the points from the detector until the first wall is hit, rays missing the vessel are dropped
+        entered = np.cumsum(inside, axis=1) > 0
+        exited = np.cumsum(entered & ~inside, axis=1) > 0
+        visible = ~exited & entered[:, -1:]
+        rays = np.arange(len(visible))
+        exit_index = np.argmax(exited, axis=1)
+        visible[rays, exit_index] |= exited[rays, exit_index]
+
+        seen.append(points[visible])
+
+    seen = np.concatenate(seen)
+    if seen.size == 0:
+        raise ValueError("None of the diagnostic rays enter the first wall of pulse {}.".format(pulse))
+
+    phi_min, phi_max, r_min, r_max, z_min, z_max = points_extent(seen)
+    if phi_max - phi_min + 2 * angular_margin >= 360:
+        phi_min, phi_max = 0.0, 360.0
+    else:
+        phi_min, phi_max = phi_min - angular_margin, phi_max + angular_margin
+
+    return ViewRegion(phi_min, phi_max, max(r_min - margin, 0), r_max + margin, z_min - margin, z_max + margin)
+
+
+def diagnostic_rays(diagnostic, max_rays=2500):
+    """
+    Returns rays sampling the view of a diagnostic.
+
+    Bolometer rays join every foil corner to every slit corner, camera
+    pixels are sub-sampled to approximately max_rays rays.
+
+    :param diagnostic: A BolometerCamera, a VectorCamera, a LineOfSightGroup, a single sight
+      line or an (origins, directions) tuple of Nx3 arrays in world coordinates.
+    :param int max_rays: Cameras are sub-sampled to at most approximately this many rays.
+    :return: List of (origins, directions) Nx3 array pairs, one for each independent view (e.g. foil).
+    """
+
+    if isinstance(diagnostic, tuple) and len(diagnostic) == 2:
+        origins, directions = diagnostic
+        return [(np.asarray(origins, dtype=np.float64).reshape(-1, 3),
+                 np.asarray(directions, dtype=np.float64).reshape(-1, 3))]
+
+    # VectorCamera
+    if hasattr(diagnostic, 'pixel_origins') and hasattr(diagnostic, 'pixel_directions'):
+        pixel_origins = np.asarray(diagnostic.pixel_origins, dtype=object)
+        pixel_directions = np.asarray(diagnostic.pixel_directions, dtype=object)
+        stride = max(int(np.ceil(np.sqrt(pixel_origins.size / max_rays))), 1)
+        to_world = diagnostic.to_root()
+        origins = [point.transform(to_world) for point in pixel_origins[::stride, ::stride].ravel()]
+        directions = [vector.transform(to_world) for vector in pixel_directions[::stride, ::stride].ravel()]
+        return [(_as_array(origins), _as_array(directions))]
+
+    # LineOfSightGroup
+    if hasattr(diagnostic, 'sight_lines'):
+        origins = [sight_line.origin for sight_line in diagnostic.sight_lines]
+        directions = [sight_line.direction for sight_line in diagnostic.sight_lines]
+        return [(_as_array(origins), _as_array(directions))]
+
+    # single sight line
+    if hasattr(diagnostic, 'origin') and hasattr(diagnostic, 'direction'):
+        return [(_as_array([diagnostic.origin]), _as_array([diagnostic.direction]))]
+
+    # BolometerCamera, rays join every foil corner to every slit corner
+    try:
+        foils = list(diagnostic)
+    except TypeError:
+        raise TypeError("Unable to extract lines of sight from a diagnostic of type '{}'."
+                        "".format(type(diagnostic).__name__))
+
+    ray_sets = []
+    for foil in foils:
+        origins = []
+        directions = []
+        slit = foil.slit
+        for foil_point in _rectangle_points(foil.centre_point, foil.basis_x, foil.dx, foil.basis_y, foil.dy):
+            for slit_point in _rectangle_points(slit.centre_point, slit.basis_x, slit.dx, slit.basis_y, slit.dy):
+                origins.append(foil_point)
+                directions.append(foil_point.vector_to(slit_point))
+        ray_sets.append((_as_array(origins), _as_array(directions)))
+
+    return ray_sets
+
+
+def _rectangle_points(centre, basis_x, dx, basis_y, dy):
+
+    points = [centre]
+    for sx in (-0.5, 0.5):
+        for sy in (-0.5, 0.5):
+            points.append(centre + basis_x * (sx * dx) + basis_y * (sy * dy))
+    return points
+
+
+def _as_array(vectors):
+    return np.array([[vector.x, vector.y, vector.z] for vector in vectors], dtype=np.float64)
@@ -0,0 +1,219 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Signed distance to the JET first wall, sampled on an R-Z raster.
+
+The distance is positive inside the vessel and negative outside. It is
+computed exactly at the raster nodes and interpolated bilinearly between
+them, so the interpolation error is of the order of the raster resolution
+close to sharp wall corners and negligible elsewhere. Rasters are cached on
+disk for each wall epoch and resolution.
+"""
+
+import os
+import numpy as np
+
+from cherab.jet.paths import get_cache_path
+
+from .wall_outline import get_wall_epoch, inside_polygon
+
+
+# increment when the raster computation changes to invalidate cached rasters
+_CACHE_VERSION = 1
+
+# raster nodes are processed in blocks to bound the memory used by the edge distances
+_BLOCK_SIZE = 65536
+
+_fields = {}
+
+
+class WallDistanceField:
+    """
+    Signed distance to a closed polygon, interpolated from a raster.
+
+    :param ndarray r: Raster major radius axis (m), evenly spaced.
+    :param ndarray z: Raster height axis (m), evenly spaced.
+    :param ndarray distance: Signed distance at the raster nodes with shape (len(r), len(z)) (m).
+    :param ndarray polygon: The polygon, used for exact distances outside the raster.
+    """
+
+    def __init__(self, r, z, distance, polygon):
+
+        self.r = np.asarray(r, dtype=np.float64)
+        self.z = np.asarray(z, dtype=np.float64)
+        self.values = np.asarray(distance, dtype=np.float32)
+        self.polygon = np.asarray(polygon, dtype=np.float64)
+
+        if self.values.shape != (len(self.r), len(self.z)):
+            raise ValueError("The distance raster must have shape (len(r), len(z)).")
+
+        self._dr = self.r[1] - self.r[0]
+        self._dz = self.z[1] - self.z[0]
+
+    def distance(self, r, z):
+        """
+        Returns the signed distance to the wall, positive inside.
+
+        :param ndarray r: Array of major radii (m).
+        :param ndarray z: Array of heights (m), broadcastable against r.
+        :return: Array of signed distances (m).
+        """
+
+        r, z = np.broadcast_arrays(np.asarray(r, dtype=np.float64), np.asarray(z, dtype=np.float64))
+
+        fr = (r - self.r[0]) / self._dr
+        fz = (z - self.z[0]) / self._dz
+        on_raster = (fr >= 0) & (fr <= len(self.r) - 1) & (fz >= 0) & (fz <= len(self.z) - 1)
+
+        i = np.clip(np.floor(fr).astype(np.int64), 0, len(self.r) - 2)
+        j = np.clip(np.floor(fz).astype(np.int64), 0, len(self.z) - 2)
+        tr = np.clip(fr - i, 0, 1)
+        tz = np.clip(fz - j, 0, 1)
+
+        values = self.values
+        result = ((1 - tr) * (1 - tz) * values[i, j] + tr * (1 - tz) * values[i + 1, j] +
+                  (1 - tr) * tz * values[i, j + 1] + tr * tz * values[i + 1, j + 1])
+
+        # points off the raster are rare, their distance is computed exactly
+        if not np.all(on_raster):
+            off_raster = ~on_raster
+            result[off_raster] = signed_distance(self.polygon, r[off_raster], z[off_raster])
+
+        return result
+
+    def inside(self, r, z):
+        """ Returns a boolean array, True for points inside the wall. """
+        return self.distance(r, z) > 0
+
+    def near_wall(self, r, z, distance, inside_only=True):
+        """
+        Selects points within a distance of the wall.
+
+        :param ndarray r: Array of major radii (m).
+        :param ndarray z: Array of heights (m), broadcastable against r.
+        :param float distance: Distance from the wall (m).
+        :param bool inside_only: Only select points inside the wall.
+        :return: Boolean array.
+        """
+
+        signed = self.distance(r, z)
+        if inside_only:
+            return (signed > 0) & (signed <= distance)
+        return np.abs(signed) <= distance
+
+
+def signed_distance(polygon, r, z):
+    """
+    Computes the exact signed distance of points to a closed polygon.
+
+    :param ndarray polygon: Nx2 array of (R, Z) vertices, the closing vertex may be repeated.
+    :param ndarray r: Array of major radii (m).
+    :param ndarray z: Array of heights (m), same shape as r.
+    :return: Array of signed distances, positive inside the polygon (m).
+    """
+
+    polygon = np.asarray(polygon, dtype=np.float64)
+    r = np.asarray(r, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+
+    distance_squared = np.full(r.shape, np.inf)
+    start = polygon[-1]
+    for end in polygon:
+        edge = end - start
+        length_squared = edge.dot(edge)
+        if length_squared > 0:
+            t = np.clip(((r - start[0]) * edge[0] + (z - start[1]) * edge[1]) / length_squared, 0, 1)
+            dr = r - (start[0] + t * edge[0])
+            dz = z - (start[1] + t * edge[1])
+            np.minimum(distance_squared, dr * dr + dz * dz, out=distance_squared)
+        start = end
+
+    distance = np.sqrt(distance_squared)
+    return np.where(inside_polygon(polygon, r, z), distance, -distance)
+
+
+def get_wall_distance_field(pulse=92782, resolution=0.005, margin=0.1):
+    """
+    Returns the signed distance field of the first wall for the specified pulse.
+
+    Fields are cached in memory and on disk (see cherab.jet.paths.get_cache_path),
+    one for each wall epoch, resolution and margin.
+
+    :param pulse: JET pulse number.
+    :param float resolution: Raster spacing (m).
+    :param float margin: Extent of the raster beyond the wall bounding box (m).
+    :return: A WallDistanceField.
+    """
+
+    epoch = get_wall_epoch(pulse)
+    if epoch is None:
+        raise ValueError("No first wall outline is available for pulse {}.".format(pulse))
+
+    key = (epoch.name, resolution, margin)
+    try:
+        return _fields[key]
+    except KeyError:
+        pass
+
+    polygon = epoch.polygon
+    file_name = "wall_distance_v{}_{}_{:g}_{:g}.npz".format(_CACHE_VERSION, epoch.name, resolution, margin)
+
+    try:
+        path = os.path.join(get_cache_path('wall_distance'), file_name)
+    except OSError:
+        path = None
+
+    field = None
+    if path is not None and os.path.isfile(path):
+        try:
+            with np.load(path) as data:
+                field = WallDistanceField(data['r'], data['z'], data['distance'], polygon)
+        except (OSError, ValueError, KeyError):
+            field = None
+
+    if field is None:
+        field = _compute_field(polygon, resolution, margin)
+        if path is not None:
+            try:
+                # write to a temporary file first so concurrent readers never see a partial file
+                temporary_path = '{}.{}.tmp.npz'.format(path[:-4], os.getpid())
+                np.savez(temporary_path, r=field.r, z=field.z, distance=field.values)
+                os.replace(temporary_path, path)
+            except OSError:
+                pass
+
+    _fields[key] = field
+    return field
+
+
+def _compute_field(polygon, resolution, margin):
+
+    r_min, z_min = polygon.min(axis=0) - margin
+    r_max, z_max = polygon.max(axis=0) + margin
+    r = r_min + resolution * np.arange(int(np.ceil((r_max - r_min) / resolution)) + 1)
+    z = z_min + resolution * np.arange(int(np.ceil((z_max - z_min) / resolution)) + 1)
+
+    rr, zz = np.meshgrid(r, z, indexing='ij')
+    rr = rr.ravel()
+    zz = zz.ravel()
+
+    distance = np.empty(rr.shape, dtype=np.float32)
+    for start in range(0, len(rr), _BLOCK_SIZE):
+        block = slice(start, start + _BLOCK_SIZE)
+        distance[block] = signed_distance(polygon, rr[block], zz[block])
+
+    return WallDistanceField(r, z, distance.reshape(len(r), len(z)), polygon)
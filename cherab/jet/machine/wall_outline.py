@@ -17,12 +17,74 @@
 
 import os
 import json
+from bisect import bisect_right
+from collections import namedtuple
 import numpy as np
-import matplotlib.pyplot as plt
 
 from cherab.core.math.mask import PolygonMask2D
 
 
+__all__ = ['WallEpoch', 'wall_epochs', 'get_wall_epoch', 'firstwall', 'wall_epoch', 'plot_jet_wall_outline',
+           'get_jet_wall_mask', 'contains', 'inside_polygon']
+
+
+_WALL_FILE = os.path.join(os.path.dirname(__file__), "first_wall.json")
+
+# the wall file is parsed once, epochs are sorted by their first pulse for bisection
+_epochs = None
+_epoch_starts = None
+_masks = {}
+
+
+WallEpoch = namedtuple('WallEpoch', ['name', 'filename', 'start', 'end', 'polygon'])
+WallEpoch.__doc__ = """
+A first wall configuration and the range of pulses it was in place for.
+
+The end pulse is None for the current configuration. The polygon is a
+read-only Nx2 array of (R, Z) coordinates, the closing vertex is repeated.
+"""
+
+
+def wall_epochs():
+    """ Returns the first wall configurations ordered by their first pulse. """
+
+    global _epochs, _epoch_starts
+
+    if _epochs is None:
+        with open(_WALL_FILE) as f:
+            walls = json.load(f)
+
+        epochs = []
+        for wall in sorted(walls, key=lambda wall: wall["start"]):
+            polygon = np.array(wall["polygon"], dtype=np.float64)
+            polygon.flags.writeable = False
+            epochs.append(WallEpoch(wall["name"], wall["filename"], wall["start"], wall["end"], polygon))
+
+        _epoch_starts = [epoch.start for epoch in epochs]
+        _epochs = epochs
+
+    return _epochs
+
+
+def get_wall_epoch(pulse=92782):
+    """
+    Returns the first wall configuration in place for the specified pulse.
+
+    :param pulse: JET pulse number.
+    :return: A WallEpoch or None if no data available.
+    """
+
+    epochs = wall_epochs()
+    index = bisect_right(_epoch_starts, pulse) - 1
+    if index < 0:
+        return None
+
+    epoch = epochs[index]
+    if epoch.end and pulse > epoch.end:
+        return None
+    return epoch
+
+
 def firstwall(pulse=92782):
     """
     Returns the coordinates of the JET first wall for the specified pulse.
@@ -31,36 +93,109 @@ def firstwall(pulse=92782):
     :return: A Nx2 numpy array of coordinates or None if no data available.
     """
 
-    path = os.path.join(os.path.dirname(__file__), "first_wall.json")
+    epoch = get_wall_epoch(pulse)
+    if epoch is None:
+        return None
+    return epoch.polygon.copy()
 
-    with open(path) as f:
-        walls = json.load(f)
 
-    # crude, but we have a very limited number of first walls
-    for wall in walls:
-        if wall["end"]:
-            if wall["start"] <= pulse <= wall["end"]:
-                return np.array(wall["polygon"])
-        else:
-            if pulse >= wall["start"]:
-                return np.array(wall["polygon"])
-    return None
+def wall_epoch(pulse=92782):
+    """
+    Returns the name of the first wall configuration in place for the specified pulse.
+
+    :param pulse: JET pulse number.
+    :return: The configuration name, e.g. 'Mk2ILW', or None if no data available.
+    """
+
+    epoch = get_wall_epoch(pulse)
+    return None if epoch is None else epoch.name
 
 
 def plot_jet_wall_outline(pulse=92782, style='k'):
 
+    import matplotlib.pyplot as plt
+
     outline = firstwall(pulse=pulse)
-    for i in range(outline.shape[0] - 1):
-        plt.plot([outline[i, 0], outline[i+1, 0]],
-                 [outline[i, 1], outline[i+1, 1]], style)
+    plt.plot(outline[:, 0], outline[:, 1], style)
     plt.axis('equal')
 
 
 def get_jet_wall_mask(pulse=92782):
-    outline = firstwall(pulse=pulse)
-    return PolygonMask2D(outline[0:-1])
+    """
+    Returns a PolygonMask2D of the first wall for the specified pulse.
+
+    Masks are cached, the same instance is returned for every pulse of a wall epoch.
+    For arrays of points use contains() instead.
+
+    :param pulse: JET pulse number.
+    """
+
+    epoch = _require_epoch(pulse)
+    try:
+        return _masks[epoch.name]
+    except KeyError:
+        mask = PolygonMask2D(epoch.polygon[0:-1].copy())
+        _masks[epoch.name] = mask
+        return mask
+
+
+def contains(r, z, pulse=92782):
+    """
+    Tests which points lie inside the JET first wall for the specified pulse.
+
+    :param ndarray r: Array of major radii (m).
+    :param ndarray z: Array of heights (m), broadcastable against r.
+    :param pulse: JET pulse number.
+    :return: Boolean array with the broadcast shape of r and z.
+    """
+
+    return inside_polygon(_require_epoch(pulse).polygon, r, z)
+
+
+def inside_polygon(polygon, x, y):
+    """
+    Vectorised even-odd test of points against a closed polygon.
+
+    :param ndarray polygon: Nx2 array of polygon vertices, the closing vertex may be repeated.
+    :param ndarray x: Array of x coordinates.
+    :param ndarray y: Array of y coordinates, broadcastable against x.
+    :return: Boolean array with the broadcast shape of x and y.
+    """
+
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    shape = x.shape
+    x = x.ravel()
+    y = y.ravel()
+    inside = np.zeros(x.shape, dtype=bool)
+
+    # points outside the bounding box are outside, only the remainder is tested edge by edge
+    candidates = np.nonzero((x >= polygon[:, 0].min()) & (x <= polygon[:, 0].max()) &
+                            (y >= polygon[:, 1].min()) & (y <= polygon[:, 1].max()))[0]
+    px = x[candidates]
+    py = y[candidates]
+    result = np.zeros(px.shape, dtype=bool)
+
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        if y1 != y2:
+            crosses = np.nonzero((y1 > py) != (y2 > py))[0]
+            x_intersect = x1 + (py[crosses] - y1) * (x2 - x1) / (y2 - y1)
+            result[crosses] ^= px[crosses] < x_intersect
+        x1, y1 = x2, y2
+
+    inside[candidates] = result
+    return inside.reshape(shape)
+
+
+def _require_epoch(pulse):
+
+    epoch = get_wall_epoch(pulse)
+    if epoch is None:
+        raise ValueError("No first wall outline is available for pulse {}.".format(pulse))
+    return epoch
 
 
 if __name__ == '__main__':
+    import matplotlib.pyplot as plt
     plot_jet_wall_outline()
     plt.show()
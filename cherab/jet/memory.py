@@ -0,0 +1,275 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Memory accounting for the scene components of a calculation.
+
+A report holds two kinds of record. Estimates, derived from file sizes or
+the storage layout of the raysect primitives, are available before anything
+is loaded and are used to check a job fits a node before any ray is traced.
+Measurements record the change of the resident set size (RSS) of the process
+over each load step, and the peak RSS reached, so the estimates can be
+checked against what the loads actually cost.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from collections import namedtuple
+
+
+# raysect mesh storage: float64 vertices, int32 triangle indices and a float64 face normal per triangle
+MESH_VERTEX_BYTES = 24
+MESH_TRIANGLE_BYTES = 36
+MESH_NORMAL_BYTES = 24
+
+# kd-tree nodes and leaf triangle lists, estimated from raysect's default build settings
+KDTREE_TRIANGLE_BYTES = 48
+
+# a CSG voxel of a ToroidalVoxelGrid is built from several primitives, their nodes and bounding boxes
+CSG_VOXEL_BYTES = 6000
+MESH_VOXEL_BYTES = 2000
+
+# a structured voxel is a lattice index map entry and its vertex coordinates
+STRUCTURED_VOXEL_BYTES = 72
+
+
+MemoryEntry = namedtuple('MemoryEntry', ['name', 'category', 'count', 'nbytes', 'kdtree_bytes'])
+
+MemoryMeasurement = namedtuple('MemoryMeasurement', ['name', 'resident_before', 'resident_after', 'peak'])
+MemoryMeasurement.__doc__ = """
+The resident set size of the process before and after a load step, and the peak resident set size
+of the process at the end of the step (bytes).
+"""
+
+
+class MemoryReport:
+    """
+    Collects the estimated and the measured memory footprint of scene components.
+
+    Each entry holds the number of elements (meshes, triangles or voxels),
+    the estimated bytes used by the primitive data and by its acceleration
+    structure. Each measurement holds the resident set size of the process
+    around a load step, see measure().
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.measurements = []
+
+    def add(self, name, category, count, nbytes, kdtree_bytes=0):
+        """
+        Adds a component to the report.
+
+        :param str name: Component name.
+        :param str category: Component category, e.g. 'mesh' or 'voxel grid'.
+        :param int count: Number of triangles or voxels.
+        :param int nbytes: Bytes used by the primitive data.
+        :param int kdtree_bytes: Bytes used by the acceleration structure.
+        """
+
+        self.entries.append(MemoryEntry(name, category, int(count), int(nbytes), int(kdtree_bytes)))
+
+    def add_mesh(self, mesh, name=None):
+        """
+        Adds a raysect mesh to the report.
+
+        :param Mesh mesh: The mesh.
+        :param str name: Component name, defaults to the mesh name.
+        """
+
+        data = mesh.data
+        triangles = len(data.triangles)
+        normals = 0 if data.vertex_normals is None else len(data.vertex_normals)
+        nbytes = len(data.vertices) * MESH_VERTEX_BYTES + triangles * MESH_TRIANGLE_BYTES + \
+            normals * MESH_NORMAL_BYTES
+        self.add(name or mesh.name, 'mesh', triangles, nbytes, triangles * KDTREE_TRIANGLE_BYTES)
+
+    def add_voxel_grid(self, name, count, primitive_type='csg'):
+        """
+        Adds a voxel grid to the report.
+
+        :param str name: Grid name.
+        :param int count: Number of voxels.
+        :param str primitive_type: The voxel primitive type, 'csg', 'mesh' or 'structured'.
+        """
+
+        self.add(name, 'voxel grid', count, estimate_voxel_grid_memory(count, primitive_type))
+
+    @contextmanager
+    def measure(self, name):
+        """
+        Context manager measuring the resident memory added by a load step.
+
+        The processes of a MulticoreEngine are forked later and share the
+        pages measured here.
+
+        :param str name: Name of the step.
+        """
+
+        before = resident_memory()
+        try:
+            yield
+        finally:
+            self.measurements.append(MemoryMeasurement(name, before, resident_memory(), peak_memory()))
+
+    @property
+    def total(self):
+        """ Total estimated bytes of all components. """
+        return sum(entry.nbytes + entry.kdtree_bytes for entry in self.entries)
+
+    @property
+    def measured_total(self):
+        """ Total measured increase of the resident memory over all measured steps. """
+        return sum(measurement.resident_after - measurement.resident_before for measurement in self.measurements)
+
+    def by_category(self):
+        """ Returns the total estimated bytes of each category. """
+
+        totals = {}
+        for entry in self.entries:
+            totals[entry.category] = totals.get(entry.category, 0) + entry.nbytes + entry.kdtree_bytes
+        return totals
+
+    def summary(self, limit=20):
+        """
+        Returns a printable table of the largest components and the totals.
+
+        :param int limit: Number of components listed, all are listed if None.
+        """
+
+        entries = sorted(self.entries, key=lambda entry: entry.nbytes + entry.kdtree_bytes, reverse=True)
+        lines = ["{:<48} {:>12} {:>10} {:>10} {:>10}".format('component', 'category', 'count', 'data', 'kd-tree')]
+        for entry in entries[0:limit]:
+            lines.append("{:<48} {:>12} {:>10} {:>10} {:>10}".format(
+                entry.name[-48:], entry.category, entry.count, format_bytes(entry.nbytes),
+                format_bytes(entry.kdtree_bytes)))
+        if limit is not None and len(entries) > limit:
+            lines.append("... {} more components".format(len(entries) - limit))
+        for category, nbytes in sorted(self.by_category().items()):
+            lines.append("total {:<42} {:>10}".format(category, format_bytes(nbytes)))
+        lines.append("total {:<42} {:>10}".format('', format_bytes(self.total)))
+        for measurement in self.measurements:
+            lines.append("measured {:<39} {:>10} resident, {} peak".format(
+                measurement.name[-39:], format_bytes(measurement.resident_after - measurement.resident_before),
+                format_bytes(measurement.peak)))
+        if self.measurements:
+            lines.append("measured {:<39} {:>10}".format('total', format_bytes(self.measured_total)))
+        return '\n'.join(lines)
+
+    def check(self, budget):
+        """
+        Raises a MemoryError if the total exceeds the budget.
+
+        :param float budget: Memory budget (bytes).
+        """
+
+        if self.total > budget:
+            raise MemoryError("The estimated memory of {} exceeds the budget of {}.\n{}"
+                              "".format(format_bytes(self.total), format_bytes(budget), self.summary()))
+
+
+def estimate_voxel_grid_memory(count, primitive_type='csg'):
+    """
+    Estimates the memory of a voxel grid.
+
+    :param int count: Number of voxels.
+    :param str primitive_type: The voxel primitive type, 'csg', 'mesh' or 'structured'.
+    :return: Estimated memory (bytes).
+    """
+
+    voxel_bytes = {'csg': CSG_VOXEL_BYTES, 'structured': STRUCTURED_VOXEL_BYTES}.get(primitive_type, MESH_VOXEL_BYTES)
+    return count * voxel_bytes
+
+
+def select_voxel_primitive(count, structured=False, memory_budget=None, degrade=False):
+    """
+    Selects the primitive type of a voxel grid fitting a memory budget.
+
+    A CSG grid exceeding the budget raises a MemoryError, or, with degrade
+    enabled, is switched to the structured grid if that fits.
+
+    :param int count: Number of voxels.
+    :param bool structured: The structured grid was requested.
+    :param float memory_budget: Memory available for the grid (bytes), None for no limit.
+    :param bool degrade: Switch to the structured grid rather than fail if the budget is exceeded.
+    :return: The primitive type, 'csg' or 'structured'.
+    """
+
+    levels = ['structured'] if structured else ['csg', 'structured'] if degrade else ['csg']
+    if memory_budget is None:
+        return levels[0]
+
+    for primitive_type in levels:
+        if estimate_voxel_grid_memory(count, primitive_type) <= memory_budget:
+            return primitive_type
+
+    raise MemoryError("The estimated memory of the {} voxel grid ({}) exceeds the budget of {}."
+                      "".format(levels[-1], format_bytes(estimate_voxel_grid_memory(count, levels[-1])),
+                                format_bytes(memory_budget)))
+
+
+@contextmanager
+def measure(report, name):
+    """
+    Context manager measuring a load step into a report, doing nothing if the report is None.
+
+    :param MemoryReport report: The report, or None.
+    :param str name: Name of the step.
+    """
+
+    if report is None:
+        yield
+    else:
+        with report.measure(name):
+            yield
+
+
+def resident_memory():
+    """ Returns the current resident set size of the process (bytes). """
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open('/proc/self/statm', 'r') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # without psutil or procfs only the peak is available
+        return peak_memory()
+
+
+def peak_memory():
+    """ Returns the peak resident set size of the process (bytes). """
+
+    import resource
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def format_bytes(nbytes):
+    """ Formats a byte count with a binary prefix. """
+
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(nbytes) < 1024:
+            return "{:.1f}{}".format(nbytes, unit)
+        nbytes /= 1024
+    return "{:.1f}TiB".format(nbytes)
@@ -16,3 +16,4 @@
 # under the Licence.
 
 from .pini import load_pini_from_ppf, load_debugging_pini, JETPini
+from .emission_cache import BeamEmissionCache
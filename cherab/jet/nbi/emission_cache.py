@@ -0,0 +1,172 @@
+# Copyright 2014-2017 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Pre-sampled beam emission for fast rendering of NBI emission.
+
+The cache is interpolated by the compiled add_trilinear() of
+cherab.jet.nbi.trilinear, built with the package.
+"""
+
+import numpy as np
+
+from raysect.core import Point3D
+from raysect.optical import Spectrum
+from raysect.optical.material import InhomogeneousVolumeEmitter
+from raysect.optical.material.emitter.inhomogeneous import NumericalIntegrator
+
+from .trilinear import add_trilinear
+
+
+# transverse extent of the cached volume, in multiples of the local beam width
+SIGMA_EXTENT = 5
+
+# sample values are stored in single precision to halve the memory footprint
+_BYTES_PER_SAMPLE = 4
+
+
+class BeamEmissionCache(InhomogeneousVolumeEmitter):
+    """
+    Volume emitter returning emission interpolated from a beam-aligned grid.
+
+    The grid is defined in the local beam coordinate system, where the beam
+    propagates along the z axis from z = 0 to z = length. The transverse grid
+    axes are scaled with the local beam width so that the sample density follows
+    the divergence of the beam.
+
+    The samples are a snapshot of the beam emission, they are not updated when
+    the beam or the plasma change, see JETPini.build_emission_cache().
+
+    :param ndarray samples: Spectral emission with shape (nu, nv, nz, bins).
+    :param float length: Length of the beam (m).
+    :param float sigma: Initial beam width (m).
+    :param tuple divergence: Horizontal and vertical divergence (degrees).
+    :param float min_wavelength: Lower wavelength of the sampled spectra (nm).
+    :param float max_wavelength: Upper wavelength of the sampled spectra (nm).
+    :param float step: Integration step used when rendering (m).
+    """
+
+    def __init__(self, samples, length, sigma, divergence, min_wavelength, max_wavelength, step=0.02):
+
+        super().__init__(NumericalIntegrator(step))
+
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim != 4 or min(samples.shape[0:3]) < 2:
+            raise ValueError("Beam emission samples must have shape (nu, nv, nz, bins) with at least 2 samples "
+                             "along each spatial axis.")
+
+        self._samples = np.ascontiguousarray(samples)
+        self._length = length
+        self._sigma = sigma
+        self._tan_divergence = np.tan(np.deg2rad(divergence[0])), np.tan(np.deg2rad(divergence[1]))
+        self.min_wavelength = min_wavelength
+        self.max_wavelength = max_wavelength
+
+        nu, nv, nz, _ = samples.shape
+        self._du = 2 / (nu - 1)
+        self._dv = 2 / (nv - 1)
+        self._dz = length / (nz - 1)
+
+    @property
+    def shape(self):
+        return self._samples.shape
+
+    @property
+    def samples(self):
+        return self._samples
+
+    @property
+    def length(self):
+        return self._length
+
+    @property
+    def nbytes(self):
+        return self._samples.nbytes
+
+    def half_widths(self, z):
+        """ Returns the transverse half widths of the cached volume at the specified beam position. """
+
+        return (SIGMA_EXTENT * (self._sigma + z * self._tan_divergence[0]),
+                SIGMA_EXTENT * (self._sigma + z * self._tan_divergence[1]))
+
+    def emission_function(self, point, direction, spectrum, world, ray, primitive, to_local, to_world):
+
+        if (spectrum.bins != self._samples.shape[3] or spectrum.min_wavelength != self.min_wavelength or
+                spectrum.max_wavelength != self.max_wavelength):
+            raise ValueError("The spectral settings of the observer are inconsistent with the beam emission cache "
+                             "({} - {} nm, {} bins).".format(self.min_wavelength, self.max_wavelength,
+                                                             self._samples.shape[3]))
+
+        if not 0 <= point.z <= self._length:
+            return spectrum
+
+        half_width_x, half_width_y = self.half_widths(point.z)
+        fu = (point.x / half_width_x + 1) / self._du
+        fv = (point.y / half_width_y + 1) / self._dv
+        fz = point.z / self._dz
+
+        # trilinear interpolation between the eight surrounding samples, points outside the grid add nothing
+        add_trilinear(self._samples, fu, fv, fz, spectrum.samples)
+        return spectrum
+
+
+def sample_beam_emission(emission_function, direction, length, sigma, divergence, min_wavelength, max_wavelength,
+                         spectral_bins, transverse_samples=41, axial_resolution=0.05, max_memory=256e6):
+    """
+    Samples a beam emission function onto a beam-aligned grid.
+
+    The axial resolution is coarsened, if required, to keep the sample array
+    within the memory budget.
+
+    :param emission_function: Callable taking (point, direction, spectrum) in local beam coordinates.
+    :param Vector3D direction: The observation direction in local beam coordinates.
+    :param float length: Length of the beam (m).
+    :param float sigma: Initial beam width (m).
+    :param tuple divergence: Horizontal and vertical divergence (degrees).
+    :param float min_wavelength: Lower wavelength of the sampled spectra (nm).
+    :param float max_wavelength: Upper wavelength of the sampled spectra (nm).
+    :param int spectral_bins: Number of spectral bins.
+    :param int transverse_samples: Number of samples across the beam in each transverse direction.
+    :param float axial_resolution: Requested sample spacing along the beam (m).
+    :param float max_memory: Upper limit on the size of the sample array (bytes).
+    :return: Array of spectral emission with shape (nu, nv, nz, bins).
+    """
+
+    if transverse_samples < 2:
+        raise ValueError("At least two transverse samples are required.")
+
+    nz = max(int(np.ceil(length / axial_resolution)) + 1, 2)
+    bytes_per_slice = transverse_samples * transverse_samples * spectral_bins * _BYTES_PER_SAMPLE
+    nz = min(nz, int(max_memory // bytes_per_slice))
+    if nz < 2:
+        raise ValueError("The beam emission cache cannot be fitted into a memory budget of {:.3G} bytes, "
+                         "reduce the number of transverse samples or spectral bins.".format(max_memory))
+
+    tan_divergence = np.tan(np.deg2rad(divergence[0])), np.tan(np.deg2rad(divergence[1]))
+    u_samples = np.linspace(-1, 1, transverse_samples)
+    z_samples = np.linspace(0, length, nz)
+
+    samples = np.zeros((transverse_samples, transverse_samples, nz, spectral_bins), dtype=np.float32)
+    for k, z in enumerate(z_samples):
+        half_width_x = SIGMA_EXTENT * (sigma + z * tan_divergence[0])
+        half_width_y = SIGMA_EXTENT * (sigma + z * tan_divergence[1])
+        for i, u in enumerate(u_samples):
+            for j, v in enumerate(u_samples):
+                spectrum = Spectrum(min_wavelength, max_wavelength, spectral_bins)
+                spectrum = emission_function(Point3D(u * half_width_x, v * half_width_y, z), direction, spectrum)
+                samples[i, j, k, :] = spectrum.samples
+
+    return samples
@@ -15,23 +15,23 @@
 # See the Licence for the specific language governing permissions and limitations
 # under the Licence.
 
-import ppf
 import re
 import numpy as np
 
 from raysect.core import Point3D, Vector3D, translate, rotate_basis
 # from raysect.core.scenegraph.node import Node
 from raysect.core import Node
+from raysect.primitive import Box
 
-from cherab.openadas import OpenADAS
 from cherab.core.atomic.elements import deuterium
 from cherab.core import Beam
 
 from .idl_pini_geometry import get_pini_alignment
+from .emission_cache import BeamEmissionCache, sample_beam_emission
 
 
 EDGE_WIDENING = 0.01
-atomic_data = OpenADAS(permit_extrapolation=True)
+_atomic_data = None
 
 PINI_LENGTHS = [16.10934611, 15.48338613, 11.57900764, 11.60077588, 11.47816349, 11.44278883, 15.90863813, 16.31158651]
 
@@ -100,6 +100,20 @@ OCTANT8_DEBUG_ENERGIES = {
 }
 
 
+def __getattr__(name):
+
+    # the default atomic data source is only created when first requested
+    global _atomic_data
+
+    if name == 'atomic_data':
+        if _atomic_data is None:
+            from cherab.openadas import OpenADAS
+            _atomic_data = OpenADAS(permit_extrapolation=True)
+        return _atomic_data
+
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
 class JETPini(Node):
     """ Object representing a PINI in a scenegraph.
 
@@ -133,7 +147,11 @@ class JETPini(Node):
 
         self._components = []
         self._length = length
+        self._initial_width = initial_width
+        self._divergence = divergence
+        self._integration_step = integration_step
         self._parent_reminder = parent
+        self._emission_cache = None
 
         # Rotation between 'direction' and the z unit vector
         # This is important because the beam primitives are defined along the z axis.
@@ -201,6 +219,7 @@ class JETPini(Node):
 
     @energy.setter
     def energy(self, value):
+        self.clear_emission_cache()
         for i in range(3):
             component = self._components[i]
             component.energy = value / (i + 1)
@@ -211,6 +230,7 @@ class JETPini(Node):
 
     @power_fractions.setter
     def power_fractions(self, value):
+        self.clear_emission_cache()
         for i in range(3):
             self._components[i].power = value[i]
 
@@ -247,6 +267,7 @@ class JETPini(Node):
 
     @element.setter
     def element(self, value):
+        self.clear_emission_cache()
         for component in self._components:
             component.element = value
 
@@ -257,6 +278,69 @@ class JETPini(Node):
 
         return spectrum
 
+    @property
+    def emission_cache(self):
+        if self._emission_cache is None:
+            return None
+        return self._emission_cache.material
+
+    def build_emission_cache(self, direction, min_wavelength, max_wavelength, spectral_bins,
+                             transverse_samples=41, axial_resolution=0.05, max_memory=256e6):
+        """ Replace the beam components with emission pre-sampled onto a beam-aligned grid.
+
+        The emission of all three energy components is sampled once and then
+        interpolated during rendering, avoiding repeated atomic data lookups.
+        Spectral emission depends on the viewing direction through the Doppler
+        shift, the cache is therefore only valid for observers viewing the beam
+        from approximately the supplied direction (e.g. a camera with a narrow
+        field of view).
+
+        Changing the energy, power fractions or element of the PINI discards
+        the cache. Changes of the plasma (e.g. a new time slice), the atomic
+        data or the emission models are not detected, rebuild the cache after
+        them.
+
+        :param Vector3D direction: The observation direction in world coordinates.
+        :param float min_wavelength: Lower wavelength of the observer (nm).
+        :param float max_wavelength: Upper wavelength of the observer (nm).
+        :param int spectral_bins: Number of spectral bins of the observer.
+        :param int transverse_samples: Number of samples across the beam, sets the transverse accuracy.
+        :param float axial_resolution: Sample spacing along the beam (m), sets the axial accuracy.
+        :param float max_memory: Memory budget for the cache (bytes), the axial resolution is
+          coarsened if the budget would be exceeded.
+        """
+
+        self.clear_emission_cache()
+
+        local_direction = direction.transform(self.to_local()).normalise()
+        samples = sample_beam_emission(self.emission_function, local_direction, self._length, self._initial_width,
+                                       self._divergence, min_wavelength, max_wavelength, spectral_bins,
+                                       transverse_samples=transverse_samples, axial_resolution=axial_resolution,
+                                       max_memory=max_memory)
+
+        material = BeamEmissionCache(samples, self._length, self._initial_width, self._divergence,
+                                     min_wavelength, max_wavelength, step=self._integration_step)
+
+        half_width_x, half_width_y = material.half_widths(self._length)
+        self._emission_cache = Box(lower=Point3D(-half_width_x, -half_width_y, 0),
+                                   upper=Point3D(half_width_x, half_width_y, self._length),
+                                   parent=self, material=material, name="Beam emission cache")
+
+        for beam in self._components:
+            beam.parent = None
+
+    def clear_emission_cache(self):
+        """ Discard the emission cache and restore the full beam components. """
+
+        if self._emission_cache is None:
+            return
+
+        self._emission_cache.parent = None
+        self._emission_cache = None
+
+        for beam in self._components:
+            beam.parent = self
+
 
 def load_pini_from_ppf(shot, pini_id, plasma, atomic_data, attenuation_instructions, emission_instructions,
                        world, integration_step=0.02):
@@ -272,6 +356,8 @@ def load_pini_from_ppf(shot, pini_id, plasma, atomic_data, attenuation_instructi
     :return: Loaded JET pini from PPF.
     """
 
+    import ppf
+
     # TODO - get gas from ppf. Currently set to Deuterium only.
 
     if not re.match('^8.[1-8]$', pini_id):
@@ -390,6 +476,8 @@ class TimeSeriesMask:
 
 def pini_time_series_from_ppf(pulse, pini_id):
 
+    import ppf
+
     if not re.match('^8.[1-8]$', pini_id):
         raise RuntimeError("JET Pini ID {} is invalid.".format(pini_id))
 
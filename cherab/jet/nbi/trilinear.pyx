@@ -0,0 +1,77 @@
+# Copyright 2014-2017 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+# cython: language_level=3
+
+"""
+Compiled trilinear interpolation of spectral sample grids.
+"""
+
+cimport cython
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef bint add_trilinear(const float[:, :, :, ::1] samples, double fu, double fv, double fz,
+                        double[::1] spectrum) except -1:
+    """
+    Adds the spectrum interpolated at a fractional grid position to a spectrum.
+
+    :param ndarray samples: C-contiguous float32 array with shape (nu, nv, nz, bins), at least
+      two samples along each spatial axis.
+    :param float fu: Position along the first axis, in units of the sample spacing.
+    :param float fv: Position along the second axis, in units of the sample spacing.
+    :param float fz: Position along the third axis, in units of the sample spacing.
+    :param ndarray spectrum: Float64 array of the bins the interpolated spectrum is added to.
+    :return: False if the position lies outside the grid, the spectrum is then unchanged.
+    """
+
+    cdef:
+        Py_ssize_t nu = samples.shape[0], nv = samples.shape[1], nz = samples.shape[2], bins = samples.shape[3]
+        Py_ssize_t i, j, k, b
+        double tu, tv, tz
+        double w000, w001, w010, w011, w100, w101, w110, w111
+
+    if spectrum.shape[0] != bins:
+        raise ValueError("The spectrum has {} bins, the samples {}.".format(spectrum.shape[0], bins))
+
+    if not (0 <= fu <= nu - 1 and 0 <= fv <= nv - 1 and 0 <= fz <= nz - 1):
+        return False
+
+    i = min(<Py_ssize_t> fu, nu - 2)
+    j = min(<Py_ssize_t> fv, nv - 2)
+    k = min(<Py_ssize_t> fz, nz - 2)
+    tu = fu - i
+    tv = fv - j
+    tz = fz - k
+
+    w000 = (1 - tu) * (1 - tv) * (1 - tz)
+    w001 = (1 - tu) * (1 - tv) * tz
+    w010 = (1 - tu) * tv * (1 - tz)
+    w011 = (1 - tu) * tv * tz
+    w100 = tu * (1 - tv) * (1 - tz)
+    w101 = tu * (1 - tv) * tz
+    w110 = tu * tv * (1 - tz)
+    w111 = tu * tv * tz
+
+    for b in range(bins):
+        spectrum[b] += (w000 * samples[i, j, k, b] + w001 * samples[i, j, k + 1, b] +
+                        w010 * samples[i, j + 1, k, b] + w011 * samples[i, j + 1, k + 1, b] +
+                        w100 * samples[i + 1, j, k, b] + w101 * samples[i + 1, j, k + 1, b] +
+                        w110 * samples[i + 1, j + 1, k, b] + w111 * samples[i + 1, j + 1, k + 1, b])
+
+    return True
@@ -0,0 +1,57 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Locations of cached data products.
+"""
+
+import os
+
+
+def get_cache_path(*parts, create=True):
+    """
+    Returns a directory for cached data products, creating it if required.
+
+    The cache root is read from the 'CHERAB_JET_CACHE' environment variable and
+    defaults to ~/.cache/cherab/jet. Point it at shared storage to share cached
+    products between users and cluster nodes.
+
+    :param str parts: Sub-directories below the cache root.
+    :param bool create: Create the directory if it does not exist. Readers that only
+      look up existing products pass False.
+    """
+
+    root = os.environ.get('CHERAB_JET_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'cherab', 'jet'))
+    path = os.path.join(root, *parts)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_data_path(*parts):
+    """
+    Returns a directory of data products too large to ship with the package,
+    e.g. the KL11 sensitivity matrices.
+
+    The data root is read from the 'CHERAB_JET_DATA' environment variable and
+    defaults to the location used on the JET analysis cluster. Unlike the cache
+    directory it is not created.
+
+    :param str parts: Sub-directories below the data root.
+    """
+
+    root = os.environ.get('CHERAB_JET_DATA', '/work/mcarr/tasks')
+    return os.path.join(root, *parts)
@@ -1,30 +1,67 @@
 
-import time
 import os
-import numpy as np
 from raysect.optical import World
 from raysect.optical.material import AbsorbingSurface
-from raysect.core.workflow import MulticoreEngine
 
+from cherab.jet.memory import MemoryReport
 from cherab.jet.machine import import_jet_mesh
 from cherab.jet.bolometry import load_kb1_camera, load_kb1_voxel_grid
+from cherab.jet.bolometry.sensitivity import build_sensitivities, print_sensitivity_progress
+from cherab.jet.bolometry.sensitivity_store import SensitivityStore
+from cherab.jet.inversions import save_sensitivity_matrix
 
 
 NCORES = int(os.environ.get("NSLOTS", 4))
 
+# level of detail of the wall meshes, the wall is only an occluder here so decimated
+# meshes (generated with "python -m cherab.jet.machine.mesh_lod <level>") may be used
+MESH_LOD = int(os.environ.get("MESH_LOD", 0))
 
-world = World()
-voxel_grid = load_kb1_voxel_grid(parent=world, name="KB1 voxel grid")
-import_jet_mesh(world, override_material=AbsorbingSurface())
-
-# Calculate KB1 camera sensitivities
-kb1 = load_kb1_camera(parent=world)
-sensitivity_matrix = np.zeros((len(kb1), voxel_grid.count))
-for i, detector in enumerate(kb1):
-    start_time = time.time()
-    print("Calculating detector '{}'...".format(detector.name))
-    detector.render_engine = MulticoreEngine(NCORES)
-    sensitivities = detector.calculate_sensitivity(voxel_grid, ray_count=1000000)
-    sensitivity_matrix[i, :] = sensitivities
-    print("Traced detector '{}' with run time - {:.2G}mins".format(detector.name, (time.time() - start_time) / 60))
-np.save("kb1_sensitivities.npy", sensitivity_matrix)
+# memory available to the scene (GB), the scene is built once and shared by the NCORES render
+# processes, the level of detail is part of the stored matrix key so the meshes are not degraded
+# automatically to fit the budget
+MEMORY_BUDGET = float(os.environ.get("MEMORY_BUDGET", 100)) * 1e9
+
+# independent jobs (e.g. the tasks of a batch array job) share the checkpoint directory,
+# each job calculates its own share of the detectors
+WORKER_INDEX = int(os.environ.get("WORKER_INDEX", 0))
+WORKER_COUNT = int(os.environ.get("WORKER_COUNT", 1))
+CHECKPOINT_PATH = os.environ.get("CHECKPOINT_PATH", "kb1_sensitivities")
+
+RAY_COUNT = 1000000
+
+# sensitivities below this fraction of a detector's peak sensitivity are dropped from the sparse matrix
+DROP_TOLERANCE = 1e-6
+
+
+def build_scene():
+
+    world = World()
+    memory_report = MemoryReport()
+    # the structured grid records its vertices in the checkpoint layout, so results of a different grid are refused
+    voxel_grid = load_kb1_voxel_grid(parent=world, name="KB1 voxel grid", report=memory_report, structured=True)
+    import_jet_mesh(world, override_material=AbsorbingSurface(), snapshot=True, lod=MESH_LOD,
+                    memory_budget=MEMORY_BUDGET - memory_report.total, report=memory_report)
+    kb1 = load_kb1_camera(parent=world)
+    print(memory_report.summary())
+    return [kb1], voxel_grid
+
+
+if __name__ == '__main__':
+
+    def calculate():
+        # finished detectors are kept in the checkpoint directory, rerunning the script resumes the calculation
+        sensitivities = build_sensitivities(build_scene, CHECKPOINT_PATH, ray_count=RAY_COUNT, processes=NCORES,
+                                            worker_index=WORKER_INDEX, worker_count=WORKER_COUNT,
+                                            progress=print_sensitivity_progress, mesh_groups=['JET_MESH'],
+                                            lod=MESH_LOD)
+        if sensitivities is None:
+            raise SystemExit("The detectors of the other workers are not complete yet.")
+        return sensitivities['KB1']
+
+    # a matrix calculated before with the same inputs is read from the store instead of being recalculated,
+    # the material name must match the override used in build_scene()
+    cell_vertices = load_kb1_voxel_grid(structured=True).cell_vertices
+    matrix = SensitivityStore().get_or_compute('KB1', calculate, RAY_COUNT, cell_vertices, lod=MESH_LOD,
+                                               material='absorbing', drop_tolerance=DROP_TOLERANCE)
+    save_sensitivity_matrix("kb1_sensitivities.npz", matrix)
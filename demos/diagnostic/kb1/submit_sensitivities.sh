@@ -1,11 +1,19 @@
 #!/bin/bash
+# Submits the KB1 sensitivity calculation as an array job of $njobs independent workers.
+# The workers share the checkpoint directory, resubmitting resumes an interrupted calculation.
+# Each worker builds one scene, shared by its $ncores render processes, within the memory it requests
+# (MEMORY_BUDGET in calculate_sensitivities.py, 100 GB by default).
 jobname="sensitivities"
 output="$(pwd)/${jobname}_stdout.log"
 error="$(pwd)/${jobname}_stderr.log"
 ncores=4
-qsub -N "$jobname" -cwd -m ea -M "$USER" -o "$output" -e "$error" -pe smp "$ncores" -l mem_free=105G <<EOF
+njobs=4
+qsub -N "$jobname" -cwd -m ea -M "$USER" -o "$output" -e "$error" -pe smp "$ncores" -l mem_free=105G \
+    -t 1-"$njobs" <<EOF
 #!/bin/bash
 module purge
 module load standard python/3.5
+export WORKER_INDEX=\$((SGE_TASK_ID - 1))
+export WORKER_COUNT=$njobs
 python3 calculate_sensitivities.py
 EOF
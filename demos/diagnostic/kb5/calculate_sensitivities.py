@@ -1,42 +1,69 @@
-
-import time
-import numpy as np
-from raysect.primitive import import_obj
+import os
 from raysect.optical import World
 from raysect.optical.material import AbsorbingSurface
-from raysect.core.workflow import MulticoreEngine
 
 from cherab.jet.machine import import_jet_mesh
-from cherab.jet.machine.cad_files import KB5V, KB5H
 from cherab.jet.bolometry import load_kb5_camera, load_kb5_voxel_grid
+from cherab.jet.bolometry.sensitivity import build_sensitivities, print_sensitivity_progress
+from cherab.jet.bolometry.sensitivity_store import SensitivityStore
+from cherab.jet.inversions import save_sensitivity_matrix
+
+
+NCORES = int(os.environ.get("NSLOTS", 10))
+
+# independent jobs (e.g. the tasks of a batch array job) share the checkpoint directory,
+# each job calculates its own share of the detectors
+WORKER_INDEX = int(os.environ.get("WORKER_INDEX", 0))
+WORKER_COUNT = int(os.environ.get("WORKER_COUNT", 1))
+CHECKPOINT_PATH = os.environ.get("CHECKPOINT_PATH", "kb5_sensitivities")
+
+RAY_COUNT = 10000
+
+# sensitivities below this fraction of a detector's peak sensitivity are dropped from the sparse matrices
+DROP_TOLERANCE = 1e-6
+
+
+def build_scene():
+
+    world = World()
+    # the structured grid locates voxels on the grid lattice instead of tracing a CSG primitive per voxel
+    inversion_grid = load_kb5_voxel_grid(parent=world, name="KB5 inversion grid", structured=True)
+    kb5v = load_kb5_camera('KB5V', parent=world)
+    kb5h = load_kb5_camera('KB5H', parent=world)
+
+    # only the meshes inside the region seen by the cameras are loaded, the walls are absorbing,
+    # the assembled meshes are cached as a snapshot so subsequent runs start up quickly
+    import_jet_mesh(world, override_material=AbsorbingSurface(), groups=['JET_MESH', 'KB5V', 'KB5H'],
+                    region=[kb5v, kb5h], snapshot=True)
+
+    return [kb5v, kb5h], inversion_grid
+
+
+if __name__ == '__main__':
+
+    sensitivities = {}
 
+    def calculate(camera_id):
+        # both cameras are traced together, finished detectors are kept in the checkpoint
+        # directory and rerunning the script resumes the calculation
+        if sensitivities:
+            return sensitivities[camera_id]
+        matrices = build_sensitivities(build_scene, CHECKPOINT_PATH, ray_count=RAY_COUNT, processes=NCORES,
+                                       worker_index=WORKER_INDEX, worker_count=WORKER_COUNT,
+                                       progress=print_sensitivity_progress, mesh_groups=['JET_MESH', 'KB5V', 'KB5H'])
+        if matrices is None:
+            raise SystemExit("The detectors of the other workers are not complete yet.")
+        sensitivities.update(matrices)
+        return sensitivities[camera_id]
 
-world = World()
-inversion_grid = load_kb5_voxel_grid(parent=world, name="KB5 inversion grid")
-import_jet_mesh(world, override_material=AbsorbingSurface())
-kb5v_collimator_mesh = import_obj(KB5V[0][0], scaling=0.001, parent=world, material=AbsorbingSurface())
-kb5h_collimator_mesh = import_obj(KB5H[0][0], scaling=0.001, parent=world, material=AbsorbingSurface())
-
-
-# Calculate KB5V camera sensitivities
-kb5v = load_kb5_camera('KB5V', parent=world)
-sensitivity_matrix = np.zeros((len(kb5v), inversion_grid.count))
-for i, detector in enumerate(kb5v):
-    detector.render_engine = MulticoreEngine(10)
-    start_time = time.time()
-    sensitivities = detector.calculate_sensitivity(inversion_grid, ray_count=10000)
-    sensitivity_matrix[i, :] = sensitivities
-    print("Traced detector '{}' with run time - {:.2G}mins".format(detector.name, (time.time() - start_time) / 60))
-np.save("kb5v_sensitivities.npy", sensitivity_matrix)
-
-
-# Calculate KB5H camera sensitivities
-kb5h = load_kb5_camera('KB5H', parent=world)
-sensitivity_matrix = np.zeros((len(kb5h), inversion_grid.count))
-for i, detector in enumerate(kb5h):
-    detector.render_engine = MulticoreEngine(10)
-    start_time = time.time()
-    sensitivities = detector.calculate_sensitivity(inversion_grid, ray_count=10000)
-    sensitivity_matrix[i, :] = sensitivities
-    print("Traced detector '{}' with run time - {:.2G}mins".format(detector.name, (time.time() - start_time) / 60))
-np.save("kb5h_sensitivities.npy", sensitivity_matrix)
+    # matrices are stored under a hash of the camera geometry, grid, meshes and ray count, a matrix
+    # calculated before with the same inputs is read from the store instead of being recalculated,
+    # the material name must match the override used in build_scene()
+    store = SensitivityStore()
+    region = [load_kb5_camera('KB5V'), load_kb5_camera('KB5H')]
+    cell_vertices = load_kb5_voxel_grid(structured=True).cell_vertices
+    for camera_id in ['KB5V', 'KB5H']:
+        matrix = store.get_or_compute(camera_id, lambda: calculate(camera_id), RAY_COUNT, cell_vertices,
+                                      groups=['JET_MESH', 'KB5V', 'KB5H'], region=region, material='absorbing',
+                                      drop_tolerance=DROP_TOLERANCE)
+        save_sensitivity_matrix("{}_sensitivities.npz".format(camera_id.lower()), matrix)
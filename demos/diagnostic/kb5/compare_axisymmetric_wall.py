@@ -0,0 +1,68 @@
+
+# Compares KB5 sensitivities calculated with the full JET CAD wall against the
+# axisymmetric first wall revolved from the wall outline, reporting the scene
+# set-up and tracing times and the change in the sensitivities. The KB5 cameras
+# view from outside the first wall, port openings are cut into the revolved wall
+# along their lines of sight.
+
+import time
+import numpy as np
+from raysect.optical import World
+from raysect.optical.material import AbsorbingSurface
+from raysect.core.workflow import MulticoreEngine
+
+from cherab.jet.machine import import_jet_mesh, import_axisymmetric_wall
+from cherab.jet.bolometry import load_kb5_camera, load_kb5_voxel_grid
+
+
+PULSE = 92782
+RAY_COUNT = 10000
+
+
+def calculate_sensitivities(wall_loader, camera_id='KB5V'):
+
+    world = World()
+    inversion_grid = load_kb5_voxel_grid(parent=world, name="KB5 inversion grid")
+    camera = load_kb5_camera(camera_id, parent=world)
+
+    start_time = time.time()
+    wall_loader(world, camera)
+    setup_time = time.time() - start_time
+
+    sensitivity_matrix = np.zeros((len(camera), inversion_grid.count))
+
+    start_time = time.time()
+    for i, detector in enumerate(camera):
+        detector.render_engine = MulticoreEngine()
+        sensitivity_matrix[i, :] = detector.calculate_sensitivity(inversion_grid, ray_count=RAY_COUNT)
+    trace_time = time.time() - start_time
+
+    return sensitivity_matrix, setup_time, trace_time
+
+
+full, full_setup, full_trace = calculate_sensitivities(
+    lambda world, camera: import_jet_mesh(world, override_material=AbsorbingSurface(),
+                                          groups=['JET_MESH', 'KB5V'], pulse=PULSE))
+
+revolved, revolved_setup, revolved_trace = calculate_sensitivities(
+    lambda world, camera: import_jet_mesh(world, override_material=AbsorbingSurface(), groups=['KB5V']) +
+    import_axisymmetric_wall(world, pulse=PULSE, openings=camera))
+
+
+print("full CAD wall:        set-up {:.1f}s, tracing {:.1f}s".format(full_setup, full_trace))
+print("axisymmetric wall:    set-up {:.1f}s, tracing {:.1f}s".format(revolved_setup, revolved_trace))
+
+# per-channel change in the total sensitivity and the largest change in any voxel
+full_total = full.sum(axis=1)
+revolved_total = revolved.sum(axis=1)
+for channel, (a, b) in enumerate(zip(full_total, revolved_total), 1):
+    change = (b - a) / a if a > 0 else 0.0
+    print("channel {:2d}: total sensitivity {:.4G} -> {:.4G} ({:+.2%})".format(channel, a, b, change))
+
+difference = np.abs(revolved - full).max() / full.max()
+print("largest voxel sensitivity difference: {:.2%} of the peak sensitivity".format(difference))
+
+# a channel seeing the plasma through the full wall must still see it through the port openings
+blocked = [channel for channel, (a, b) in enumerate(zip(full_total, revolved_total), 1) if a > 0 and b == 0]
+if blocked:
+    raise RuntimeError("The axisymmetric wall blocks KB5V channels {}.".format(blocked))
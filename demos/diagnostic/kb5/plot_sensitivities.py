@@ -1,17 +1,18 @@
 
-import numpy as np
 import matplotlib.pyplot as plt
 
 from cherab.jet.bolometry import load_kb5_voxel_grid, load_kb5_camera
 from cherab.jet.machine import plot_jet_wall_outline
+from cherab.jet.inversions import load_sensitivity_matrix
 
 plt.ion()
 inversion_grid = load_kb5_voxel_grid()
 
 kb5v = load_kb5_camera('KB5V')
-kb5v_sensitivities = np.load('kb5v_sensitivities.npy')
+kb5v_sensitivities = load_sensitivity_matrix('kb5v_sensitivities.npz')
 for i, detector in enumerate(kb5v):
-    inversion_grid.plot(voxel_values=kb5v_sensitivities[i], title='{} sensitivities'.format(detector.name))
+    sensitivities = kb5v_sensitivities[i].toarray().ravel()
+    inversion_grid.plot(voxel_values=sensitivities, title='{} sensitivities'.format(detector.name))
     plot_jet_wall_outline()
 plt.show()
 input("waiting...")
@@ -19,9 +20,10 @@ plt.close('all')
 
 
 kb5h = load_kb5_camera('KB5H')
-kb5h_sensitivities = np.load('kb5h_sensitivities.npy')
+kb5h_sensitivities = load_sensitivity_matrix('kb5h_sensitivities.npz')
 for i, detector in enumerate(kb5h):
-    inversion_grid.plot(voxel_values=kb5h_sensitivities[i], title='{} sensitivities'.format(detector.name))
+    sensitivities = kb5h_sensitivities[i].toarray().ravel()
+    inversion_grid.plot(voxel_values=sensitivities, title='{} sensitivities'.format(detector.name))
     plot_jet_wall_outline()
 plt.show()
 input("waiting...")
@@ -14,7 +14,9 @@ from cherab.core.model import ExcitationLine, RecombinationLine
 from cherab.edge2d import load_edge2d_from_eproc
 from cherab.openadas import OpenADAS
 from cherab.jet.machine import import_jet_mesh
-from cherab.jet.cameras.kl1 import load_kl1_camera
+from cherab.jet.cameras.kl1 import load_kl1_camera, load_kl1_pixel_geometry
+from cherab.jet.cameras.roi import polygon_roi, scatter_frame
+from cherab.jet.cameras.adaptive import observe_adaptive, print_sampling_progress
 
 
 world = World()
@@ -37,10 +39,21 @@ plasma.models = [ExcitationLine(d_alpha), RecombinationLine(d_alpha)]
 power_unfiltered = PowerPipeline2D(display_unsaturated_fraction=0.96, name="Unfiltered Power (W)", display_progress=False)
 power_unfiltered.display_update_time = 15
 
-camera = load_kl1_camera(parent=world, pipelines=[power_unfiltered])
-camera.pixel_samples = 150
+# only render the pixels whose rays cross the divertor region, the remaining pixels only see tiles
+divertor = np.array([[2.2, -1.8], [3.0, -1.8], [3.0, -1.2], [2.2, -1.2]])
+pixel_origins, pixel_directions = load_kl1_pixel_geometry()
+roi = polygon_roi(pixel_origins, pixel_directions, divertor)
+print("rendering {} of {} pixels".format(roi.sum(), roi.size))
+
+camera = load_kl1_camera(parent=world, pipelines=[power_unfiltered], roi=roi)
 camera.ray_max_depth = 3
-camera.observe()
 
-np.save('KL1_run1706184_reflecting_150', power_unfiltered.frame.mean)
-power_unfiltered.save('KL1_run1706184_reflecting_150.png')
+# sample in passes of 25 until every pixel reaches a 2% relative error, instead of a uniform 150 samples per pixel
+report = observe_adaptive(camera, target_error=0.02, pass_samples=25, max_samples=1000,
+                          progress=print_sampling_progress)
+print("{} samples in {} passes, {} for a uniform 150 samples per pixel, {} pixels left to sample"
+      "".format(report.samples, report.passes, 150 * roi.sum(), report.unconverged))
+
+frame = scatter_frame(power_unfiltered.frame.mean, roi)
+np.save('KL1_run1706184_reflecting_divertor_roi_adaptive_2pct', frame)
+plt.imsave('KL1_run1706184_reflecting_divertor_roi_adaptive_2pct.png', frame.T, cmap='gray')
@@ -0,0 +1,22 @@
+
+# Converts the original KL11 sensitivity matrices into memory mapped float32 matrix
+# directories, which are read on demand and multiplied a block of pixels at a time.
+# The matrices are read from and written to $CHERAB_JET_DATA/kl11/data.
+
+import time
+import numpy as np
+
+from cherab.jet.cameras.kl11 import convert_kl11_sensitivity_matrix, open_kl11_sensitivity_matrix
+
+
+for camera in ['c', 'd', 'e']:
+    for reflections in [True, False]:
+        start_time = time.time()
+        matrix = convert_kl11_sensitivity_matrix(camera, reflections=reflections, dtype=np.float32)
+        print("converted camera '{}' (reflections={}) to {:.1f}GB in {:.1f}mins"
+              "".format(camera, reflections, matrix.nbytes / 1e9, (time.time() - start_time) / 60))
+
+
+# a streamed forward model only holds a block of pixel rows in memory at a time
+sensitivity = open_kl11_sensitivity_matrix('c')
+image = sensitivity.dot(np.ones(sensitivity.shape[1])).reshape(sensitivity.metadata['pixels'])
@@ -11,7 +11,9 @@ from cherab.core.atomic import deuterium, helium, carbon, Line
 from cherab.core.model import ExcitationLine, RecombinationLine
 from cherab.openadas import OpenADAS
 from cherab.edge2d import load_edge2d_from_eproc
-from cherab.jet.cameras.kl11 import load_kl11_voxel_grid, load_kl11_sensitivity_matrix, load_kl11_camera
+from cherab.jet.cameras.kl11 import load_kl11_voxel_grid, load_kl11_sensitivity_matrix, load_kl11_camera, \
+    load_kl11_forward_operator, kl11_pixel_lattice
+from cherab.jet.cameras.binning import bin_image
 
 
 available_lines = {
@@ -33,12 +35,24 @@ parser.add_argument('-l', '--line', help='The emission line that will be simulat
                     choices=list(available_lines.keys()), default='d-alpha')
 parser.add_argument('-o', '--output', help='The name of an output file to which the data and an'
                     'image will be written (excluding file extensions).')
+parser.add_argument('--low-rank', action='store_true',
+                    help='Use the low-rank compressed forward operator (see compress_kl11_sensitivity_matrix).')
+parser.add_argument('-b', '--binning', type=int, choices=[1, 2, 4, 8], default=1,
+                    help='Bin the image pixels in blocks of this size, for a quick-look image.')
 args = parser.parse_args()
 
 
-sensitivity = load_kl11_sensitivity_matrix(camera='c')
+if args.low_rank:
+    # the compressed operator needs a fraction of the memory and operations of the full matrix
+    sensitivity = load_kl11_forward_operator(camera='c')
+    lattice = kl11_pixel_lattice(matrix=sensitivity)
+else:
+    # pixels see few voxels, the sparse matrix needs a fraction of the memory and multiply time
+    sensitivity = load_kl11_sensitivity_matrix(camera='c', drop_tolerance=1e-6, binning=args.binning)
+    lattice = kl11_pixel_lattice(camera='c', binning=args.binning)
 voxel_grid = load_kl11_voxel_grid()
-camera = load_kl11_camera(stride=3)
+# the matrices cover every third calibration pixel (stride=3), the camera uses the same pixel lattice
+camera = load_kl11_camera(stride=lattice.stride, binning=args.binning)
 
 
 edge2d_sim = load_edge2d_from_eproc(args.sim_path)
@@ -74,7 +88,11 @@ recom_func = EmissionFunction(recombination_model)
 emissivities = voxel_grid.emissivities_from_function(excit_func)
 emissivities += voxel_grid.emissivities_from_function(recom_func)
 
-synthetic_image = np.matmul(sensitivity, emissivities).reshape(camera.pixels)
+if args.low_rank:
+    # the compressed operator is calculated for the unbinned lattice
+    synthetic_image = bin_image(sensitivity.dot(emissivities).reshape(lattice.pixels), args.binning)
+else:
+    synthetic_image = sensitivity.dot(emissivities).reshape(lattice.pixels)
 
 plt.ion()
 voxel_grid.plot(voxel_values=emissivities)
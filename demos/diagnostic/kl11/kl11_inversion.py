@@ -12,8 +12,8 @@ from cherab.core.model import ExcitationLine, RecombinationLine
 from cherab.edge2d import load_edge2d_from_eproc
 from cherab.openadas import OpenADAS
 
-from cherab.tools.inversions import invert_sart
-from cherab.jet.cameras.kl11 import load_kl11_voxel_grid, load_kl11_sensitivity_matrix
+from cherab.jet.inversions import invert_sart_sparse
+from cherab.jet.cameras.kl11 import load_kl11_voxel_grid, load_kl11_sensitivity_matrix, load_kl11_laplacian
 
 
 X_VECTOR = Vector3D(1, 0, 0)
@@ -58,9 +58,9 @@ plt.ylim(-1.8, -1.2)
 
 
 # time_a = time.time()
-# sensitivity = load_kl11_sensitivity_matrix()
+# sensitivity = load_kl11_sensitivity_matrix(drop_tolerance=1e-6)
 # print('Time to load sensitivity matrix => ', (time.time() - time_a) / 60)
-# forward_image = np.matmul(sensitivity, emission_grid.emissivities)
+# forward_image = sensitivity.dot(voxel_emissivities)
 #
 # plt.figure()
 # plt.imshow(forward_image.reshape((1000, 1000)))
@@ -68,7 +68,8 @@ plt.ylim(-1.8, -1.2)
 #
 #
 # time_a = time.time()
-# inverted_emission, conv = invert_sart(sensitivity, forward_image, max_iterations=100, debug=True)
+# inverted_emission, conv = invert_sart_sparse(sensitivity, forward_image, max_iterations=100,
+#                                              laplacian_matrix=load_kl11_laplacian())
 # print('Time to load sensitivity matrix => ', (time.time() - time_a) / 60)
 #
 # inverted_emission = EmissivityGrid(inversion_grid, emissivities=inverted_emission)
@@ -19,10 +19,11 @@
 import matplotlib.pyplot as plt
 plt.ion()
 import numpy as np
+from time import perf_counter
 from scipy.constants import electron_mass, atomic_mass
 from jet.data import sal
 from raysect.core import Point3D, Vector3D, translate, rotate_basis
-from raysect.optical import World
+from raysect.optical import World, Spectrum
 from raysect.optical.observer import PinholeCamera
 from raysect.optical.material import AbsorbingSurface
 
@@ -42,6 +43,12 @@ PULSE = 79666
 PULSE_PLASMA = 79503  # /!\ Plasma configuration is from pulse 79503!
 TIME = 61.0
 
+# pre-sample the beam emission once instead of evaluating the beam models at every ray step
+USE_EMISSION_CACHE = True
+# compare the compiled cache interpolation with the numpy implementation it replaced, off for normal runs
+BENCHMARK_INTERPOLATION = False
+BENCHMARK_POINTS = 20000
+
 world = World()
 
 adas = OpenADAS(permit_extrapolation=True)  # create atomic data source
@@ -132,5 +139,60 @@ camera = PinholeCamera((512, 512), fov=45, parent=world, transform=translate(los
 camera.pixel_samples = 50
 camera.spectral_bins = 15
 
+if USE_EMISSION_CACHE:
+    # the cache is sampled on the spectral range and bins of the camera
+    print('Sampling beam emission')
+    for pini in (pini_8_1, pini_8_2, pini_8_5, pini_8_6):
+        pini.build_emission_cache(direction, camera.min_wavelength, camera.max_wavelength, camera.spectral_bins,
+                                  transverse_samples=41, axial_resolution=0.05, max_memory=256e6)
+
+
+def numpy_interpolation(cache, point, spectrum):
+    """ The einsum/tensordot trilinear interpolation previously used by BeamEmissionCache. """
+
+    nu, nv, nz, _ = cache.shape
+    half_width_x, half_width_y = cache.half_widths(point.z)
+    fu = (point.x / half_width_x + 1) * (nu - 1) / 2
+    fv = (point.y / half_width_y + 1) * (nv - 1) / 2
+    fz = point.z * (nz - 1) / cache.length
+    if not (0 <= fu <= nu - 1 and 0 <= fv <= nv - 1 and 0 <= fz <= nz - 1):
+        return spectrum
+
+    i = min(int(fu), nu - 2)
+    j = min(int(fv), nv - 2)
+    k = min(int(fz), nz - 2)
+    tu, tv, tz = fu - i, fv - j, fz - k
+    weights = np.einsum('i,j,k->ijk', (1 - tu, tu), (1 - tv, tv), (1 - tz, tz))
+    spectrum.samples[:] += np.tensordot(weights, cache.samples[i:i+2, j:j+2, k:k+2, :], axes=3)
+    return spectrum
+
+
+if USE_EMISSION_CACHE and BENCHMARK_INTERPOLATION:
+    print('Benchmarking the emission cache interpolation')
+    cache = pini_8_1.emission_cache
+    rng = np.random.default_rng(0)
+    z = rng.uniform(0, cache.length, BENCHMARK_POINTS)
+    half_width_x, half_width_y = cache.half_widths(z)
+    points = [Point3D(x, y, z) for x, y, z in zip(rng.uniform(-1, 1, BENCHMARK_POINTS) * half_width_x,
+                                                   rng.uniform(-1, 1, BENCHMARK_POINTS) * half_width_y, z)]
+
+    before = Spectrum(camera.min_wavelength, camera.max_wavelength, camera.spectral_bins)
+    start_time = perf_counter()
+    for point in points:
+        numpy_interpolation(cache, point, before)
+    before_time = perf_counter() - start_time
+
+    after = Spectrum(camera.min_wavelength, camera.max_wavelength, camera.spectral_bins)
+    start_time = perf_counter()
+    for point in points:
+        cache.emission_function(point, direction, after, world, None, None, None, None)
+    after_time = perf_counter() - start_time
+
+    print('numpy interpolation: {:.2f} us per point'.format(1e6 * before_time / BENCHMARK_POINTS))
+    print('compiled interpolation: {:.2f} us per point ({:.1f}x faster)'.format(
+        1e6 * after_time / BENCHMARK_POINTS, before_time / after_time))
+    print('maximum relative difference: {:.2E}'.format(
+        np.max(np.abs(after.samples - before.samples)) / np.max(np.abs(before.samples))))
+
 camera.observe()
 
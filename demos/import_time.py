@@ -0,0 +1,44 @@
+# Checks that importing the cherab.jet packages stays within an import-time budget.
+# Each package is imported in a fresh interpreter so that previously imported
+# modules do not hide the cost. Heavy resources (PPF, SAL, OpenADAS, CAD mesh
+# paths) must be created on first use and not at import time.
+
+import sys
+import subprocess
+
+
+# seconds, including the raysect and cherab core imports each package pulls in
+IMPORT_TIME_BUDGET = 5.0
+
+PACKAGES = [
+    'cherab.jet',
+    'cherab.jet.equilibrium',
+    'cherab.jet.machine',
+    'cherab.jet.nbi',
+    'cherab.jet.bolometry',
+    'cherab.jet.cameras.kl1',
+    'cherab.jet.cameras.kl11',
+    'cherab.jet.spectroscopy.ks5',
+]
+
+# these modules must not be loaded as a side effect of importing cherab.jet
+HEAVY_MODULES = ['ppf', 'jet.data', 'sal', 'idlbridge', 'matplotlib.pyplot']
+
+
+def measure(package):
+
+    code = ("import sys, time; t = time.perf_counter(); import {}; t = time.perf_counter() - t; "
+            "print(t); print(','.join(m for m in {} if m in sys.modules))").format(package, HEAVY_MODULES)
+    output = subprocess.check_output([sys.executable, '-c', code], universal_newlines=True).split('\n')
+    return float(output[0]), [m for m in output[1].split(',') if m]
+
+
+failed = False
+for package in PACKAGES:
+    import_time, heavy = measure(package)
+    status = 'ok' if import_time <= IMPORT_TIME_BUDGET and not heavy else 'FAILED'
+    failed |= status == 'FAILED'
+    print("{:<32} {:6.2f}s  {}{}".format(package, import_time, status,
+                                         "  (imported {})".format(', '.join(heavy)) if heavy else ''))
+
+sys.exit(1 if failed else 0)
@@ -0,0 +1,129 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Checks the round trips of the binary voxel grid files.
+
+Grids are saved and loaded, memory mapped and read, converted from the
+legacy CSV and pickle formats, and malformed files are checked to be
+rejected. The shipped KL11 grid is checked to load identically with and
+without memory mapping.
+"""
+
+import os
+import json
+import pickle
+import tempfile
+import numpy as np
+from numpy.testing import assert_array_equal
+
+import cherab.jet.cameras.kl11 as kl11
+from cherab.jet.inversions import GRID_FORMAT_VERSION, save_voxel_grid, load_voxel_grid_data, index_maps, \
+    convert_grid_pickle, convert_grid_csv
+
+
+def assert_rejected(path, mmap=True):
+
+    try:
+        load_voxel_grid_data(path, mmap=mmap)
+    except ValueError as error:
+        return str(error)
+    raise AssertionError("'{}' was not rejected.".format(path))
+
+
+def assert_grid_equal(grid_data, cell_vertices, index_2d, segments):
+
+    assert_array_equal(grid_data.cell_vertices, cell_vertices)
+    assert_array_equal(grid_data.index_2d, index_2d)
+    assert_array_equal(grid_data.segments, segments)
+
+
+rng = np.random.default_rng(0)
+count = 500
+cell_vertices = rng.uniform(1.5, 4.0, (count, 4, 2))
+index_2d = rng.integers(0, 100, (count, 2))
+segments = rng.integers(0, 3, count)
+
+with tempfile.TemporaryDirectory() as directory:
+
+    # round trip, memory mapped and read
+    path = os.path.join(directory, "grid.npz")
+    save_voxel_grid(path, cell_vertices, index_2d, segments, name="check", segment_resolutions=[0.01, 0.03])
+    for mmap in (True, False):
+        grid_data = load_voxel_grid_data(path, mmap=mmap)
+        assert_grid_equal(grid_data, cell_vertices, index_2d, segments)
+        if mmap != isinstance(grid_data.cell_vertices, np.memmap):
+            raise AssertionError("The arrays are {}memory mapped.".format("not " if mmap else ""))
+        if grid_data.metadata != {'format': 'cherab-jet-voxel-grid', 'version': GRID_FORMAT_VERSION,
+                                  'count': count, 'name': "check", 'segment_resolutions': [0.01, 0.03]}:
+            raise AssertionError("The metadata does not match: {}".format(grid_data.metadata))
+    print("round trip: arrays and metadata match, memory mapped and read")
+
+    # defaults and the legacy index maps
+    save_voxel_grid(path, cell_vertices)
+    assert_grid_equal(load_voxel_grid_data(path), cell_vertices, np.full((count, 2), -1), np.zeros(count))
+    index_to_voxel, voxel_to_index = index_maps(index_2d[:10])
+    for voxel, index in enumerate(index_2d[:10].tolist()):
+        if voxel_to_index[voxel] != tuple(index) or voxel_to_index[index_to_voxel[tuple(index)]] != tuple(index):
+            raise AssertionError("The index maps do not match the 2D indices.")
+    print("defaults and index maps: ok")
+
+    # legacy CSV, rows in any order
+    csv_path = os.path.join(directory, "grid.csv")
+    order = rng.permutation(count)
+    np.savetxt(csv_path, np.column_stack([order, cell_vertices[order].reshape(count, 8)]), delimiter=',')
+    convert_grid_csv(csv_path, path)
+    assert_array_equal(load_voxel_grid_data(path).cell_vertices, cell_vertices)
+    print("legacy CSV conversion: ok")
+
+    # legacy pickle
+    pickle_path = os.path.join(directory, "grid.pickle")
+    with open(pickle_path, 'wb') as fh:
+        pickle.dump({'voxels': [[tuple(point) for point in cell] for cell in cell_vertices.tolist()],
+                     'index_1D_to_2D_map': {voxel: tuple(index) for voxel, index in enumerate(index_2d.tolist())}},
+                    fh)
+    convert_grid_pickle(pickle_path, path)
+    assert_grid_equal(load_voxel_grid_data(path), cell_vertices, index_2d, np.zeros(count))
+    print("legacy pickle conversion: ok")
+
+    # malformed files
+    compressed_path = os.path.join(directory, "compressed.npz")
+    np.savez_compressed(compressed_path, cell_vertices=cell_vertices, index_2d=index_2d, segments=segments,
+                        metadata=np.array(json.dumps({'format': 'cherab-jet-voxel-grid', 'version': 1})))
+    print("compressed:", assert_rejected(compressed_path))
+    load_voxel_grid_data(compressed_path, mmap=False)
+
+    future_path = os.path.join(directory, "future.npz")
+    np.savez(future_path, cell_vertices=cell_vertices, index_2d=index_2d, segments=segments,
+             metadata=np.array(json.dumps({'format': 'cherab-jet-voxel-grid', 'version': GRID_FORMAT_VERSION + 1})))
+    print("newer version:", assert_rejected(future_path))
+
+    foreign_path = os.path.join(directory, "foreign.npz")
+    np.savez(foreign_path, values=np.arange(10))
+    print("not a grid:", assert_rejected(foreign_path))
+
+    object_path = os.path.join(directory, "object.npz")
+    np.savez(object_path, cell_vertices=np.array([None, 1], dtype=object),
+             metadata=np.array(json.dumps({'format': 'cherab-jet-voxel-grid', 'version': 1})))
+    print("object arrays:", assert_rejected(object_path))
+    print("object arrays, read:", assert_rejected(object_path, mmap=False))
+
+# the shipped grid
+path = os.path.join(os.path.dirname(kl11.__file__), "kl11_voxel_grid.npz")
+mapped = load_voxel_grid_data(path)
+read = load_voxel_grid_data(path, mmap=False)
+assert_grid_equal(mapped, read.cell_vertices, read.index_2d, read.segments)
+print("shipped KL11 grid: {} voxels, memory mapped and read arrays match".format(len(mapped.cell_vertices)))
@@ -0,0 +1,102 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Checks the sparse grid Laplacians against the neighbour loop they replaced.
+
+The loop of the former KL11 grid generation demo is rebuilt for each KL11
+grid segment, storing its entries sparsely rather than in a dense array,
+and compared entry by entry with grid_laplacian() and with the Laplacian
+shipped with the package.
+"""
+
+import os
+import numpy as np
+from numpy.testing import assert_array_equal
+from scipy.sparse import coo_matrix
+
+import cherab.jet.cameras.kl11 as kl11
+from cherab.jet.cameras.kl11 import load_kl11_laplacian
+from cherab.jet.inversions import load_voxel_grid_data, grid_laplacian, combine_laplacians
+
+
+# the neighbours in the order of the former loop
+LOOP_NEIGHBOURS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+AXIS_NEIGHBOURS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def loop_laplacian(index_2d, neighbour_offsets=LOOP_NEIGHBOURS):
+    """ The Laplacian built voxel by voxel from the dictionary index maps, as in the former demo. """
+
+    grid_index_2D_to_1D_map = {(ix, jy): i for i, (ix, jy) in enumerate(index_2d.tolist())}
+    num_voxels = len(index_2d)
+
+    entries = {}
+    for ith_cell, (ix, iy) in enumerate(index_2d.tolist()):
+        neighbours = 0
+        for di, dj in neighbour_offsets:
+            try:
+                entries[ith_cell, grid_index_2D_to_1D_map[ix + di, iy + dj]] = -1
+                neighbours += 1
+            except KeyError:
+                pass
+        entries[ith_cell, ith_cell] = neighbours
+
+    rows, columns = np.array(list(entries.keys())).T
+    return coo_matrix((list(entries.values()), (rows, columns)), shape=(num_voxels, num_voxels)).tocsr()
+
+
+def assert_sparse_equal(matrix, expected, name):
+
+    if matrix.shape != expected.shape or (matrix != expected).nnz:
+        raise AssertionError("The {} does not match.".format(name))
+
+
+def index_map(index_2d):
+
+    index_2d = np.asarray(index_2d)
+    result = np.full(index_2d.max(axis=0) + 1, -1, dtype=np.int64)
+    result[index_2d[:, 0], index_2d[:, 1]] = np.arange(len(index_2d))
+    return result
+
+
+grid_data = load_voxel_grid_data(os.path.join(os.path.dirname(kl11.__file__), "kl11_voxel_grid.npz"))
+segment_names = grid_data.metadata.get('segment_names', [])
+
+laplacians = []
+for segment in np.unique(grid_data.segments):
+
+    voxels = np.nonzero(grid_data.segments == segment)[0]
+    if not np.array_equal(voxels, np.arange(voxels[0], voxels[-1] + 1)):
+        raise ValueError("The voxels of a segment are expected to be numbered contiguously.")
+    index_2d = np.asarray(grid_data.index_2d[voxels])
+    name = segment_names[segment] if segment < len(segment_names) else segment
+
+    laplacian = grid_laplacian(index_map(index_2d), neighbours=8)
+    assert_sparse_equal(laplacian, loop_laplacian(index_2d), "8 neighbour Laplacian")
+    assert_sparse_equal(laplacian, laplacian.T, "transposed Laplacian")
+    assert_array_equal(np.asarray(laplacian.sum(axis=1)).ravel(), 0)
+
+    axis_laplacian = grid_laplacian(index_map(index_2d), neighbours=4)
+    assert_sparse_equal(axis_laplacian, loop_laplacian(index_2d, AXIS_NEIGHBOURS), "4 neighbour Laplacian")
+
+    print("{} segment: {} voxels, 4 and 8 neighbour Laplacians match the loop ({} non-zeros)"
+          "".format(name, len(voxels), laplacian.nnz))
+    laplacians.append(laplacian)
+
+combined = combine_laplacians(laplacians)
+assert_sparse_equal(load_kl11_laplacian(), combined, "shipped KL11 Laplacian")
+print("the shipped KL11 Laplacian matches the combined segments ({} voxels)".format(combined.shape[0]))
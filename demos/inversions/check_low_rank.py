@@ -0,0 +1,124 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Checks the error guarantee of the low-rank sensitivity matrix compression.
+
+Synthetic matrices with known singular values, dense, memory mapped and
+sparse, are compressed at several tolerances. The relative Frobenius error
+of each factorisation is recomputed independently and compared with the
+tolerance, and the rank with the smallest rank any factorisation meeting the
+tolerance can have (Eckart-Young).
+"""
+
+import os
+import tempfile
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.sparse import random as sparse_random
+
+from cherab.jet.inversions import compress_sensitivity_matrix, save_low_rank_operator, load_low_rank_operator
+
+
+PIXELS = 2000
+VOXELS = 600
+TOLERANCES = [1e-1, 1e-2, 1e-3, 1e-4]
+
+
+def matrix_with_spectrum(singular_values, rng):
+
+    u, _ = np.linalg.qr(rng.standard_normal((PIXELS, len(singular_values))))
+    v, _ = np.linalg.qr(rng.standard_normal((VOXELS, len(singular_values))))
+    return (u * singular_values).dot(v.T)
+
+
+def minimum_rank(singular_values, tolerance):
+    """ The smallest rank whose optimal truncation meets the tolerance. """
+
+    tail = np.concatenate([np.cumsum((singular_values ** 2)[::-1])[::-1], [0]])
+    return int(np.nonzero(tail <= (tolerance ** 2) * tail[0])[0][0])
+
+
+def check(name, matrix, dense, tolerances=TOLERANCES, seed=0):
+
+    singular_values = np.linalg.svd(dense, compute_uv=False)
+    norm = np.linalg.norm(dense)
+
+    for tolerance in tolerances:
+
+        operator = compress_sensitivity_matrix(matrix, relative_error=tolerance, initial_rank=16, seed=seed)
+        error = np.linalg.norm(dense - operator.toarray()) / norm
+        optimum = minimum_rank(singular_values, tolerance)
+
+        if error > tolerance:
+            raise AssertionError("{}: the error {:.3E} exceeds the tolerance {:.0E}.".format(name, error, tolerance))
+        assert_allclose(operator.relative_error, error, rtol=1e-6, atol=1e-12)
+        if operator.rank < optimum:
+            raise AssertionError("{}: rank {} is below the optimal rank {}.".format(name, operator.rank, optimum))
+
+        emissivities = np.random.default_rng(seed).random(VOXELS)
+        assert_allclose(operator.dot(emissivities), dense.dot(emissivities), rtol=0,
+                        atol=tolerance * np.linalg.norm(dense.dot(emissivities)))
+
+        print("{}: tolerance {:.0E}, error {:.2E}, rank {} (optimal {}), {:.1%} of the matrix memory".format(
+            name, tolerance, error, operator.rank, optimum, operator.nbytes / dense.nbytes))
+
+
+rng = np.random.default_rng(0)
+
+# exponentially and slowly (power law) decaying spectra
+exponential = matrix_with_spectrum(np.exp(-np.arange(VOXELS) / 20), rng)
+check("exponential spectrum", exponential, exponential)
+power_law = matrix_with_spectrum(1 / (1 + np.arange(VOXELS)) ** 1.5, rng)
+check("power law spectrum", power_law, power_law)
+
+# a sparse matrix, a dominant rank one part on top of random entries without a decaying spectrum
+sparse = (sparse_random(PIXELS, VOXELS, density=0.01, random_state=1) +
+          sparse_random(PIXELS, 1, density=1, random_state=2).dot(sparse_random(1, VOXELS, density=1,
+                                                                                random_state=3))).tocsr()
+check("sparse", sparse, sparse.toarray(), tolerances=[0.5, 0.3])
+
+with tempfile.TemporaryDirectory() as directory:
+
+    # a memory mapped matrix is streamed a block of rows at a time
+    path = os.path.join(directory, "matrix.npy")
+    mapped = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(PIXELS, VOXELS))
+    mapped[:] = exponential
+    mapped.flush()
+    mapped = np.load(path, mmap_mode='r')
+    check("memory mapped", mapped, np.asarray(mapped, dtype=np.float64))
+
+    # saved operators load identically, memory mapped and read
+    operator = compress_sensitivity_matrix(exponential, relative_error=1e-3, seed=0)
+    path = os.path.join(directory, "operator.npz")
+    save_low_rank_operator(path, operator)
+    for mmap in (True, False):
+        loaded = load_low_rank_operator(path, mmap=mmap)
+        assert_allclose(loaded.toarray(), operator.toarray(), rtol=0, atol=0)
+        if loaded.relative_error != operator.relative_error:
+            raise AssertionError("The relative error is not preserved.")
+    print("save and load: ok")
+
+# a zero matrix and a tolerance out of reach
+zero = compress_sensitivity_matrix(np.zeros((PIXELS, VOXELS)))
+if zero.rank != 0 or zero.relative_error != 0:
+    raise AssertionError("A zero matrix should compress to rank 0.")
+try:
+    compress_sensitivity_matrix(power_law, relative_error=1e-6, max_rank=32, seed=0)
+except ValueError as error:
+    print("unreachable tolerance:", error)
+else:
+    raise AssertionError("A tolerance out of reach of the maximum rank was accepted.")
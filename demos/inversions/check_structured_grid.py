@@ -0,0 +1,157 @@
+# Copyright 2014-2018 United Kingdom Atomic Energy Authority
+#
+# Licensed under the EUPL, Version 1.1 or – as soon they will be approved by the
+# European Commission - subsequent versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl5
+#
+# Unless required by applicable law or agreed to in writing, software distributed
+# under the Licence is distributed on an "AS IS" basis, WITHOUT WARRANTIES OR
+# CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the Licence for the specific language governing permissions and limitations
+# under the Licence.
+
+"""
+Checks the per-voxel path lengths of the structured voxel grid.
+
+The lattice tracing of StructuredToroidalVoxelGrid is compared with the
+exact intersection of each segment with every voxel, a toroidal ring of
+rectangular cross section, and the ray traced path lengths of the
+structured grid are compared with those of the CSG ToroidalVoxelGrid.
+"""
+
+import time
+import numpy as np
+from numpy.testing import assert_allclose
+
+from raysect.core import Point3D, Vector3D
+from raysect.optical import World, Ray
+
+from cherab.tools.inversions import ToroidalVoxelGrid
+from cherab.jet.inversions import rectangular_grid, grid_axis, voxel_coordinates, StructuredToroidalVoxelGrid
+
+
+SEGMENTS = 2000
+RAYS = 200
+# absolute path length tolerance (m)
+TOLERANCE = 1e-6
+
+
+def exact_path_lengths(cell_vertices, origin, direction):
+    """ Returns the length of the segment origin + t * direction, 0 <= t <= 1, inside each voxel. """
+
+    r_low = cell_vertices[:, :, 0].min(axis=1)
+    r_high = cell_vertices[:, :, 0].max(axis=1)
+    z_low = cell_vertices[:, :, 1].min(axis=1)
+    z_high = cell_vertices[:, :, 1].max(axis=1)
+    x0, y0, z0 = origin
+    dx, dy, dz = direction
+
+    # squared radius along the segment: a t^2 + b t + c
+    a = dx * dx + dy * dy
+    b = 2 * (x0 * dx + y0 * dy)
+    c = x0 * x0 + y0 * y0
+
+    def radius_interval(radius):
+        # interval of t inside the cylinder of the radius, empty if start > end
+        if a == 0:
+            inside = c <= radius ** 2
+            return np.where(inside, -np.inf, np.inf), np.where(inside, np.inf, -np.inf)
+        discriminant = b * b - 4 * a * (c - radius ** 2)
+        root = np.sqrt(np.maximum(discriminant, 0))
+        empty = discriminant < 0
+        return np.where(empty, np.inf, (-b - root) / (2 * a)), np.where(empty, -np.inf, (-b + root) / (2 * a))
+
+    if dz == 0:
+        inside = (z_low <= z0) & (z0 <= z_high)
+        slab_start, slab_end = np.where(inside, 0.0, np.inf), np.where(inside, 1.0, -np.inf)
+    else:
+        slab_start = np.minimum((z_low - z0) / dz, (z_high - z0) / dz)
+        slab_end = np.maximum((z_low - z0) / dz, (z_high - z0) / dz)
+    start = np.maximum(slab_start, 0.0)
+    end = np.minimum(slab_end, 1.0)
+
+    # inside the outer cylinder and outside the inner one, at most two intervals
+    outer_start, outer_end = radius_interval(r_high)
+    inner_start, inner_end = radius_interval(r_low)
+    inner_start = np.clip(inner_start, outer_start, outer_end)
+    inner_end = np.clip(inner_end, outer_start, outer_end)
+    inner_empty = inner_start >= inner_end
+
+    def overlap(interval_start, interval_end):
+        return np.maximum(np.minimum(end, interval_end) - np.maximum(start, interval_start), 0)
+
+    length = np.where(inner_empty, overlap(outer_start, outer_end),
+                      overlap(outer_start, inner_start) + overlap(inner_end, outer_end))
+    return length * np.sqrt(a + dz * dz)
+
+
+# a coarse grid of the JET vessel keeps the CSG grid quick to build
+grid = rectangular_grid(grid_axis(1.8, 4.0, 0.1), grid_axis(-1.8, 2.0, 0.1))
+cell_vertices = grid.cell_vertices
+count = grid.count
+print("{} voxels".format(count))
+
+rng = np.random.default_rng(0)
+
+
+def random_points(number):
+    # points around the torus, inside and outside the grid
+    radius = rng.uniform(0.5, 4.5, number)
+    angle = rng.uniform(0, 2 * np.pi, number)
+    return np.column_stack([radius * np.cos(angle), radius * np.sin(angle), rng.uniform(-2.5, 2.5, number)])
+
+
+# lattice tracing against the exact voxel intersections
+structured = StructuredToroidalVoxelGrid(cell_vertices)
+starts = random_points(SEGMENTS)
+ends = random_points(SEGMENTS)
+
+start_time = time.time()
+worst = 0.0
+for origin, end in zip(starts, ends):
+    lengths = np.zeros(count)
+    for lattice in structured.lattices:
+        voxels, voxel_lengths = lattice.trace(origin, end - origin)
+        np.add.at(lengths, voxels, voxel_lengths)
+    exact = exact_path_lengths(cell_vertices, origin, end - origin)
+    assert_allclose(lengths, exact, rtol=0, atol=TOLERANCE)
+    worst = max(worst, np.abs(lengths - exact).max())
+print("lattice tracing: {} segments match the exact path lengths, largest deviation {:.2E} m ({:.1f}s)"
+      "".format(SEGMENTS, worst, time.time() - start_time))
+
+
+# ray traced path lengths of the structured and the CSG grid
+csg_world = World()
+ToroidalVoxelGrid(voxel_coordinates(cell_vertices), parent=csg_world, primitive_type="csg")
+structured_world = World()
+structured.parent = structured_world
+
+origins = random_points(RAYS)
+targets = random_points(RAYS)
+
+csg_time = 0.0
+structured_time = 0.0
+worst = 0.0
+for origin, target in zip(origins, targets):
+
+    direction = Vector3D(*(target - origin)).normalise()
+    ray = Ray(Point3D(*origin), direction, min_wavelength=1, max_wavelength=2, bins=count)
+
+    start_time = time.time()
+    csg_lengths = ray.trace(csg_world).samples
+    csg_time += time.time() - start_time
+
+    start_time = time.time()
+    structured_lengths = ray.trace(structured_world).samples
+    structured_time += time.time() - start_time
+
+    assert_allclose(structured_lengths, csg_lengths, rtol=1e-6, atol=TOLERANCE)
+    worst = max(worst, np.abs(structured_lengths - csg_lengths).max())
+
+print("ray tracing: {} rays match the CSG grid, largest deviation {:.2E} m".format(RAYS, worst))
+print("CSG grid {:.2f} ms per ray, structured grid {:.2f} ms per ray".format(1e3 * csg_time / RAYS,
+                                                                            1e3 * structured_time / RAYS))